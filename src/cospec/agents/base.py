@@ -1,14 +1,20 @@
 import os
-import tempfile
+import sqlite3
+import time
 from pathlib import Path
-from typing import Optional, TYPE_CHECKING
+from typing import TYPE_CHECKING, Iterator, List, Optional
 
 from cospec.core.adapters import SubprocessManager
 from cospec.core.config import CospecConfig, ToolConfig
+from cospec.core.connectors import build_cli_command
 from cospec.core.exceptions import ToolExecutionError
-from cospec.core.interfaces import ExceptionHandlerInterface, LoggerInterface
+from cospec.core.interfaces import ExceptionHandlerInterface, LLMInterface, LoggerInterface
+from cospec.core.profiling import checkpoint
+from cospec.core.tracing import span
 
 if TYPE_CHECKING:
+    from cospec.core.connectors import TokenStream
+    from cospec.core.preflight import Preflight
     from cospec.dependencies.deps import BaseDeps
 
 
@@ -24,10 +30,15 @@ class BaseAgent:
         self.config = config
         self.tool_name = tool_name or config.default_tool
 
-        if self.tool_name not in config.tools:
+        tool_config = config.resolve_tool(self.tool_name)
+        if tool_config is None:
             raise ValueError(f"Tool '{self.tool_name}' not configured.")
 
-        self.tool_config: ToolConfig = config.tools[self.tool_name]
+        self.tool_config: ToolConfig = tool_config
+
+        # Set by preflight() and by connectors that report usage; recorded with the next run
+        self._preflight: Optional["Preflight"] = None
+        self._actual_tokens: Optional[int] = None
 
         # DI support - initialize from deps if provided
         self._deps = deps
@@ -42,28 +53,97 @@ class BaseAgent:
         """
         Appends language instruction to the prompt.
         """
-        lang_instruction = ""
-        if self.config.language == "ja":
-            lang_instruction = "\n\nIMPORTANT: Please answer in Japanese."
-        elif self.config.language == "en":
-            lang_instruction = "\n\nIMPORTANT: Please answer in English."
+        with span("build_prompt", prompt_chars=len(base_prompt)):
+            lang_instruction = ""
+            if self.config.language == "ja":
+                lang_instruction = "\n\nIMPORTANT: Please answer in Japanese."
+            elif self.config.language == "en":
+                lang_instruction = "\n\nIMPORTANT: Please answer in English."
+
+            full_prompt = base_prompt + lang_instruction
+        checkpoint("prompt_built")
+        return full_prompt
+
+    def preflight(self, prompt: str) -> "Preflight":
+        """Estimate the prompt's tokens and latency for this tool; the estimate is recorded with the next run."""
+        from cospec.core.preflight import run_preflight
+
+        self._preflight = run_preflight(prompt, self.tool_name, self.tool_config)
+        return self._preflight
 
-        return base_prompt + lang_instruction
+    def _record_run(
+        self, started: float, prompt: str, exit_code: int, output_bytes: int = 0, cache_hit: bool = False
+    ) -> None:
+        """Record a tool run in the metrics store (also read by the review tool selection)."""
+        from cospec.core.metrics import Invocation, get_metrics_store
+        from cospec.core.tokens import estimate_tokens, model_family
+
+        duration = time.perf_counter() - started
+        preflight, self._preflight = self._preflight, None
+        actual_tokens, self._actual_tokens = self._actual_tokens, None
+        family = model_family(self.tool_config.model, self.tool_config.command, self.tool_name)
+        try:
+            get_metrics_store().record(
+                Invocation(
+                    ts=time.time(),
+                    tool=self.tool_name,
+                    command=self.tool_config.command or self.tool_config.type,
+                    prompt_bytes=len(prompt.encode("utf-8")),
+                    estimated_tokens=estimate_tokens(prompt, family),
+                    wall_time=duration,
+                    exit_code=exit_code,
+                    cache_hit=cache_hit,
+                    output_bytes=output_bytes,
+                    predicted_time=preflight.predicted_time if preflight else None,
+                    actual_tokens=actual_tokens,
+                )
+            )
+        except (OSError, sqlite3.Error) as e:
+            if self.logger:
+                self.logger.warning(f"Failed to record tool metrics: {e}")
+
+    @staticmethod
+    def _exit_code(error: BaseException) -> int:
+        """Process exit code behind a tool failure (-1 when the tool did not exit with one)."""
+        original = getattr(error, "original_error", None)
+        returncode = getattr(original, "returncode", None)
+        return returncode if isinstance(returncode, int) else -1
 
     def run_tool(self, prompt: str) -> str:
+        """
+        Executes external tool with the given prompt and records its latency and outcome.
+        """
+        started = time.perf_counter()
+        exit_code = -1
+        output_bytes = 0
+        try:
+            with span("run_tool", tool=self.tool_name, type=self.tool_config.type):
+                result = self._execute_tool(prompt)
+            exit_code = 0
+            output_bytes = len(result.encode("utf-8"))
+            return result
+        except Exception as e:
+            exit_code = self._exit_code(e)
+            raise
+        finally:
+            self._record_run(started, prompt, exit_code, output_bytes)
+            checkpoint("tool_executed")
+
+    def _execute_tool(self, prompt: str) -> str:
         """
         Executes external tool with the given prompt.
         Uses file-based approach for long prompts.
         """
+        started = time.perf_counter()
         if self.logger:
-            self.logger.info(f"Executing tool: {self.tool_name}")
+            self.logger.info(f"Executing tool: {self.tool_name}", tool=self.tool_name, phase="execute")
 
         full_prompt = self._build_prompt(prompt)
 
-        cmd_args = [self.tool_config.command]
+        if self.tool_config.type != "cli":
+            return self._run_connector(full_prompt)
 
-        has_file_placeholder = any("{file}" in arg for arg in self.tool_config.args)
-        has_prompt_placeholder = any("{prompt}" in arg for arg in self.tool_config.args)
+        cmd_args = [self.tool_config.command]
 
         # Prepare local cache directory for temp files
         cache_dir = Path.cwd() / ".cospec" / "cache"
@@ -73,45 +153,20 @@ class BaseAgent:
         execution_context = {"tool": self.tool_name, "command": self.tool_config.command}
 
         try:
-            if has_file_placeholder and "{prompt}" in str(self.tool_config.args):
-                with tempfile.NamedTemporaryFile(
-                    mode="w", delete=False, encoding="utf-8", suffix=".txt", dir=cache_dir
-                ) as f:
-                    f.write(full_prompt)
-                    temp_file = f.name
-
-                for arg in self.tool_config.args:
-                    if "{file}" in arg:
-                        cmd_args.append(arg.replace("{file}", temp_file))
-                    elif "{prompt}" in arg:
-                        pass
-                    else:
-                        cmd_args.append(arg)
-
-            elif has_prompt_placeholder:
-                if len(full_prompt) > 8000:
-                    with tempfile.NamedTemporaryFile(
-                        mode="w", delete=False, encoding="utf-8", suffix=".txt", dir=cache_dir
-                    ) as f:
-                        f.write(full_prompt)
-                        temp_file = f.name
-
-                    cmd_args.append(f"@{temp_file}")
-                else:
-                    for arg in self.tool_config.args:
-                        if "{prompt}" in arg:
-                            cmd_args.append(arg.replace("{prompt}", full_prompt))
-                        else:
-                            cmd_args.append(arg)
-            else:
-                for arg in self.tool_config.args:
-                    cmd_args.append(arg)
+            with span("build_command", prompt_chars=len(full_prompt)) as command_span:
+                cmd_args, temp_file = build_cli_command(self.tool_config, full_prompt, cache_dir)
+                command_span.set(prompt_file=temp_file is not None)
 
             process_manager = SubprocessManager()
             result = process_manager.run(cmd_args)
 
             if self.logger:
-                self.logger.info("Tool execution completed successfully")
+                self.logger.info(
+                    "Tool execution completed successfully",
+                    tool=self.tool_name,
+                    phase="execute",
+                    duration=time.perf_counter() - started,
+                )
 
             return str(result.stdout)
 
@@ -151,6 +206,113 @@ class BaseAgent:
                     if self.logger:
                         self.logger.warning(f"Failed to cleanup temp file: {cleanup_error}")
 
+    def _get_connector(self) -> LLMInterface:
+        """Resolve the in-process connector for the current tool."""
+        from cospec.dependencies.container import Container
+
+        container = Container()
+        if self.tool_name in container.get_registered_connectors():
+            return container.resolve_connector(self.tool_name, self.config)
+
+        from cospec.core.connectors import create_connector
+
+        return create_connector(self.tool_name, self.config)
+
+    def _run_connector(self, full_prompt: str) -> str:
+        """
+        Executes the prompt through an in-process connector (no subprocess spawn).
+        """
+        connector = self._get_connector()
+        try:
+            response = connector.query(full_prompt)
+            reported = getattr(connector, "last_prompt_tokens", None)
+            self._actual_tokens = reported if isinstance(reported, int) else None
+        except ToolExecutionError as e:
+            raise self._connector_error(e, full_prompt) from e
+
+        if self.logger:
+            self.logger.info("Tool execution completed successfully")
+
+        return response
+
+    def _connector_error(self, error: ToolExecutionError, full_prompt: str) -> ToolExecutionError:
+        """Report a connector failure to the exception handler and return the error to raise."""
+        if self.exception_handler:
+            error_context = {
+                "tool_name": self.tool_name,
+                "base_url": self.tool_config.base_url,
+                "full_prompt_length": len(full_prompt),
+            }
+            self.exception_handler.handle(error, context=error_context, error_code="TOOL_EXECUTION_ERROR")
+        return ToolExecutionError(f"Error running tool {self.tool_name}: {error}", original_error=error.original_error)
+
+    def run_tool_batch(self, prompts: List[str]) -> List[Optional[str]]:
+        """
+        Executes several independent prompts with as few tool invocations as the transport allows.
+        CLI tools receive packed prompts; HTTP tools receive concurrent requests.
+        Prompts that failed yield None; the batch raises only when every prompt failed.
+        """
+        if self.logger:
+            self.logger.info(f"Executing {len(prompts)} prompts as a batch: {self.tool_name}")
+
+        full_prompts = [self._build_prompt(prompt) for prompt in prompts]
+        started = time.perf_counter()
+        exit_code = -1
+        output_bytes = 0
+        try:
+            with span("run_tool_batch", tool=self.tool_name, type=self.tool_config.type, prompts=len(prompts)):
+                results = self._get_connector().batch_query(full_prompts)
+            exit_code = 0
+            output_bytes = sum(len(result.encode("utf-8")) for result in results if result is not None)
+            failed = sum(result is None for result in results)
+            if failed and self.logger:
+                self.logger.warning(f"{failed} of {len(prompts)} batched prompts failed: {self.tool_name}")
+            return results
+        except ToolExecutionError as e:
+            exit_code = self._exit_code(e)
+            raise self._connector_error(e, "\n".join(full_prompts)) from e
+        finally:
+            # The batch is recorded as one run covering all of its prompts
+            self._record_run(started, "\n".join(prompts), exit_code, output_bytes)
+            checkpoint("tool_executed")
+
+    def stream_tool(self, prompt: str) -> "TokenStream":
+        """
+        Executes the tool and yields the response incrementally.
+        CLI tools produce their whole output as a single chunk once the process exits.
+        """
+        from cospec.core.connectors import TokenStream
+
+        if self.tool_config.type == "cli":
+            return TokenStream(iter([self.run_tool(prompt)]))
+
+        if self.logger:
+            self.logger.info(f"Streaming from tool: {self.tool_name}")
+
+        full_prompt = self._build_prompt(prompt)
+        return TokenStream(self._recorded_stream(self._get_connector().stream(full_prompt), prompt, full_prompt))
+
+    def _recorded_stream(self, chunks: Iterator[str], prompt: str, full_prompt: str) -> Iterator[str]:
+        """Pass chunks through, handle connector failures like run_tool and record the run once the stream ends."""
+        started = time.perf_counter()
+        exit_code = -1
+        output_bytes = 0
+        try:
+            with span("stream_tool", tool=self.tool_name, type=self.tool_config.type):
+                for chunk in chunks:
+                    output_bytes += len(chunk.encode("utf-8"))
+                    yield chunk
+            exit_code = 0
+        except ToolExecutionError as e:
+            exit_code = self._exit_code(e)
+            raise self._connector_error(e, full_prompt) from e
+        except Exception as e:
+            exit_code = self._exit_code(e)
+            raise
+        finally:
+            self._record_run(started, prompt, exit_code, output_bytes)
+            checkpoint("tool_executed")
+
     def get_dependencies(self) -> Optional["BaseDeps"]:
         """Get the dependency container for this agent."""
         return self._deps
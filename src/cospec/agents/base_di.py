@@ -6,12 +6,12 @@ ensuring backward compatibility while enabling DI adoption.
 """
 
 import os
-import tempfile
 from pathlib import Path
 from typing import Optional
 
 from cospec.core.adapters import SubprocessManager
 from cospec.core.config import CospecConfig, ToolConfig
+from cospec.core.connectors import build_cli_command
 from cospec.core.exceptions import CospecError, ToolExecutionError
 from cospec.core.interfaces import (
     AnalyzerInterface,
@@ -19,6 +19,7 @@ from cospec.core.interfaces import (
     LoggerInterface,
     TemplateRendererInterface,
 )
+from cospec.dependencies import get_container
 from cospec.dependencies.deps import BaseDeps
 
 
@@ -58,10 +59,11 @@ class DIBaseAgent:
             # Traditional initialization - create minimal deps
             from cospec.core.adapters import ConsoleLogger, FileConfig, GenericExceptionHandler
 
+            logger = ConsoleLogger()  # Default logger
             self._deps = BaseDeps(
-                logger=ConsoleLogger(),  # Default logger
+                logger=logger,
                 config=FileConfig(config),
-                exception_handler=GenericExceptionHandler(ConsoleLogger()),
+                exception_handler=GenericExceptionHandler(logger),
             )
         else:
             raise ValueError("Either 'config' or 'deps' must be provided")
@@ -69,12 +71,14 @@ class DIBaseAgent:
         self.config = config
         self.tool_name = tool_name or config.default_tool
 
-        if self.tool_name not in config.tools:
+        tool_config = config.resolve_tool(self.tool_name)
+        if tool_config is None:
             raise ValueError(f"Tool '{self.tool_name}' not configured.")
 
-        self.tool_config: ToolConfig = config.tools[self.tool_name]
+        self.tool_config: ToolConfig = tool_config
 
         # Initialize services from DI
+        self._container = get_container()
         self.logger = self._resolve_service(LoggerInterface, "logger")
         self.exception_handler = self._resolve_service(ExceptionHandlerInterface, "exception_handler")
         self.analyzer = self._resolve_service(AnalyzerInterface, "analyzer")
@@ -82,17 +86,11 @@ class DIBaseAgent:
 
     def _resolve_service(self, interface, attr_name: str):
         """Resolve service from DI or fallback to deps attribute."""
-        # Try container first
-        try:
-            from cospec.dependencies import get_container
-
-            container = get_container()
-            return container.resolve(interface)
-        except (RuntimeError, ValueError):
-            pass
-
-        # Fallback to deps attribute
-        return getattr(self._deps, attr_name, None)
+        service = self._container.resolve_optional(interface)
+        if service is None:
+            # Fallback to deps attribute
+            service = getattr(self._deps, attr_name, None)
+        return service
 
     def _build_prompt(self, base_prompt: str) -> str:
         """Appends language instruction to the prompt."""
@@ -117,10 +115,10 @@ class DIBaseAgent:
 
         full_prompt = self._build_prompt(prompt)
 
-        cmd_args = [self.tool_config.command]
+        if self.tool_config.type != "cli":
+            return self._run_connector(full_prompt)
 
-        has_file_placeholder = any("{file}" in arg for arg in self.tool_config.args)
-        has_prompt_placeholder = any("{prompt}" in arg for arg in self.tool_config.args)
+        cmd_args = [self.tool_config.command]
 
         # Prepare local cache directory for temp files
         cache_dir = Path.cwd() / ".cospec" / "cache"
@@ -130,39 +128,7 @@ class DIBaseAgent:
         execution_context = {"tool": self.tool_name, "command": self.tool_config.command}
 
         try:
-            if has_file_placeholder and "{prompt}" in str(self.tool_config.args):
-                with tempfile.NamedTemporaryFile(
-                    mode="w", delete=False, encoding="utf-8", suffix=".txt", dir=cache_dir
-                ) as f:
-                    f.write(full_prompt)
-                    temp_file = f.name
-
-                for arg in self.tool_config.args:
-                    if "{file}" in arg:
-                        cmd_args.append(arg.replace("{file}", temp_file))
-                    elif "{prompt}" in arg:
-                        pass
-                    else:
-                        cmd_args.append(arg)
-
-            elif has_prompt_placeholder:
-                if len(full_prompt) > 8000:
-                    with tempfile.NamedTemporaryFile(
-                        mode="w", delete=False, encoding="utf-8", suffix=".txt", dir=cache_dir
-                    ) as f:
-                        f.write(full_prompt)
-                        temp_file = f.name
-
-                    cmd_args.append(f"@{temp_file}")
-                else:
-                    for arg in self.tool_config.args:
-                        if "{prompt}" in arg:
-                            cmd_args.append(arg.replace("{prompt}", full_prompt))
-                        else:
-                            cmd_args.append(arg)
-            else:
-                for arg in self.tool_config.args:
-                    cmd_args.append(arg)
+            cmd_args, temp_file = build_cli_command(self.tool_config, full_prompt, cache_dir)
 
             process_manager = SubprocessManager()
             result = process_manager.run(cmd_args)
@@ -205,6 +171,23 @@ class DIBaseAgent:
                     if self.logger:
                         self.logger.warning(f"Failed to cleanup temp file: {cleanup_error}")
 
+    def _run_connector(self, full_prompt: str) -> str:
+        """Executes the prompt through the tool's in-process connector."""
+        from cospec.core.connectors import create_connector
+
+        if self.tool_name in self._container.get_registered_connectors():
+            connector = self._container.resolve_connector(self.tool_name, self.config)
+        else:
+            connector = create_connector(self.tool_name, self.config)
+
+        try:
+            return connector.query(full_prompt)
+        except ToolExecutionError as e:
+            if self.exception_handler:
+                error_context = {"tool_name": self.tool_name, "base_url": self.tool_config.base_url}
+                self.exception_handler.handle(e, context=error_context, error_code="TOOL_EXECUTION_ERROR")
+            raise
+
     def get_dependencies(self) -> BaseDeps:
         """Get the dependency container for this agent."""
         return self._deps
@@ -1,65 +1,141 @@
 import re
 from pathlib import Path
-from typing import List, Optional
+from typing import TYPE_CHECKING, List, Optional, Set, Tuple
 
 from cospec.agents.base import BaseAgent
 from cospec.core.analyzer import ProjectAnalyzer
 from cospec.core.config import CospecConfig
 from cospec.core.exceptions import PromptTemplateError, SpecNotFoundError
+from cospec.core.spec_parser import SpecClause, SpecModel, parse_spec
+from cospec.core.spec_snapshot import diff_spec, resolve_snapshot, save_snapshot, snapshot_spec
+from cospec.core.templates import load_template
+
+if TYPE_CHECKING:
+    from cospec.dependencies.deps import BaseDeps
+
+# 関連コンテキストの絞り込みに使う語（長いオプション名、英字の識別子、カタカナ語）
+_ARGUMENT_TERM = re.compile(r"--[A-Za-z][\w-]*")
+_ASCII_TERM = re.compile(r"[A-Za-z_][A-Za-z0-9_]{3,}")
+_KATAKANA_TERM = re.compile(r"[ァ-ヴー]{3,}")
+# どこにでも現れるため絞り込みに役立たない語
+_GENERIC_TERMS = {"エラー", "オプション", "デフォルト", "ファイル", "ユーザー", "メッセージ", "None", "True", "False"}
+_ERROR_KEYS = ("失敗時", "エラー", "例外")
 
 
 class HearerAgent(BaseAgent):
-    def __init__(self, config: CospecConfig, tool_name: Optional[str] = None) -> None:
-        super().__init__(config, tool_name)
+    def __init__(
+        self, config: CospecConfig, tool_name: Optional[str] = None, deps: Optional["BaseDeps"] = None
+    ) -> None:
+        super().__init__(config, tool_name, deps)
         self.analyzer = ProjectAnalyzer()
 
     def extract_unclear_points(self, spec_content: str) -> List[str]:
         """
         SPEC.md から不明点を抽出するロジック（ヒント用）
         """
-        unclear_points = []
+        return [hint for _clause, hint in self.find_unclear_clauses(spec_content)]
+
+    def find_unclear_clauses(self, spec_content: str) -> List[Tuple[SpecClause, str]]:
+        """
+        SPEC.md から不明点を含む記述と、そのヒント文を抽出する
+        """
+        unclear_points: List[Tuple[SpecClause, str]] = []
+        model = parse_spec(spec_content)
 
         # 1. 条件分岐の不明点を抽出
-        if_conditions = re.findall(r"- 時点: (.+)", spec_content)
-        for condition in if_conditions:
+        for clause in model.clauses_for("時点"):
+            condition = clause.value
             if "?" in condition or "不明" in condition or "未定" in condition:
-                unclear_points.append(f"条件 '{condition}' の詳細が不明です")
+                unclear_points.append((clause, f"条件 '{condition}' の詳細が不明です"))
 
         # 2. ユーザー入力の不明点を抽出
-        user_inputs = re.findall(r"- 引数: (.+?)(?:\n|$)", spec_content)
-        for input_desc in user_inputs:
+        for clause in model.clauses_for("引数"):
+            input_desc = clause.value
             if "任意" in input_desc or "オプション" in input_desc:
-                unclear_points.append(f"引数 '{input_desc.strip()}' の必須/任意の判断基準が不明です")
+                unclear_points.append((clause, f"引数 '{input_desc.strip()}' の必須/任意の判断基準が不明です"))
 
         # 3. エラー処理の不明点を抽出
-        error_patterns = [r"失敗時: (.+)", r"エラー: (.+)", r"例外: (.+)"]
-        for pattern in error_patterns:
-            errors = re.findall(pattern, spec_content)
-            for error in errors:
+        for key in _ERROR_KEYS:
+            for clause in model.clauses_for(key):
+                error = clause.value
                 if "未定義" in error or "不明" in error:
-                    unclear_points.append(f"エラー処理 '{error}' の詳細が不明です")
+                    unclear_points.append((clause, f"エラー処理 '{error}' の詳細が不明です"))
 
         # 4. 出力形式の不明点を抽出
-        output_patterns = [r"出力: (.+)", r"結果: (.+)"]
-        for pattern in output_patterns:
-            outputs = re.findall(pattern, spec_content)
-            for output in outputs:
+        for key in ("出力", "結果"):
+            for clause in model.clauses_for(key):
+                output = clause.value
                 if "?" in output or "不明" in output:
-                    unclear_points.append(f"出力形式 '{output}' の詳細が不明です")
+                    unclear_points.append((clause, f"出力形式 '{output}' の詳細が不明です"))
 
         return unclear_points
 
-    def create_mission_prompt(self) -> str:
+    def relevance_terms(self, model: SpecModel, clauses: List[SpecClause]) -> Set[str]:
+        """
+        不明点に関連するコンテキストを探すための語を集める
+
+        対象は不明点を含む機能要件の FR-ID、引数のオプション名、エラー処理の記述に現れる語。
+        """
+        terms: Set[str] = set()
+        for clause in clauses:
+            feature = model.feature_at(clause.line)
+            if feature:
+                terms.add(feature.fr_id)
+
+            for argument in _ARGUMENT_TERM.findall(clause.value):
+                terms.add(argument)
+                # typer のオプション --dry-run はソース上では dry_run になる
+                terms.add(argument.lstrip("-").replace("-", "_"))
+
+            if clause.key in _ERROR_KEYS:
+                terms.update(_ASCII_TERM.findall(clause.value))
+                terms.update(_KATAKANA_TERM.findall(clause.value))
+
+        return {term for term in terms if term not in _GENERIC_TERMS}
+
+    def focused_spec_sections(self, model: SpecModel, spec_content: str, clauses: List[SpecClause]) -> List[str]:
+        """
+        不明点を含む SPEC.md の箇所を返す（機能要件内なら FR セクション全体、それ以外は見出し単位）
+        """
+        lines = spec_content.split("\n")
+        spans: List[Tuple[int, int]] = []
+        for clause in clauses:
+            feature = model.feature_at(clause.line)
+            section = model.section_at(clause.line)
+            if feature:
+                span = (feature.start, feature.end)
+            elif section:
+                span = (section.start, section.end)
+            else:
+                span = (clause.line, clause.line + 1)
+            if span not in spans:
+                spans.append(span)
+
+        return ["\n".join(lines[start:end]).strip() for start, end in spans]
+
+    def create_mission_prompt(self, focused: bool = False) -> str:
         """
         AIエージェント向けの指令プロンプトを生成する
+
+        focused=True の場合は、プロジェクト全体ではなく不明点に関連する SPEC のセクション・
+        ドキュメントのセクション・ソースファイルだけをコンテキストとして埋め込む。
         """
-        project_context = self.analyzer.collect_context()
         spec_content = self.analyzer.get_spec_content()
 
         if not spec_content:
             raise SpecNotFoundError("docs/SPEC.md が見つかりません。まずは `cospec init` を実行してください。")
 
-        unclear_points = self.extract_unclear_points(spec_content)
+        unclear_clauses = self.find_unclear_clauses(spec_content)
+        unclear_points = [hint for _clause, hint in unclear_clauses]
+
+        if focused:
+            model = parse_spec(spec_content)
+            clauses = [clause for clause, _hint in unclear_clauses]
+            # 不明点がなければ SPEC.md 全体だけを渡す
+            sections = self.focused_spec_sections(model, spec_content, clauses) if clauses else [spec_content]
+            project_context = self.analyzer.collect_focused_context(sections, self.relevance_terms(model, clauses))
+        else:
+            project_context = self.analyzer.collect_context()
 
         hint_text = ""
         if unclear_points:
@@ -72,8 +148,54 @@ class HearerAgent(BaseAgent):
         if not template_path.exists():
             raise PromptTemplateError("Prompt template (src/cospec/prompts/hearer.md) not found.")
 
-        template = template_path.read_text(encoding="utf-8")
-        prompt = template.replace("{project_context}", project_context)
-        prompt = prompt.replace("{unclear_points_hint}", hint_text)
+        # コンパイル済みテンプレートを 1 パスで展開（巨大なコンテキストを再走査しない）
+        template = load_template(template_path)
+        return template.render({"project_context": project_context, "unclear_points_hint": hint_text})
+
+    def create_delta_mission_prompt(self, since: str) -> Optional[str]:
+        """
+        前回のスナップショット以降に変更・追加された SPEC.md のセクションだけを対象に、差分プロンプトを生成する
+
+        since にはスナップショット ID・"last"・ファイルパス・git のリビジョンを指定できる。
+        不明点の抽出は変更されたセクションに対してのみ行い、最後に現在の SPEC.md のスナップショットを保存する。
+        変更がない場合は None を返す。
+        """
+        spec_content = self.analyzer.get_spec_content()
+        if not spec_content:
+            raise SpecNotFoundError("docs/SPEC.md が見つかりません。まずは `cospec init` を実行してください。")
 
+        snapshot = resolve_snapshot(since)
+        delta = diff_spec(snapshot, spec_content)
+
+        prompt = None
+        if not delta.is_empty:
+            changed = [("変更", key, section) for key, section in delta.changed]
+            changed += [("追加", key, section) for key, section in delta.added]
+
+            # 変更されたセクションだけを走査する
+            unclear_points = self.extract_unclear_points("\n\n".join(section.text for _, _, section in changed))
+            if unclear_points:
+                hint_text = "\n".join(f"- {p}" for p in unclear_points)
+            else:
+                hint_text = (
+                    "- (変更箇所に正規表現による明示的な不明点は検出されませんでした。変更内容を精査してください)"
+                )
+
+            template_path = Path(__file__).parent.parent / "prompts" / "hearer_delta.md"
+            if not template_path.exists():
+                raise PromptTemplateError("Prompt template (src/cospec/prompts/hearer_delta.md) not found.")
+
+            prompt = load_template(template_path).render(
+                {
+                    "since": since if snapshot.digest else "初回",
+                    "changed_sections": "\n\n".join(
+                        f"[{kind}] {key}\n{section.text.strip()}" for kind, key, section in changed
+                    )
+                    or "(なし)",
+                    "removed_sections": "\n".join(f"- {key}" for key in delta.removed) or "- (なし)",
+                    "unclear_points_hint": hint_text,
+                }
+            )
+
+        save_snapshot(snapshot_spec(spec_content))
         return prompt
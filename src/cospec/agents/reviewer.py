@@ -1,41 +1,110 @@
-from typing import Optional
+from typing import TYPE_CHECKING, List, Optional, Tuple
 
 from cospec.agents.base import BaseAgent
 from cospec.core.analyzer import ProjectAnalyzer
 from cospec.core.config import CospecConfig
+from cospec.core.exceptions import PromptTooLargeError
+from cospec.core.preflight import MAX_SHARDS, SHARD_FILL, Preflight, shard_context
+
+if TYPE_CHECKING:
+    from cospec.core.connectors import TokenStream
+    from cospec.dependencies.deps import BaseDeps
+
+REVIEW_INSTRUCTIONS = (
+    "You are a strict code reviewer. Compare the documentation and code provided below.\n"
+    "Identify inconsistencies, missing features, and guideline violations.\n"
+    "\n"
+    "IMPORTANT:\n"
+    "1. Check 'docs/PLAN.md' and 'docs/WorkingLog.md' first.\n"
+    "2. If a missing feature is listed in PLAN.md or\n"
+    "   WorkingLog.md, do NOT report it as a 'Missing Feature'\n"
+    "   failure. Instead, acknowledge it as 'Planned' or\n"
+    "   'In Progress'.\n"
+    "3. Focus your criticism on unimplemented features that\n"
+    "   are NOT planned, or inconsistencies in what IS\n"
+    "   implemented.\n"
+    "\n"
+    "Output a Markdown report.\n\n"
+)
+
+CONTEXT_HEADER = "--- Context ---\n"
 
 
 class ReviewerAgent(BaseAgent):
-    def __init__(self, config: CospecConfig, tool_name: Optional[str] = None) -> None:
-        super().__init__(config, tool_name)
+    def __init__(
+        self, config: CospecConfig, tool_name: Optional[str] = None, deps: Optional["BaseDeps"] = None
+    ) -> None:
+        super().__init__(config, tool_name, deps)
 
-    def review_project(self) -> str:
+    @staticmethod
+    def build_review_prompt() -> str:
         """
-        Analyzes project and returns a review report.
+        Collects the project context and builds the review prompt (the same for every tool).
         """
         analyzer = ProjectAnalyzer()
-        context = analyzer.collect_context()
-
-        system_prompt = (
-            "You are a strict code reviewer. Compare the documentation and code provided below.\n"
-            "Identify inconsistencies, missing features, and guideline violations.\n"
-            "\n"
-            "IMPORTANT:\n"
-            "1. Check 'docs/PLAN.md' and 'docs/WorkingLog.md' first.\n"
-            "2. If a missing feature is listed in PLAN.md or\n"
-            "   WorkingLog.md, do NOT report it as a 'Missing Feature'\n"
-            "   failure. Instead, acknowledge it as 'Planned' or\n"
-            "   'In Progress'.\n"
-            "3. Focus your criticism on unimplemented features that\n"
-            "   are NOT planned, or inconsistencies in what IS\n"
-            "   implemented.\n"
-            "\n"
-            "Output a Markdown report.\n\n"
-            "--- Context ---\n"
-        )
-
-        full_prompt = system_prompt + context
-
-        print(f"Review prompt length: {len(full_prompt)} characters")
-
-        return self.run_tool(full_prompt)
+        return REVIEW_INSTRUCTIONS + CONTEXT_HEADER + analyzer.collect_context()
+
+    def shard_review_prompt(self, prompt: str, check: Preflight) -> List[str]:
+        """
+        Splits a review prompt that exceeds the tool's limit into prompts that each fit.
+        Every shard repeats the instructions and covers a part of the context.
+
+        Raises:
+            PromptTooLargeError: If more than MAX_SHARDS prompts would be needed.
+        """
+        if not check.over_limit or check.limit is None:
+            return [prompt]
+
+        header = REVIEW_INSTRUCTIONS + CONTEXT_HEADER
+        context = prompt[len(header) :] if prompt.startswith(header) else prompt
+        # Room for the instructions and the part note
+        budget = int(check.limit * SHARD_FILL) - check.estimate(header) - 50
+        shards = shard_context(context, max(budget, 1), check.estimate)
+        if len(shards) > MAX_SHARDS:
+            raise PromptTooLargeError(
+                f"The review prompt (~{check.estimated_tokens:,} tokens) would need {len(shards)} parts to fit the "
+                f"{check.limit:,} token limit of {self.tool_name} (at most {MAX_SHARDS}); "
+                "use a tool with a larger limit or --no-auto-shard"
+            )
+        return [
+            f"{REVIEW_INSTRUCTIONS}This is part {index} of {len(shards)} of the project context; "
+            f"review only what is included.\n\n{CONTEXT_HEADER}{shard}"
+            for index, shard in enumerate(shards, start=1)
+        ]
+
+    def review_prompts(self, prompts: List[str]) -> str:
+        """
+        Runs the review prompts and returns the report (sharded reports are joined per part).
+        """
+        if len(prompts) == 1:
+            return self.run_tool(prompts[0])
+
+        parts = []
+        for index, prompt in enumerate(prompts, start=1):
+            self.preflight(prompt)
+            parts.append(f"## Part {index}/{len(prompts)}\n\n{self.run_tool(prompt).strip()}\n")
+        return "\n".join(parts)
+
+    def plan_review(self, prompt: Optional[str] = None, auto_shard: bool = True) -> Tuple[List[str], Preflight]:
+        """
+        Runs the preflight for the review prompt and returns the prompts to send with the preflight.
+        Prompts over the tool's limit are split into shards unless ``auto_shard`` is False.
+        """
+        prompt = prompt or self.build_review_prompt()
+        check = self.preflight(prompt)
+        if auto_shard and check.over_limit:
+            return self.shard_review_prompt(prompt, check), check
+        return [prompt], check
+
+    def review_project(self, prompt: Optional[str] = None, auto_shard: bool = True) -> str:
+        """
+        Analyzes project and returns a review report (see ``plan_review``).
+        """
+        prompts, _check = self.plan_review(prompt, auto_shard)
+        return self.review_prompts(prompts)
+
+    def stream_review(self, prompt: Optional[str] = None) -> "TokenStream":
+        """
+        Analyzes project and yields the review report as it is generated.
+        """
+        return self.stream_tool(prompt or self.build_review_prompt())
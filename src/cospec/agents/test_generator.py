@@ -1,119 +1,203 @@
+import hashlib
+import itertools
+import json
 import re
+import time
+from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import TYPE_CHECKING, Any, Dict, Iterable, Iterator, List, Optional, TextIO, Tuple
 
 from cospec.agents.base import BaseAgent
 from cospec.core.analyzer import ProjectAnalyzer
 from cospec.core.config import CospecConfig
+from cospec.core.dedupe import NearDuplicateIndex
+from cospec.core.exceptions import SpecNotFoundError, ToolExecutionError
+from cospec.core.fileutils import atomic_write_text
+from cospec.core.spec_parser import BEHAVIOR_SECTION, OUTPUT_SECTION, parse_spec
+
+if TYPE_CHECKING:
+    from cospec.dependencies.deps import BaseDeps
+
+# 生成テンプレートを変更したら上げる（既存ファイルを再生成させるため）
+GENERATOR_VERSION = "2"
+MANIFEST_FILENAME = ".cospec-manifest.json"
+CONFTEST_FILENAME = "conftest.py"
+GENERATED_HEADER = "Generated by cospec test-gen command"
+PRIORITY_MARKERS = ("high", "medium", "low")
+
+CONFTEST_CONTENT = f'''"""
+Pytest configuration for generated tests
+{GENERATED_HEADER}
+"""
+
+
+def pytest_configure(config):
+    # シナリオの優先度をマーカーとして登録する（例: pytest -m high）
+    for priority in {PRIORITY_MARKERS!r}:
+        config.addinivalue_line("markers", f"{{priority}}: {{priority}} priority scenarios")
+'''
+
+# シナリオ説明文の文字シングルの Jaccard 類似度がこれ以上なら同一シナリオとみなす
+DEDUPE_THRESHOLD = 0.8
+
+IMPLEMENT_PROMPT = (
+    "You are writing pytest tests for the feature '{feature}'.\n"
+    "Replace every `# TODO` stub in the skeleton below with a real test body that checks the scenario\n"
+    "described in the test's docstring. Keep the class name, method names and docstrings.\n"
+    "Mock all external I/O (subprocesses, network, filesystem).\n"
+    "Return only the complete Python file in a single ```python code block.\n\n"
+    "--- Skeleton ---\n{skeleton}"
+)
+
+
+def write_scenarios_jsonl(scenarios: Iterable[Dict[str, Any]], stream: TextIO) -> int:
+    """
+    シナリオを 1 行 1 JSON オブジェクトとして順に書き出し、書き出した件数を返す
+    """
+    count = 0
+    for scenario in scenarios:
+        stream.write(json.dumps(scenario, ensure_ascii=False) + "\n")
+        count += 1
+    stream.flush()
+    return count
+
+
+@dataclass
+class GeneratedFilesReport:
+    """Files written, left untouched and removed by a test-gen run."""
+
+    written: List[str] = field(default_factory=list)
+    unchanged: List[str] = field(default_factory=list)
+    removed: List[str] = field(default_factory=list)
 
 
 class TestGeneratorAgent(BaseAgent):
-    def __init__(self, config: CospecConfig, tool_name: Optional[str] = None) -> None:
-        super().__init__(config, tool_name)
+    def __init__(
+        self, config: CospecConfig, tool_name: Optional[str] = None, deps: Optional["BaseDeps"] = None
+    ) -> None:
+        super().__init__(config, tool_name, deps)
         self.analyzer = ProjectAnalyzer()
 
     def extract_test_scenarios_from_spec(self, spec_content: str) -> List[Dict[str, Any]]:
         """
         SPEC.md からテストシナリオを抽出する
         """
-        scenarios = []
+        return list(self.iter_test_scenarios_from_spec(spec_content))
+
+    def iter_test_scenarios_from_spec(self, spec_content: str) -> Iterator[Dict[str, Any]]:
+        """
+        SPEC.md からテストシナリオを抽出順に 1 件ずつ返す
+        """
+        model = parse_spec(spec_content)
 
         # 1. 機能要件からテストシナリオを抽出
-        fr_sections = re.findall(r"## FR-\d+: (.+?)(?=\n##|\n#|\Z)", spec_content, re.DOTALL)
-
-        for fr_section in fr_sections:
-            fr_title = fr_section.split("\n")[0].strip()
-            fr_body = "\n".join(fr_section.split("\n")[1:]).strip()
-
-            # 期待される挙動を抽出
-            expected_behaviors = re.findall(r"### 期待される挙動\n(.*?)(?=\n###|\n##|\Z)", fr_body, re.DOTALL)
-
-            if expected_behaviors:
-                behaviors_text = expected_behaviors[0].strip()
-                # 只取以 '-' 开头的行
-                for line in behaviors_text.split("\n"):
-                    line = line.strip()
-                    if line.startswith("-"):
-                        scenario = {
-                            "type": "functional",
-                            "feature": fr_title,
-                            "description": line.lstrip("- ").strip(),
-                            "priority": "high",
-                        }
-                        scenarios.append(scenario)
-
-            # 条件分岐を抽出
-            conditions = re.findall(r"### ユーザー入力\n(.*?)(?=\n###|\n##|\Z)", fr_body, re.DOTALL)
-
-            if conditions:
-                conditions_text = conditions[0].strip()
-                # 只取以 '-' 开头的行
-                for line in conditions_text.split("\n"):
-                    line = line.strip()
-                    if line.startswith("-"):
-                        scenario = {
-                            "type": "input_validation",
-                            "feature": fr_title,
-                            "description": line.lstrip("- ").strip(),
-                            "priority": "medium",
-                        }
-                        scenarios.append(scenario)
+        for feature in model.features:
+            # 期待される挙動
+            for behavior in feature.behaviors:
+                yield {"type": "functional", "feature": feature.title, "description": behavior, "priority": "high"}
+
+            # ユーザー入力
+            for user_input in feature.inputs:
+                yield {
+                    "type": "input_validation",
+                    "feature": feature.title,
+                    "description": user_input,
+                    "priority": "medium",
+                }
 
         # 2. エラー処理シナリオを抽出（重複を避ける）
         seen_errors = set()
         # 只在 "期待される挙動" 部分中查找失敗時
-        behavior_sections = re.findall(r"### 期待される挙動\n(.*?)(?=\n###|\n##|\Z)", spec_content, re.DOTALL)
-        for section in behavior_sections:
-            error_scenarios = re.findall(r"失敗時: (.+?)(?=\n|$)", section)
-            for error in error_scenarios:
-                error_text = error.strip()
-                if error_text and error_text not in seen_errors:
-                    scenarios.append(
-                        {
-                            "type": "error_handling",
-                            "feature": "error_handling",
-                            "description": error_text,
-                            "priority": "high",
-                        }
-                    )
-                    seen_errors.add(error_text)
+        for clause in model.clauses_for("失敗時", section=BEHAVIOR_SECTION):
+            error_text = clause.value.strip()
+            if error_text and error_text not in seen_errors:
+                yield {
+                    "type": "error_handling",
+                    "feature": "error_handling",
+                    "description": error_text,
+                    "priority": "high",
+                }
+                seen_errors.add(error_text)
 
         # 3. 出力形式シナリオを抽出（重複を避ける）
         seen_outputs = set()
         # 只在 "出力" 部分中查找
-        output_sections = re.findall(r"### 出力\n(.*?)(?=\n###|\n##|\Z)", spec_content, re.DOTALL)
-        for section in output_sections:
-            output_scenarios = re.findall(r"出力: (.+?)(?=\n|$)", section)
-            for output in output_scenarios:
-                output_text = output.strip()
-                if output_text and output_text not in seen_outputs:
-                    scenarios.append(
-                        {
-                            "type": "output_format",
-                            "feature": "output_format",
-                            "description": output_text,
-                            "priority": "medium",
-                        }
-                    )
-                    seen_outputs.add(output_text)
-
-        return scenarios
+        for clause in model.clauses_for("出力", section=OUTPUT_SECTION):
+            output_text = clause.value.strip()
+            if output_text and output_text not in seen_outputs:
+                yield {
+                    "type": "output_format",
+                    "feature": "output_format",
+                    "description": output_text,
+                    "priority": "medium",
+                }
+                seen_outputs.add(output_text)
 
     def extract_test_scenarios_from_plan(self, plan_content: str) -> List[Dict[str, Any]]:
         """
         PLAN.md からテストシナリオを抽出する
         """
-        scenarios = []
+        return list(self.iter_test_scenarios_from_plan(plan_content))
 
+    def iter_test_scenarios_from_plan(self, plan_content: str) -> Iterator[Dict[str, Any]]:
+        """
+        PLAN.md からテストシナリオを抽出順に 1 件ずつ返す
+        """
         # 実装予定のタスクからテストシナリオを抽出
-        todo_items = re.findall(r"- \[ \] (.+)", plan_content)
+        for todo in re.finditer(r"- \[ \] (.+)", plan_content):
+            yield {
+                "type": "integration",
+                "feature": "implementation",
+                "description": todo.group(1).strip(),
+                "priority": "low",
+            }
+
+    def iter_scenarios(self, dedupe: bool = True, include_merged: bool = False) -> Iterator[Dict[str, Any]]:
+        """
+        docs/SPEC.md と docs/PLAN.md のシナリオを抽出しながら 1 件ずつ返す（全件のリストは作らない）
+
+        dedupe=True の場合は、既に返したシナリオとほぼ同一のシナリオを読み飛ばす。
+        include_merged=True の場合は読み飛ばさず、代表シナリオの説明文を "duplicate_of" として付けて返す。
+        """
+        spec_path = Path("docs/SPEC.md")
+        if not spec_path.exists():
+            raise SpecNotFoundError("SPEC.md ファイルが見つかりません")
 
-        for todo in todo_items:
-            scenarios.append(
-                {"type": "integration", "feature": "implementation", "description": todo.strip(), "priority": "low"}
-            )
+        sources = [self.iter_test_scenarios_from_spec(spec_path.read_text(encoding="utf-8"))]
+        plan_path = Path("docs/PLAN.md")
+        if plan_path.exists():
+            sources.append(self.iter_test_scenarios_from_plan(plan_path.read_text(encoding="utf-8")))
+
+        index: Optional[NearDuplicateIndex[int]] = NearDuplicateIndex(threshold=DEDUPE_THRESHOLD) if dedupe else None
+        descriptions: Dict[int, str] = {}
+        for key, scenario in enumerate(itertools.chain.from_iterable(sources)):
+            representative = index.add(key, scenario["description"]) if index is not None else None
+            if representative is None:
+                descriptions[key] = scenario["description"]
+                yield scenario
+            elif include_merged:
+                yield {**scenario, "duplicate_of": descriptions[representative]}
+
+    def deduplicate_scenarios(
+        self, scenarios: List[Dict[str, Any]], threshold: float = DEDUPE_THRESHOLD
+    ) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+        """
+        説明文がほぼ同一のシナリオをクラスタにまとめ、クラスタごとに最初のシナリオだけを残す
 
-        return scenarios
+        SPEC と PLAN をまたいで比較する。戻り値は (残したシナリオ, 統合したシナリオ) で、
+        統合したシナリオには代表シナリオの説明文を "duplicate_of" として付ける。
+        """
+        index: NearDuplicateIndex[int] = NearDuplicateIndex(threshold=threshold)
+        representatives = index.add_many((i, scenario["description"]) for i, scenario in enumerate(scenarios))
+
+        kept: List[Dict[str, Any]] = []
+        merged: List[Dict[str, Any]] = []
+        for scenario, representative in zip(scenarios, representatives, strict=True):
+            if representative is None:
+                kept.append(scenario)
+            else:
+                merged.append({**scenario, "duplicate_of": scenarios[representative]["description"]})
+        return kept, merged
 
     def generate_pytest_test_code(
         self, scenarios: List[Dict[str, Any]], output_dir: Optional[Path] = None
@@ -121,7 +205,26 @@ class TestGeneratorAgent(BaseAgent):
         """
         pytest 形式のテストコードを生成する
         """
+        test_files, _report = self.write_test_files(scenarios, output_dir)
+        return test_files
+
+    def write_test_files(
+        self,
+        scenarios: List[Dict[str, Any]],
+        output_dir: Optional[Path] = None,
+        implement: bool = False,
+        parametrize: bool = False,
+    ) -> Tuple[Dict[str, str], GeneratedFilesReport]:
+        """
+        テストコードを生成し、変更のあったファイルだけを書き込む
+
+        出力先のマニフェストにフィーチャーごとのシナリオ指紋を記録し、
+        指紋が変わらないファイルは再生成も書き込みもしない（mtime を保つ）。
+        implement=True の場合は、ツールにテスト本体の実装を依頼する（フィーチャー単位で並列実行）。
+        parametrize=True の場合は、同じ種類のシナリオを @pytest.mark.parametrize のテーブルにまとめる。
+        """
         test_files: Dict[str, str] = {}
+        report = GeneratedFilesReport()
 
         # フィーチャーごとにテストファイルを分類
         scenarios_by_feature: Dict[str, List[Dict[str, Any]]] = {}
@@ -131,36 +234,265 @@ class TestGeneratorAgent(BaseAgent):
                 scenarios_by_feature[feature] = []
             scenarios_by_feature[feature].append(scenario)
 
+        previous = self._load_manifest(output_dir) if output_dir else {}
+        manifest: Dict[str, Dict[str, str]] = {}
+        pending: Dict[str, List[Dict[str, Any]]] = {}
+
         for feature, feature_scenarios in scenarios_by_feature.items():
-            test_code = self._generate_test_file_content(feature, feature_scenarios)
             filename = f"test_{feature.lower().replace(' ', '_').replace('-', '_')}.py"
-            test_files[filename] = test_code
+            fingerprint = self._scenario_fingerprint(feature_scenarios, implement=implement, parametrize=parametrize)
+            manifest[feature] = {"file": filename, "fingerprint": fingerprint}
 
-        # 出力先ディレクトリに保存
-        if output_dir:
-            output_dir.mkdir(parents=True, exist_ok=True)
-            for filename, content in test_files.items():
+            if output_dir:
                 filepath = output_dir / filename
-                filepath.write_text(content, encoding="utf-8")
+                entry = previous.get(feature)
+                if entry and entry == manifest[feature] and filepath.exists():
+                    test_files[filename] = filepath.read_text(encoding="utf-8")
+                    report.unchanged.append(filename)
+                    continue
 
-        return test_files
+            pending[feature] = feature_scenarios
 
-    def _generate_test_file_content(self, feature: str, scenarios: List[Dict[str, Any]]) -> str:
+        if implement:
+            rendered = self._implement_test_files(pending, manifest, parametrize=parametrize)
+        else:
+            rendered = {feature: self._render_skeleton(feature, s, parametrize) for feature, s in pending.items()}
+
+        for feature, content in rendered.items():
+            filename = manifest[feature]["file"]
+            test_files[filename] = content
+
+            # 出力先ディレクトリに保存（一時ファイル経由でアトミックに置き換える）
+            if output_dir:
+                atomic_write_text(output_dir / filename, content)
+                report.written.append(filename)
+
+        if output_dir:
+            # 今回生成されなかったフィーチャーのファイルは削除する
+            current_files = {entry["file"] for entry in manifest.values()}
+            for feature, entry in previous.items():
+                if feature not in manifest and entry["file"] not in current_files:
+                    stale_path = output_dir / entry["file"]
+                    if stale_path.exists():
+                        stale_path.unlink()
+                    report.removed.append(entry["file"])
+
+            if parametrize:
+                self._write_conftest(output_dir)
+
+            if manifest != previous:
+                atomic_write_text(output_dir / MANIFEST_FILENAME, json.dumps(manifest, indent=2, ensure_ascii=False))
+
+        return test_files, report
+
+    def _implement_test_files(
+        self,
+        pending: Dict[str, List[Dict[str, Any]]],
+        manifest: Dict[str, Dict[str, str]],
+        parametrize: bool = False,
+    ) -> Dict[str, str]:
         """
-        個々のテストファイルの内容を生成
+        ツールにフィーチャーごとのテスト本体を実装させる
+
+        未キャッシュのフィーチャーはまとめて run_tool_batch に渡す（CLI ツールには
+        batch_size 件ずつ 1 回の呼び出しに詰め、HTTP ツールには並列リクエストで送る）。
+        結果はシナリオ指紋をキーに .cospec/cache/test_gen/ へキャッシュする。
+        失敗したプロンプトのフィーチャーだけスケルトンに戻し、成功した回答は保持・キャッシュする。
+        """
+        cache_dir = Path.cwd() / ".cospec" / "cache" / "test_gen"
+        rendered: Dict[str, str] = {}
+        to_generate: List[str] = []
+
+        for feature in pending:
+            cache_path = cache_dir / f"{manifest[feature]['fingerprint']}.py"
+            if cache_path.exists():
+                started = time.perf_counter()
+                rendered[feature] = cache_path.read_text(encoding="utf-8")
+                # キャッシュヒットもメトリクスに残す（プロンプトは組み立てないため空として記録）
+                self._record_run(started, "", 0, len(rendered[feature].encode("utf-8")), cache_hit=True)
+            else:
+                to_generate.append(feature)
+
+        if not to_generate:
+            return rendered
+
+        skeletons = {feature: self._render_skeleton(feature, pending[feature], parametrize) for feature in to_generate}
+        prompts = [IMPLEMENT_PROMPT.format(feature=feature, skeleton=skeletons[feature]) for feature in to_generate]
+        responses: List[Optional[str]]
+        try:
+            responses = list(self.run_tool_batch(prompts))
+        except ToolExecutionError as e:
+            if self.logger:
+                self.logger.warning(f"Test implementation failed, keeping the skeletons: {e}")
+            responses = [None] * len(to_generate)
+
+        for feature, response in zip(to_generate, responses, strict=True):
+            code = self._extract_python_code(response) if response is not None else None
+            if code is None:
+                if response is not None and self.logger:
+                    self.logger.warning(f"Tool returned no valid Python for '{feature}', keeping the skeleton")
+                rendered[feature] = skeletons[feature]
+                # 指紋を空にしておき、次回の実行で再度実装を試みる
+                manifest[feature]["fingerprint"] = ""
+                continue
+            atomic_write_text(cache_dir / f"{manifest[feature]['fingerprint']}.py", code)
+            rendered[feature] = code
+
+        return rendered
+
+    def _extract_python_code(self, response: str) -> Optional[str]:
+        """
+        ツールの応答から Python コードを取り出し、構文的に正しい場合のみ返す
+        """
+        blocks = re.findall(r"```(?:python|py)?[ \t]*\n(.*?)```", response, re.DOTALL)
+        code = max(blocks, key=len) if blocks else response
+        code = code.strip() + "\n"
+
+        try:
+            compile(code, "<generated>", "exec")
+        except SyntaxError:
+            return None
+        return code if "def test_" in code else None
+
+    def _scenario_fingerprint(
+        self, scenarios: List[Dict[str, Any]], implement: bool = False, parametrize: bool = False
+    ) -> str:
+        """
+        シナリオ（と生成器のバージョン・生成モード）から指紋を計算する
+        """
+        payload = json.dumps(
+            {
+                "generator": GENERATOR_VERSION,
+                "implement": implement,
+                "parametrize": parametrize,
+                "scenarios": scenarios,
+            },
+            sort_keys=True,
+            ensure_ascii=False,
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def _load_manifest(self, output_dir: Path) -> Dict[str, Dict[str, str]]:
+        """
+        出力先のマニフェストを読み込む（存在しない・壊れている場合は空）
+        """
+        manifest_path = output_dir / MANIFEST_FILENAME
+        if not manifest_path.exists():
+            return {}
+        try:
+            data = json.loads(manifest_path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return {}
+        return data if isinstance(data, dict) else {}
+
+    def _write_conftest(self, output_dir: Path) -> None:
+        """
+        優先度マーカーを登録する conftest.py を書き込む（ユーザーが用意した conftest.py は上書きしない）
+        """
+        conftest_path = output_dir / CONFTEST_FILENAME
+        if conftest_path.exists():
+            existing = conftest_path.read_text(encoding="utf-8")
+            if GENERATED_HEADER not in existing or existing == CONFTEST_CONTENT:
+                return
+        atomic_write_text(conftest_path, CONFTEST_CONTENT)
+
+    def _render_skeleton(self, feature: str, scenarios: List[Dict[str, Any]], parametrize: bool = False) -> str:
+        """
+        生成モードに応じてテストファイルの雛形を生成
+        """
+        if parametrize:
+            return self._generate_parametrized_file_content(feature, scenarios)
+        return self._generate_test_file_content(feature, scenarios)
+
+    def _generate_class_name(self, feature: str) -> str:
+        """
+        テストクラス名を生成（キャメルケースにする）
         """
-        # テストクラス名を生成（キャメルケースにする）
         # Remove underscores and spaces, then capitalize each word
         words = feature.replace("_", " ").split()
         class_name = "Test"
         for word in words:
             if word:
                 class_name += word.capitalize()
+        return class_name
+
+    def _generate_parametrized_file_content(self, feature: str, scenarios: List[Dict[str, Any]]) -> str:
+        """
+        同じ種類のシナリオを 1 つのテスト関数の parametrize テーブルにまとめたテストファイルを生成
+
+        優先度は pytest マーカー（high/medium/low）として各パラメータに付けるため、
+        CI では `pytest -m high` で重要なシナリオから実行できる。
+        """
+        class_name = self._generate_class_name(feature)
+
+        # 種類ごとに出現順を保ってグループ化
+        scenarios_by_type: Dict[str, List[Dict[str, Any]]] = {}
+        for scenario in scenarios:
+            scenarios_by_type.setdefault(scenario["type"], []).append(scenario)
+
+        test_methods = []
+        for scenario_type, typed_scenarios in scenarios_by_type.items():
+            params = []
+            used_ids: Dict[str, int] = {}
+            for scenario in typed_scenarios:
+                param_id = self._generate_param_id(scenario["description"], scenario["priority"], used_ids)
+                params.append(
+                    f"            pytest.param({scenario['description']!r}, id={param_id!r}, "
+                    f"marks=pytest.mark.{scenario['priority']}),\n"
+                )
+
+            method_name = re.sub(r"[^a-z0-9]+", "_", scenario_type.lower()).strip("_") or "scenario"
+            test_method = f'''    @pytest.mark.parametrize(
+        "description",
+        [
+{"".join(params)}        ],
+    )
+    def test_{method_name}(self, description):
+        """{scenario_type} のシナリオ（各パラメータの description を検証する）"""
+        # TODO: 実装を記述
+        pass
+
+'''
+            test_methods.append(test_method)
+
+        test_content = f'''"""
+Test cases for {feature}
+{GENERATED_HEADER}
+"""
+
+import pytest
+
+
+class {class_name}:
+{"".join(test_methods)}
+'''
+        return test_content
+
+    def _generate_param_id(self, description: str, priority: str, used_ids: Dict[str, int]) -> str:
+        """
+        parametrize の読みやすい ID を生成（英数字部分 + 優先度 + 種類内の連番）
+
+        pytest は非 ASCII の ID をエスケープして表示するため、英数字だけを使う。
+        """
+        slug = re.sub(r"[^a-z0-9]+", "-", description.lower()).strip("-")[:40].strip("-")
+        base = f"{priority}-{slug}" if slug else priority
+        used_ids[base] = used_ids.get(base, 0) + 1
+        return f"{base}-{used_ids[base]}" if used_ids[base] > 1 or not slug else base
+
+    def _generate_test_file_content(self, feature: str, scenarios: List[Dict[str, Any]]) -> str:
+        """
+        個々のテストファイルの内容を生成
+        """
+        class_name = self._generate_class_name(feature)
 
         test_methods = []
-        for _i, scenario in enumerate(scenarios):
-            # テストメソッド名を生成
+        used_names: Dict[str, int] = {}
+        for scenario in scenarios:
+            # テストメソッド名を生成（同名になる場合は連番を付けて後続の定義が前を上書きしないようにする）
             method_name = self._generate_method_name(scenario["description"])
+            used_names[method_name] = used_names.get(method_name, 0) + 1
+            if used_names[method_name] > 1:
+                method_name = f"{method_name}_{used_names[method_name]}"
             priority = scenario["priority"]
 
             test_method = f'''    def test_{method_name}(self):
@@ -174,7 +506,7 @@ class TestGeneratorAgent(BaseAgent):
 
         test_content = f'''"""
 Test cases for {feature}
-Generated by cospec test-gen command
+{GENERATED_HEADER}
 """
 
 import pytest
@@ -201,7 +533,13 @@ class {class_name}:
         # 重複を避けるためのサフィックスを付ける
         return f"{name}_scenario"
 
-    def generate_tests(self, output_dir: Optional[Path] = None) -> Dict[str, Any]:
+    def generate_tests(
+        self,
+        output_dir: Optional[Path] = None,
+        implement: bool = False,
+        dedupe: bool = True,
+        parametrize: bool = False,
+    ) -> Dict[str, Any]:
         """
         テストケースを自動生成するメインメソッド
         """
@@ -225,16 +563,27 @@ class {class_name}:
         # シナリオを統合
         all_scenarios = spec_scenarios + plan_scenarios
 
+        # ほぼ同一のシナリオを統合（LLM 呼び出しとテスト実行時間の無駄を省く）
+        merged_scenarios: List[Dict[str, Any]] = []
+        if dedupe:
+            all_scenarios, merged_scenarios = self.deduplicate_scenarios(all_scenarios)
+
         if not all_scenarios:
             return {
                 "status": "success",
                 "message": "テストシナリオが見つかりませんでした",
                 "scenarios": [],
                 "test_files": {},
+                "written": [],
+                "unchanged": [],
+                "removed": [],
+                "merged": merged_scenarios,
             }
 
-        # pytest テストコードを生成
-        test_files = self.generate_pytest_test_code(all_scenarios, output_dir)
+        # pytest テストコードを生成（変更のあったファイルのみ書き込む）
+        test_files, sync_report = self.write_test_files(
+            all_scenarios, output_dir, implement=implement, parametrize=parametrize
+        )
 
         return {
             "status": "success",
@@ -243,4 +592,8 @@ class {class_name}:
             "scenarios": all_scenarios,
             "test_files": test_files,
             "output_dir": str(output_dir) if output_dir else None,
+            "written": sync_report.written,
+            "unchanged": sync_report.unchanged,
+            "removed": sync_report.removed,
+            "merged": merged_scenarios,
         }
@@ -2,12 +2,11 @@
 
 import subprocess
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, TextIO
 
 import typer
 from rich.console import Console
 
-from cospec.core.config import CospecConfig
 from cospec.core.interfaces import (
     AnalyzerInterface,
     ConfigInterface,
@@ -19,6 +18,12 @@ from cospec.core.interfaces import (
     ProcessInterface,
     TemplateRendererInterface,
 )
+from cospec.core.jsonlog import LEVELS, level_number
+from cospec.core.templates import compile_template, load_template
+from cospec.core.tracing import span
+
+if TYPE_CHECKING:
+    from cospec.core.config import CospecConfig
 
 
 class TyperCLI(typer.Typer):
@@ -35,8 +40,8 @@ class TyperCLI(typer.Typer):
 class RichConsole(ConsoleInterface):
     """Concrete implementation using rich for console operations."""
 
-    def __init__(self) -> None:
-        self.console = Console()
+    def __init__(self, stderr: bool = False) -> None:
+        self.console = Console(stderr=stderr)
 
     def print(self, *args: Any, **kwargs: Any) -> None:
         """Print to console with formatting."""
@@ -73,7 +78,9 @@ class SubprocessManager(ProcessInterface):
     def run(self, command: List[str], cwd: Optional[str] = None, **kwargs: Any) -> subprocess.CompletedProcess:
         """Run external command."""
         try:
-            return subprocess.run(command, cwd=cwd, capture_output=True, text=True, check=True, **kwargs)
+            # Covers process spawn and the wait for the tool's answer
+            with span("subprocess", command=command[0] if command else ""):
+                return subprocess.run(command, cwd=cwd, capture_output=True, text=True, check=True, **kwargs)
         except subprocess.CalledProcessError as e:
             from cospec.core.exceptions import ToolExecutionError
 
@@ -84,30 +91,40 @@ class SubprocessManager(ProcessInterface):
 
 
 class ConsoleLogger(LoggerInterface):
-    """Logger implementation using Rich console."""
+    """Logger implementation using Rich console.
+
+    Structured fields (``extra=`` and other keyword arguments such as ``tool`` or
+    ``duration``) are accepted for interface compatibility with JsonLogger; the
+    console shows the message only.
+    """
 
-    def __init__(self):
-        self.console = Console()
+    def __init__(self, console: Optional[Console] = None, level: str = "warning"):
+        self.console = console or Console()
+        self._threshold = level_number(level)
+
+    def _log(self, severity: int, label: str, message: str) -> None:
+        if severity >= self._threshold:
+            self.console.print(f"{label} {message}")
 
     def debug(self, message: str, **kwargs) -> None:
         """Log debug message."""
-        self.console.print(f"[cyan]DEBUG:[/cyan] {message}", **kwargs)
+        self._log(LEVELS["debug"], "[cyan]DEBUG:[/cyan]", message)
 
     def info(self, message: str, **kwargs) -> None:
         """Log info message."""
-        self.console.print(f"[green]INFO:[/green] {message}", **kwargs)
+        self._log(LEVELS["info"], "[green]INFO:[/green]", message)
 
     def warning(self, message: str, **kwargs) -> None:
         """Log warning message."""
-        self.console.print(f"[yellow]WARNING:[/yellow] {message}", **kwargs)
+        self._log(LEVELS["warning"], "[yellow]WARNING:[/yellow]", message)
 
     def error(self, message: str, **kwargs) -> None:
         """Log error message."""
-        self.console.print(f"[red]ERROR:[/red] {message}", **kwargs)
+        self._log(LEVELS["error"], "[red]ERROR:[/red]", message)
 
     def critical(self, message: str, **kwargs) -> None:
         """Log critical message."""
-        self.console.print(f"[bold red]CRITICAL:[/bold red] {message}", **kwargs)
+        self._log(LEVELS["critical"], "[bold red]CRITICAL:[/bold red]", message)
 
 
 # ==== Exception Handler Implementation ====
@@ -154,8 +171,8 @@ class GenericExceptionHandler(ExceptionHandlerInterface):
 class RichFormatter(FormatterInterface):
     """Formatter using Rich for styled output."""
 
-    def __init__(self):
-        self.console = Console()
+    def __init__(self, console: Optional[Console] = None):
+        self.console = console or Console()
 
     def format_output(self, data: Any, format_type: Optional[str] = None) -> str:
         """Format output based on type."""
@@ -179,11 +196,7 @@ class YamlTemplateRenderer(TemplateRendererInterface):
 
     def render(self, template_string: str, context: Dict[str, Any]) -> str:
         """Render template string with context."""
-        result = template_string
-        for key, value in context.items():
-            placeholder = f"{{{key}}}"
-            result = result.replace(placeholder, str(value))
-        return result
+        return compile_template(template_string).render(context)
 
     def render_from_file(self, template_path: str, context: Dict[str, Any]) -> str:
         """Render template from file."""
@@ -191,8 +204,15 @@ class YamlTemplateRenderer(TemplateRendererInterface):
         if not path.exists():
             raise FileNotFoundError(f"Template file not found: {template_path}")
 
-        template_content = path.read_text(encoding="utf-8")
-        return self.render(template_content, context)
+        return load_template(path).render(context)
+
+    def render_to(self, stream: TextIO, template_path: str, context: Dict[str, Any]) -> None:
+        """Render template from file directly into a stream without building the whole string."""
+        path = Path(template_path)
+        if not path.exists():
+            raise FileNotFoundError(f"Template file not found: {template_path}")
+
+        load_template(path).render_to(stream, context)
 
 
 # ==== Analyzer Implementation ====
@@ -201,7 +221,7 @@ class YamlTemplateRenderer(TemplateRendererInterface):
 class ProjectAnalyzer(AnalyzerInterface):
     """Project analyzer for collecting context and structure."""
 
-    def __init__(self, config: CospecConfig):
+    def __init__(self, config: "CospecConfig"):
         self.config = config
 
     def analyze_project(self, project_path: Optional[str] = None) -> Dict[str, Any]:
@@ -266,7 +286,7 @@ class ProjectAnalyzer(AnalyzerInterface):
 class FileConfig(ConfigInterface):
     """Configuration adapter that loads from file."""
 
-    def __init__(self, config: CospecConfig):
+    def __init__(self, config: "CospecConfig"):
         self.config = config
 
     def load_from_file(self, config_path: Optional[str] = None) -> Dict[str, Any]:
@@ -1,4 +1,42 @@
+import ast
 from pathlib import Path
+from typing import Iterable, List, Set, Tuple
+
+from cospec.core.profiling import checkpoint
+from cospec.core.spec_parser import parse_spec
+from cospec.core.tracing import span, traced
+
+# Upper bound on source files embedded in a focused context (most relevant first)
+MAX_FOCUSED_SOURCE_FILES = 8
+
+
+def _count_mentions(text: str, terms: Iterable[str]) -> int:
+    return sum(text.count(term) for term in terms)
+
+
+def _python_excerpts(content: str, terms: Set[str]) -> List[Tuple[int, int]]:
+    """
+    Return the 1-based line ranges of the functions (or methods) that mention a term.
+
+    Module-level statements mentioning a term are returned as single-statement ranges.
+    Raises SyntaxError if the content is not valid Python.
+    """
+    lines = content.split("\n")
+    ranges: List[Tuple[int, int]] = []
+
+    def visit(nodes: List[ast.stmt]) -> None:
+        for node in nodes:
+            end = node.end_lineno or node.lineno
+            if not _count_mentions("\n".join(lines[node.lineno - 1 : end]), terms):
+                continue
+            if isinstance(node, ast.ClassDef):
+                visit(node.body)
+            else:
+                start = min([node.lineno] + [d.lineno for d in getattr(node, "decorator_list", [])])
+                ranges.append((start, end))
+
+    visit(ast.parse(content).body)
+    return ranges
 
 
 class ProjectAnalyzer:
@@ -18,25 +56,93 @@ class ProjectAnalyzer:
         """
         Collects content from key files (docs and source) to form the context for the LLM.
         """
+        with span("collect_context"):
+            context_parts = []
+
+            # 1. Read Documentation
+            docs_dir = self.root_dir / "docs"
+            if docs_dir.exists():
+                with span("read_docs"):
+                    for doc_file in docs_dir.glob("*.md"):
+                        # Read all markdown files including PLAN.md and WorkingLog.md
+                        context_parts.append(f"--- File: {doc_file} ---\n{doc_file.read_text(encoding='utf-8')}\n")
+
+            # 2. List Source Files & Read Content (Limit size)
+            # Reading src/cospec/**/*.py
+            with span("glob_sources"):
+                src_files = list(self.root_dir.glob("src/cospec/**/*.py"))
+
+            context_parts.append("--- Source Code ---")
+            with span("read_sources", files=len(src_files)):
+                for src_file in src_files:
+                    try:
+                        content = src_file.read_text(encoding="utf-8")
+                        context_parts.append(f"--- File: {src_file} ---\n{content}\n")
+                    except Exception as e:
+                        context_parts.append(f"--- File: {src_file} (Error reading: {e}) ---\n")
+
+            context = "\n".join(context_parts)
+        checkpoint("context_collected")
+        return context
+
+    @traced("collect_focused_context")
+    def collect_focused_context(
+        self, spec_sections: List[str], terms: Set[str], max_source_files: int = MAX_FOCUSED_SOURCE_FILES
+    ) -> str:
+        """
+        Collects only the context related to the given terms (FR-IDs, argument names, error terms).
+
+        The given SPEC.md sections are embedded as-is. Other docs contribute only the sections
+        that mention a term, and for the source files mentioning the terms most, only the
+        functions and methods that mention them are included.
+        """
         context_parts = []
 
-        # 1. Read Documentation
+        # 1. Relevant SPEC.md sections
+        spec_path = self.root_dir / "docs" / "SPEC.md"
+        context_parts.append(f"--- File: {spec_path} (relevant sections) ---\n" + "\n\n".join(spec_sections) + "\n")
+
+        if not terms:
+            return "\n".join(context_parts)
+
+        # 2. Matching sections of the other documents
         docs_dir = self.root_dir / "docs"
         if docs_dir.exists():
-            for doc_file in docs_dir.glob("*.md"):
-                # Read all markdown files including PLAN.md and WorkingLog.md
-                context_parts.append(f"--- File: {doc_file} ---\n{doc_file.read_text(encoding='utf-8')}\n")
-
-        # 2. List Source Files & Read Content (Limit size)
-        # Reading src/cospec/**/*.py
-        src_files = list(self.root_dir.glob("src/cospec/**/*.py"))
+            for doc_file in sorted(docs_dir.glob("*.md")):
+                if doc_file.name == "SPEC.md":
+                    continue
+                sections = parse_spec(doc_file.read_text(encoding="utf-8")).sections
+                matched = [section.text.strip() for section in sections if _count_mentions(section.text, terms)]
+                if matched:
+                    context_parts.append(
+                        f"--- File: {doc_file} (matching sections) ---\n" + "\n\n".join(matched) + "\n"
+                    )
 
-        context_parts.append("--- Source Code ---")
-        for src_file in src_files:
+        # 3. Source files that mention the terms, most mentions first
+        scored = []
+        for src_file in self.root_dir.glob("src/cospec/**/*.py"):
             try:
                 content = src_file.read_text(encoding="utf-8")
-                context_parts.append(f"--- File: {src_file} ---\n{content}\n")
-            except Exception as e:
-                context_parts.append(f"--- File: {src_file} (Error reading: {e}) ---\n")
+            except (OSError, UnicodeDecodeError):
+                continue
+            score = _count_mentions(content, terms)
+            if score:
+                scored.append((score, str(src_file), content))
+
+        scored.sort(key=lambda item: (-item[0], item[1]))
+        if scored:
+            context_parts.append("--- Source Code (related files) ---")
+        for _score, path, content in scored[:max_source_files]:
+            try:
+                ranges = _python_excerpts(content, terms)
+            except SyntaxError:
+                context_parts.append(f"--- File: {path} ---\n{content}\n")
+                continue
+
+            lines = content.split("\n")
+            excerpts = [f"# lines {start}-{end}\n" + "\n".join(lines[start - 1 : end]) for start, end in ranges]
+            context_parts.append(f"--- File: {path} (excerpts) ---\n" + "\n\n".join(excerpts) + "\n")
 
-        return "\n".join(context_parts)
+        context = "\n".join(context_parts)
+        checkpoint("context_collected")
+        return context
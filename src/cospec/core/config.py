@@ -1,20 +1,51 @@
+import contextvars
 import json
+import os
+import threading
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Tuple, Type
 
-from pydantic import BaseModel, Field
-from pydantic_settings import BaseSettings, SettingsConfigDict
+from pydantic import BaseModel, Field, PrivateAttr
+from pydantic_settings import (
+    BaseSettings,
+    DotEnvSettingsSource,
+    EnvSettingsSource,
+    PydanticBaseSettingsSource,
+    SettingsConfigDict,
+)
+
+from cospec.core.fileutils import atomic_write_text
+
+if TYPE_CHECKING:
+    from cospec.core.metrics import MetricsStore
+
+PROJECT_CONFIG_PATH = Path(".cospec/config.json")
 
 
 class ToolConfig(BaseModel):
-    command: str
-    args: List[str]
+    command: str = ""
+    args: List[str] = Field(default_factory=list)
+    type: str = "cli"
+    base_url: Optional[str] = None
+    model: Optional[str] = None
+    api_key_env: Optional[str] = None
+    timeout: float = 600.0
+    max_concurrency: int = 4
+    batch_size: int = 8
+    # Prompt token limit; defaults to the model family's context size (see cospec.core.tokens)
+    max_prompt_tokens: Optional[int] = None
 
 
 class CospecConfig(BaseSettings):
     default_tool: str = "qwen"
     dev_tool: str = ""
     language: str = "ja"
+    # "console" (Rich, human-readable) or "json" (JSON lines via a background writer)
+    log_format: str = "console"
+    # Progress messages are info; lower the level to "info" or "debug" for verbose output
+    log_level: str = "warning"
+    # JSON log destination; empty writes to stderr
+    log_file: str = ""
     tools: Dict[str, ToolConfig] = Field(
         default_factory=lambda: {
             "qwen": ToolConfig(command="qwen", args=["{prompt}"]),
@@ -24,14 +55,68 @@ class CospecConfig(BaseSettings):
 
     model_config = SettingsConfigDict(env_prefix="cospec_", env_file=".env", env_file_encoding="utf-8")
 
+    # Values as loaded (all layers merged) and whether no layer defined any tools; see save_to_file
+    _loaded: Optional[Dict[str, Any]] = PrivateAttr(default=None)
+    _tools_from_defaults: bool = PrivateAttr(default=True)
+
+    @classmethod
+    def settings_customise_sources(
+        cls,
+        settings_cls: Type[BaseSettings],
+        init_settings: PydanticBaseSettingsSource,
+        env_settings: PydanticBaseSettingsSource,
+        dotenv_settings: PydanticBaseSettingsSource,
+        file_secret_settings: PydanticBaseSettingsSource,
+    ) -> Tuple[PydanticBaseSettingsSource, ...]:
+        # load_config has already merged .env and COSPEC_* into the init values
+        if _init_values_only.get():
+            return (init_settings,)
+        return (init_settings, env_settings, dotenv_settings, file_secret_settings)
+
     def save_to_file(self, path: Optional[Path] = None) -> None:
-        """Save configuration to a JSON file."""
-        if path is None:
-            path = Path(".cospec/config.json")
+        """Save the settings changed since loading into the project config file.
 
-        path.parent.mkdir(parents=True, exist_ok=True)
-        with open(path, "w", encoding="utf-8") as f:
-            json.dump(self.model_dump(mode="json"), f, indent=2, ensure_ascii=False)
+        Only the project layer is written: the file is re-read and the keys (and tools)
+        that differ from the loaded values are applied to it, so values that came from
+        the user config, .env or COSPEC_* variables are never copied into the project.
+        """
+        if path is None:
+            path = PROJECT_CONFIG_PATH
+
+        loaded = self._loaded if self._loaded is not None else _default_values()
+        current = self.model_dump(mode="json")
+        project = _read_layer(path)
+
+        for key, value in current.items():
+            if key != "tools" and value != loaded.get(key):
+                project[key] = value
+
+        loaded_tools = loaded.get("tools", {})
+        changed_tools = [name for name, tool in current["tools"].items() if tool != loaded_tools.get(name)]
+        removed_tools = [name for name in loaded_tools if name not in current["tools"]]
+        if changed_tools or removed_tools:
+            # A tools layer replaces the built-in tool set, so the first one written keeps the built-ins
+            names = current["tools"] if self._tools_from_defaults else changed_tools
+            tools = dict(project.get("tools", {}))
+            for name in names:
+                # Only persist the tool settings that differ from the defaults (keeps CLI tool entries compact)
+                tools[name] = self.tools[name].model_dump(mode="json", exclude_defaults=True)
+            for name in removed_tools:
+                tools.pop(name, None)
+            project["tools"] = tools
+
+        # Write atomically so concurrent `agent add` runs never leave a truncated file behind
+        atomic_write_text(path, json.dumps(project, indent=2, ensure_ascii=False))
+        clear_config_cache()
+
+    def resolve_tool(self, name: str) -> Optional[ToolConfig]:
+        """Return a tool's configuration, falling back to an installed AI-Agent plugin (``cospec.agents``)."""
+        tool = self.tools.get(name)
+        if tool is None:
+            from cospec.core.plugins import load_agent_tool
+
+            tool = load_agent_tool(name)
+        return tool
 
     def select_tool_for_development(self) -> str:
         """Select AI-Agent for development commands (hear, test-gen)."""
@@ -39,37 +124,131 @@ class CospecConfig(BaseSettings):
             return self.dev_tool
         return self.default_tool
 
-    def select_tool_for_review(self) -> str:
+    def select_tool_for_review(
+        self, policy: str = "balanced", prompt_bytes: Optional[int] = None, store: Optional["MetricsStore"] = None
+    ) -> str:
         """Select AI-Agent for review command (not= dev tool)."""
-        other_tools = [name for name in self.tools.keys() if name != self.dev_tool]
-        if other_tools:
-            import random
-
-            return random.choice(other_tools)
-        return self.default_tool
+        return self.select_review_tools(policy=policy, count=1, prompt_bytes=prompt_bytes, store=store)[0]
+
+    def select_review_tools(
+        self,
+        policy: str = "balanced",
+        count: int = 2,
+        prompt_bytes: Optional[int] = None,
+        store: Optional["MetricsStore"] = None,
+    ) -> list[str]:
+        """Select AI-Agent tools for review command (2 tools if available, excluding dev_tool).
+
+        Tools are chosen from the invocations recorded in the metrics store according to
+        ``policy`` (``fastest``, ``balanced`` or ``diverse``); see ``choose_tools``.
+        """
+        from cospec.core.tool_history import choose_tools
 
-    def select_review_tools(self) -> list[str]:
-        """Select AI-Agent tools for review command (2 tools if available, excluding dev_tool)."""
         other_tools = [name for name in self.tools.keys() if name != self.dev_tool]
-        if len(other_tools) >= 2:
-            import random
-
-            return random.sample(other_tools, 2)
-        elif other_tools:
-            return [other_tools[0]]
-        else:
+        if not other_tools:
             return [self.default_tool]
+        return choose_tools(other_tools, count, policy=policy, store=store, prompt_bytes=prompt_bytes)
 
     @staticmethod
     def load_config(config_path: Optional[Path] = None) -> "CospecConfig":
-        """Load configuration from file or use defaults."""
+        """Load the layered configuration (defaults, user, project, env).
+
+        The validated result is cached per process and reused until one of the
+        source files or COSPEC_* environment variables changes.
+        """
         if config_path is None:
-            config_path = Path(".cospec/config.json")
+            config_path = PROJECT_CONFIG_PATH
+
+        sources = [user_config_path(), config_path]
+        cache_key = (
+            tuple((os.path.abspath(path), _file_signature(path)) for path in [*sources, Path(".env")]),
+            _env_signature(),
+        )
+
+        with _config_cache_lock:
+            cached = _config_cache.get(cache_key)
+            if cached is None:
+                cached = _build_layered_config(sources)
+                _config_cache.clear()
+                _config_cache[cache_key] = cached
+
+        # Callers mutate the config (e.g. `agent add`), so hand out copies of the cached snapshot
+        return cached.model_copy(deep=True)
+
+
+_config_cache: Dict[Tuple[Any, ...], CospecConfig] = {}
+# Set while building a config from values that already include the environment layers
+_init_values_only: contextvars.ContextVar[bool] = contextvars.ContextVar("cospec_init_values_only", default=False)
+_config_cache_lock = threading.Lock()
+
+
+def user_config_path() -> Path:
+    """Return the per-user config file (``$XDG_CONFIG_HOME/cospec/config.json``)."""
+    config_home = os.environ.get("XDG_CONFIG_HOME")
+    base = Path(config_home) if config_home else Path.home() / ".config"
+    return base / "cospec" / "config.json"
+
+
+def clear_config_cache() -> None:
+    """Drop the cached config snapshot so the next load re-reads every layer."""
+    with _config_cache_lock:
+        _config_cache.clear()
+
+
+def _file_signature(path: Path) -> Optional[Tuple[int, int]]:
+    try:
+        stat = path.stat()
+    except OSError:
+        return None
+    return (stat.st_mtime_ns, stat.st_size)
+
+
+def _env_signature() -> Tuple[Tuple[str, str], ...]:
+    prefix = CospecConfig.model_config.get("env_prefix", "").lower()
+    return tuple(sorted((k, v) for k, v in os.environ.items() if k.lower().startswith(prefix)))
+
+
+def _merge_layer(merged: Dict[str, Any], layer: Dict[str, Any]) -> None:
+    """Merge a config layer into ``merged``; tools are merged by name, other keys are replaced."""
+    for key, value in layer.items():
+        if key == "tools" and isinstance(value, dict) and isinstance(merged.get("tools"), dict):
+            merged["tools"] = {**merged["tools"], **value}
+        else:
+            merged[key] = value
+
+
+def _read_layer(path: Path) -> Dict[str, Any]:
+    if not path.exists():
+        return {}
+    with open(path, "r", encoding="utf-8") as f:
+        data: Dict[str, Any] = json.load(f)
+    return data
+
+
+def _validate_values(values: Dict[str, Any]) -> CospecConfig:
+    """Build a config from already merged values, without reading .env or COSPEC_* again."""
+    token = _init_values_only.set(True)
+    try:
+        return CospecConfig(**values)
+    finally:
+        _init_values_only.reset(token)
+
+
+def _default_values() -> Dict[str, Any]:
+    return _validate_values({}).model_dump(mode="json")
+
+
+def _build_layered_config(sources: List[Path]) -> CospecConfig:
+    merged: Dict[str, Any] = {}
 
-        config_dict = {}
+    for path in sources:
+        _merge_layer(merged, _read_layer(path))
 
-        if config_path.exists():
-            with open(config_path, "r", encoding="utf-8") as f:
-                config_dict = json.load(f)
+    # Environment (.env first, then real env vars) takes precedence over the files
+    _merge_layer(merged, DotEnvSettingsSource(CospecConfig)())
+    _merge_layer(merged, EnvSettingsSource(CospecConfig)())
 
-        return CospecConfig(**config_dict)
+    config = _validate_values(merged)
+    config._loaded = config.model_dump(mode="json")
+    config._tools_from_defaults = "tools" not in merged
+    return config
@@ -0,0 +1,362 @@
+"""LLM connector implementations (in-process alternatives to CLI subprocess tools)."""
+
+import os
+import re
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+from cospec.core.config import CospecConfig, ToolConfig
+from cospec.core.exceptions import InvalidToolError, ToolExecutionError
+from cospec.core.interfaces import LLMInterface
+
+DEFAULT_API_KEY_ENV = "OPENAI_API_KEY"
+
+# Prompts longer than this are passed to CLI tools via a temp file instead of argv
+MAX_INLINE_PROMPT_LENGTH = 8000
+
+_ANSWER_MARKER = re.compile(r"^\s*<<<ANSWER (\d+)>>>\s*$", re.MULTILINE)
+
+# Shared HTTP clients keyed by (base_url, api_key, timeout).
+# Each client owns a connection pool, so keep-alive connections are reused across connectors and agents.
+_clients: Dict[Tuple[Optional[str], str, float], Any] = {}
+_clients_lock = threading.Lock()
+
+
+def get_http_client(base_url: Optional[str], api_key: str, timeout: float) -> Any:
+    """Return the shared OpenAI client for an endpoint, creating it on first use."""
+    key = (base_url, api_key, timeout)
+    client = _clients.get(key)
+    if client is not None:
+        return client
+
+    with _clients_lock:
+        client = _clients.get(key)
+        if client is None:
+            # openai is heavy to import; only pay for it when an HTTP tool is actually used
+            from openai import OpenAI
+
+            client = OpenAI(base_url=base_url, api_key=api_key, timeout=timeout)
+            _clients[key] = client
+        return client
+
+
+def close_http_clients() -> None:
+    """Close all shared HTTP clients (primarily for testing)."""
+    with _clients_lock:
+        for client in _clients.values():
+            client.close()
+        _clients.clear()
+
+
+def build_cli_command(tool_config: ToolConfig, full_prompt: str, cache_dir: Path) -> Tuple[List[str], Optional[str]]:
+    """Build the argv for a CLI tool, writing the prompt to a temp file when required.
+
+    Returns:
+        The command arguments and the temp file path (if one was written); the caller removes the file.
+    """
+    cmd_args = [tool_config.command]
+    temp_file = None
+
+    has_file_placeholder = any("{file}" in arg for arg in tool_config.args)
+    has_prompt_placeholder = any("{prompt}" in arg for arg in tool_config.args)
+
+    if has_file_placeholder and "{prompt}" in str(tool_config.args):
+        with tempfile.NamedTemporaryFile(mode="w", delete=False, encoding="utf-8", suffix=".txt", dir=cache_dir) as f:
+            f.write(full_prompt)
+            temp_file = f.name
+
+        for arg in tool_config.args:
+            if "{file}" in arg:
+                cmd_args.append(arg.replace("{file}", temp_file))
+            elif "{prompt}" in arg:
+                pass
+            else:
+                cmd_args.append(arg)
+
+    elif has_prompt_placeholder:
+        if len(full_prompt) > MAX_INLINE_PROMPT_LENGTH:
+            with tempfile.NamedTemporaryFile(
+                mode="w", delete=False, encoding="utf-8", suffix=".txt", dir=cache_dir
+            ) as f:
+                f.write(full_prompt)
+                temp_file = f.name
+
+            cmd_args.append(f"@{temp_file}")
+        else:
+            for arg in tool_config.args:
+                if "{prompt}" in arg:
+                    cmd_args.append(arg.replace("{prompt}", full_prompt))
+                else:
+                    cmd_args.append(arg)
+    else:
+        for arg in tool_config.args:
+            cmd_args.append(arg)
+
+    return cmd_args, temp_file
+
+
+def pack_prompts(prompts: List[str]) -> str:
+    """Combine several independent prompts into one prompt with delimited sub-answers."""
+    parts = [
+        f"You will receive {len(prompts)} independent tasks. Answer every task separately.\n"
+        "Start each answer with a line containing only `<<<ANSWER n>>>`, where n is the task number, "
+        "and do not write anything outside the answers.\n"
+    ]
+    for index, prompt in enumerate(prompts, 1):
+        parts.append(f"<<<TASK {index}>>>\n{prompt}\n")
+    return "\n".join(parts)
+
+
+def unpack_answers(response: str, count: int) -> List[Optional[str]]:
+    """Split a packed response into per-task answers; tasks without an answer map to None."""
+    answers: List[Optional[str]] = [None] * count
+    markers = list(_ANSWER_MARKER.finditer(response))
+    for i, marker in enumerate(markers):
+        index = int(marker.group(1)) - 1
+        end = markers[i + 1].start() if i + 1 < len(markers) else len(response)
+        if 0 <= index < count and answers[index] is None:
+            answers[index] = response[marker.end() : end].strip()
+    return answers
+
+
+def _collecting_errors(query: Callable[[str], str], errors: List[ToolExecutionError]) -> Callable[[str], Optional[str]]:
+    """Wrap a query so that a failure yields None and is appended to ``errors`` instead of propagating."""
+
+    def _query(prompt: str) -> Optional[str]:
+        try:
+            return query(prompt)
+        except ToolExecutionError as e:
+            errors.append(e)
+            return None
+
+    return _query
+
+
+def _raise_if_all_failed(results: List[Optional[str]], errors: List[ToolExecutionError]) -> List[Optional[str]]:
+    """Return the batch results, re-raising the first error if no prompt succeeded."""
+    if errors and all(result is None for result in results):
+        raise errors[0]
+    return results
+
+
+@dataclass
+class StreamStats:
+    """Timing statistics for a streamed response."""
+
+    first_token_latency: Optional[float] = None
+    duration: float = 0.0
+    tokens: int = 0
+
+    @property
+    def tokens_per_sec(self) -> float:
+        """Generation throughput measured from the first token to the end of the stream."""
+        if self.first_token_latency is None:
+            return 0.0
+        generation_time = self.duration - self.first_token_latency
+        if generation_time <= 0:
+            return float(self.tokens)
+        return self.tokens / generation_time
+
+
+class TokenStream:
+    """Iterator over response chunks that records first-token latency and throughput.
+
+    Each non-empty chunk is counted as one token, which matches how
+    OpenAI-compatible servers emit SSE deltas.
+    """
+
+    def __init__(self, chunks: Iterator[str]):
+        self._chunks = chunks
+        self._started = time.perf_counter()
+        self.stats = StreamStats()
+
+    def __iter__(self) -> "TokenStream":
+        return self
+
+    def __next__(self) -> str:
+        try:
+            chunk = next(self._chunks)
+        except StopIteration:
+            self.stats.duration = time.perf_counter() - self._started
+            raise
+
+        if chunk:
+            if self.stats.first_token_latency is None:
+                self.stats.first_token_latency = time.perf_counter() - self._started
+            self.stats.tokens += 1
+        return chunk
+
+
+class CLIConnector(LLMInterface):
+    """Connector that runs a configured CLI tool as a subprocess."""
+
+    def __init__(self, tool_name: str, tool_config: ToolConfig, cache_dir: Optional[Path] = None):
+        self.tool_name = tool_name
+        self.tool_config = tool_config
+        self.cache_dir = cache_dir or Path.cwd() / ".cospec" / "cache"
+
+    def query(self, prompt: str, context: Optional[Dict[str, Any]] = None) -> str:
+        """Run the tool once with the prompt and return its stdout."""
+        from cospec.core.adapters import SubprocessManager
+
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        cmd_args, temp_file = build_cli_command(self.tool_config, prompt, self.cache_dir)
+        try:
+            return str(SubprocessManager().run(cmd_args).stdout)
+        finally:
+            if temp_file:
+                Path(temp_file).unlink(missing_ok=True)
+
+    def batch_query(self, prompts: List[str], context: Optional[Dict[str, Any]] = None) -> List[Optional[str]]:
+        """Pack prompts into as few tool invocations as possible (``batch_size`` per call).
+
+        Chunks run concurrently on up to ``max_concurrency`` processes, and sub-answers the tool failed
+        to delimit are re-queried individually on the same pool. Prompts whose invocation failed get
+        ``None``; the first error is raised only when every prompt failed.
+        """
+        batch_size = max(1, self.tool_config.batch_size)
+        chunks = [prompts[start : start + batch_size] for start in range(0, len(prompts), batch_size)]
+        errors: List[ToolExecutionError] = []
+        query = _collecting_errors(lambda prompt: self.query(prompt, context), errors)
+
+        def _query_chunk(chunk: List[str]) -> Tuple[List[Optional[str]], bool]:
+            if len(chunk) == 1:
+                answer = query(chunk[0])
+                return [answer], answer is None
+            response = query(pack_prompts(chunk))
+            if response is None:
+                return [None] * len(chunk), True
+            return unpack_answers(response, len(chunk)), False
+
+        results: List[Optional[str]] = []
+        retries: List[int] = []
+        workers = max(1, min(self.tool_config.max_concurrency, len(chunks)))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            for answers, failed in executor.map(_query_chunk, chunks):
+                if not failed:
+                    retries.extend(len(results) + i for i, answer in enumerate(answers) if answer is None)
+                results.extend(answers)
+            for index, answer in zip(retries, executor.map(query, [prompts[i] for i in retries]), strict=True):
+                results[index] = answer
+
+        return _raise_if_all_failed(results, errors)
+
+    def validate_response(self, response: str) -> bool:
+        """A response is valid when it contains any non-whitespace text."""
+        return bool(response.strip())
+
+
+class OpenAICompatibleConnector(LLMInterface):
+    """Connector for OpenAI-compatible chat completion endpoints.
+
+    The endpoint is taken from ``ToolConfig.base_url`` so that local servers
+    (vLLM, Ollama, LM Studio, test stubs) work the same way as the hosted API.
+    """
+
+    def __init__(self, tool_name: str, tool_config: ToolConfig):
+        if not tool_config.model:
+            raise InvalidToolError(f"Tool '{tool_name}' is configured as 'http' but has no 'model'.")
+
+        self.tool_name = tool_name
+        self.tool_config = tool_config
+        self.model = tool_config.model
+        # Prompt tokens reported by the endpoint for the last query (None if it sends no usage)
+        self.last_prompt_tokens: Optional[int] = None
+
+        api_key_env = tool_config.api_key_env or DEFAULT_API_KEY_ENV
+        # Local endpoints usually ignore the key, but the client requires a non-empty value
+        self._api_key = os.environ.get(api_key_env) or "not-needed"
+
+    @property
+    def client(self) -> Any:
+        """Shared, pooled HTTP client for this connector's endpoint."""
+        return get_http_client(self.tool_config.base_url, self._api_key, self.tool_config.timeout)
+
+    def _build_messages(self, prompt: str, context: Optional[Dict[str, Any]]) -> List[Dict[str, str]]:
+        messages = []
+        if context and context.get("system"):
+            messages.append({"role": "system", "content": str(context["system"])})
+        messages.append({"role": "user", "content": prompt})
+        return messages
+
+    def query(self, prompt: str, context: Optional[Dict[str, Any]] = None) -> str:
+        """Send the prompt as a single chat completion request."""
+        from openai import OpenAIError
+
+        try:
+            response = self.client.chat.completions.create(
+                model=self.model, messages=self._build_messages(prompt, context)
+            )
+        except OpenAIError as e:
+            raise ToolExecutionError(f"HTTP request to {self.tool_config.base_url} failed: {e}", e) from e
+
+        self.last_prompt_tokens = getattr(getattr(response, "usage", None), "prompt_tokens", None)
+        if not response.choices:
+            return ""
+        return response.choices[0].message.content or ""
+
+    def stream(self, prompt: str, context: Optional[Dict[str, Any]] = None) -> Iterator[str]:
+        """Stream the chat completion as server-sent events, yielding content deltas as they arrive."""
+        from openai import OpenAIError
+
+        try:
+            response = self.client.chat.completions.create(
+                model=self.model, messages=self._build_messages(prompt, context), stream=True
+            )
+            with response:
+                for chunk in response:
+                    if chunk.choices and chunk.choices[0].delta.content:
+                        yield chunk.choices[0].delta.content
+        except OpenAIError as e:
+            raise ToolExecutionError(f"HTTP request to {self.tool_config.base_url} failed: {e}", e) from e
+
+    def batch_query(self, prompts: List[str], context: Optional[Dict[str, Any]] = None) -> List[Optional[str]]:
+        """Send the prompts as concurrent requests over the shared connection pool.
+
+        Failed requests yield ``None``; the first error is raised only when every request failed.
+        """
+        if len(prompts) <= 1:
+            return [self.query(prompt, context) for prompt in prompts]
+
+        errors: List[ToolExecutionError] = []
+        query = _collecting_errors(lambda prompt: self.query(prompt, context), errors)
+        workers = max(1, min(self.tool_config.max_concurrency, len(prompts)))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            results = list(executor.map(query, prompts))
+        return _raise_if_all_failed(results, errors)
+
+    def validate_response(self, response: str) -> bool:
+        """A response is valid when it contains any non-whitespace text."""
+        return bool(response.strip())
+
+
+def create_connector(tool_name: str, config: CospecConfig) -> LLMInterface:
+    """Create the connector for a configured tool based on its ``type``.
+
+    Types other than ``cli`` and ``http`` are served by ``cospec.connectors`` plugins,
+    which are imported only here, when a tool of that type is used.
+    """
+    tool_config = config.resolve_tool(tool_name)
+    if tool_config is None:
+        raise InvalidToolError(f"Tool '{tool_name}' not configured.")
+
+    if tool_config.type == "cli":
+        return CLIConnector(tool_name, tool_config)
+    if tool_config.type == "http":
+        return OpenAICompatibleConnector(tool_name, tool_config)
+
+    from cospec.core.plugins import load_connector_factory
+
+    factory = load_connector_factory(tool_config.type)
+    if factory is not None:
+        connector = factory(tool_name, tool_config)
+        if not isinstance(connector, LLMInterface):
+            raise InvalidToolError(f"Connector plugin '{tool_config.type}' did not return an LLMInterface.")
+        return connector
+
+    raise InvalidToolError(f"Tool '{tool_name}' has no connector for type '{tool_config.type}'.")
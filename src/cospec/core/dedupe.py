@@ -0,0 +1,169 @@
+"""Near-duplicate text detection using character shingles, MinHash signatures and LSH banding.
+
+Signatures are computed with NumPy when it is installed (``pip install cospec[fast]``)
+and with an equivalent pure-Python loop otherwise; both produce identical signatures.
+"""
+
+import random
+import re
+import unicodedata
+import zlib
+from typing import Any, Dict, FrozenSet, Generic, Hashable, Iterable, List, Optional, Sequence, Tuple, TypeVar
+
+# Mersenne prime 2^31 - 1: a * x + b stays below 2^63 for 32-bit shingle hashes, so uint64 never overflows
+_PRIME = (1 << 31) - 1
+_SEED = 1
+# Documents hashed per vectorized block (bounds the num_perm x shingles working matrix)
+_NUMPY_BLOCK = 2048
+
+# LSH banding targets this fraction of the similarity threshold
+_RECALL_FACTOR = 0.6
+
+_NON_WORD = re.compile(r"[\W_]+")
+
+# Key type of the texts added to a NearDuplicateIndex
+K = TypeVar("K", bound=Hashable)
+
+_numpy: Any = None
+
+
+def _load_numpy() -> Any:
+    """Return the numpy module, or False when it is not installed (checked once)."""
+    global _numpy
+    if _numpy is None:
+        try:
+            import numpy
+
+            _numpy = numpy
+        except ImportError:
+            _numpy = False
+    return _numpy
+
+
+def shingles(text: str, size: int = 3) -> FrozenSet[int]:
+    """Return the hashed character shingles of a normalized text.
+
+    Punctuation and whitespace are dropped, and character (not word) shingles are used
+    because Japanese text has no word separators.
+    """
+    normalized = _NON_WORD.sub("", unicodedata.normalize("NFKC", text).lower())
+    if len(normalized) <= size:
+        return frozenset([zlib.crc32(normalized.encode("utf-8"))])
+    return frozenset(zlib.crc32(normalized[i : i + size].encode("utf-8")) for i in range(len(normalized) - size + 1))
+
+
+def jaccard(a: FrozenSet[int], b: FrozenSet[int]) -> float:
+    """Exact Jaccard similarity of two shingle sets."""
+    if not a and not b:
+        return 1.0
+    return len(a & b) / len(a | b)
+
+
+def _choose_bands(num_perm: int, threshold: float) -> Tuple[int, int]:
+    """Pick (bands, rows) whose LSH similarity threshold (1/b)^(1/r) is closest to the target.
+
+    The target is set well below the confirmation threshold: candidates are verified
+    exactly anyway, so recall matters more than the number of candidates.
+    """
+    threshold *= _RECALL_FACTOR
+    candidates = [(b, num_perm // b) for b in range(1, num_perm + 1) if num_perm % b == 0]
+    return min(candidates, key=lambda br: abs((1 / br[0]) ** (1 / br[1]) - threshold))
+
+
+class MinHasher:
+    """Computes MinHash signatures with ``num_perm`` universal hash functions."""
+
+    def __init__(self, num_perm: int = 64):
+        rng = random.Random(_SEED)
+        self.num_perm = num_perm
+        self.a = [rng.randrange(1, _PRIME) for _ in range(num_perm)]
+        self.b = [rng.randrange(0, _PRIME) for _ in range(num_perm)]
+
+    def signature(self, shingle_set: FrozenSet[int]) -> Tuple[int, ...]:
+        """Signature of a single shingle set."""
+        return self.signatures([shingle_set])[0]
+
+    def signatures(self, shingle_sets: Sequence[FrozenSet[int]]) -> List[Tuple[int, ...]]:
+        """Signatures of many shingle sets, vectorized when NumPy is available."""
+        np = _load_numpy()
+        if np:
+            return self._signatures_numpy(np, shingle_sets)
+
+        coefficients = list(zip(self.a, self.b, strict=True))
+        result = []
+        for shingle_set in shingle_sets:
+            values = [x % _PRIME for x in shingle_set]
+            result.append(tuple(min([(a * x + b) % _PRIME for x in values]) for a, b in coefficients))
+        return result
+
+    def _signatures_numpy(self, np: Any, shingle_sets: Sequence[FrozenSet[int]]) -> List[Tuple[int, ...]]:
+        a = np.array(self.a, dtype=np.uint64)[:, None]
+        b = np.array(self.b, dtype=np.uint64)[:, None]
+        result: List[Tuple[int, ...]] = []
+
+        for start in range(0, len(shingle_sets), _NUMPY_BLOCK):
+            block = shingle_sets[start : start + _NUMPY_BLOCK]
+            lengths = np.fromiter((len(s) for s in block), dtype=np.int64, count=len(block))
+            values = np.fromiter((x for s in block for x in s), dtype=np.uint64, count=int(lengths.sum()))
+            offsets = np.concatenate(([0], np.cumsum(lengths)[:-1]))
+
+            hashed = (a * (values % _PRIME) + b) % _PRIME
+            # One min per (permutation, document): reduce each document's column range at once
+            minima = np.minimum.reduceat(hashed, offsets, axis=1)
+            result.extend(map(tuple, minima.T.tolist()))
+
+        return result
+
+
+class NearDuplicateIndex(Generic[K]):
+    """Incremental LSH index that maps each added text to the first near-identical text seen.
+
+    Candidates found through LSH buckets are confirmed with the exact Jaccard
+    similarity of their shingle sets, so no false positives are reported.
+    """
+
+    def __init__(self, threshold: float = 0.8, num_perm: int = 64, shingle_size: int = 3):
+        self.threshold = threshold
+        self.shingle_size = shingle_size
+        self.hasher = MinHasher(num_perm)
+        self.bands, self.rows = _choose_bands(num_perm, threshold)
+        self._buckets: List[Dict[Tuple[int, ...], List[int]]] = [{} for _ in range(self.bands)]
+        self._keys: List[K] = []
+        self._shingles: List[FrozenSet[int]] = []
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def add(self, key: K, text: str) -> Optional[K]:
+        """Add a text; return the key of its representative if it is a near duplicate, else None."""
+        return self.add_many([(key, text)])[0]
+
+    def add_many(self, items: Iterable[Tuple[K, str]]) -> List[Optional[K]]:
+        """Add several texts in order, computing their signatures in one batch."""
+        items = list(items)
+        shingle_sets = [shingles(text, self.shingle_size) for _key, text in items]
+        signatures = self.hasher.signatures(shingle_sets)
+        return [
+            self._insert(key, shingle_set, signature)
+            for (key, _text), shingle_set, signature in zip(items, shingle_sets, signatures, strict=True)
+        ]
+
+    def _insert(self, key: K, shingle_set: FrozenSet[int], signature: Tuple[int, ...]) -> Optional[K]:
+        band_keys = [signature[i * self.rows : (i + 1) * self.rows] for i in range(self.bands)]
+
+        checked = set()
+        for buckets, band_key in zip(self._buckets, band_keys, strict=True):
+            for candidate in buckets.get(band_key, ()):
+                if candidate in checked:
+                    continue
+                checked.add(candidate)
+                if jaccard(shingle_set, self._shingles[candidate]) >= self.threshold:
+                    return self._keys[candidate]
+
+        # Only representatives are indexed, so every match points at the first member of its cluster
+        index = len(self._keys)
+        self._keys.append(key)
+        self._shingles.append(shingle_set)
+        for buckets, band_key in zip(self._buckets, band_keys, strict=True):
+            buckets.setdefault(band_key, []).append(index)
+        return None
@@ -39,3 +39,9 @@ class InvalidToolError(CospecError):
     """Raised when AI-Agent tool is not configured or invalid."""
 
     pass
+
+
+class PromptTooLargeError(CospecError):
+    """Raised when a prompt would need more shards than allowed to fit a tool's limit."""
+
+    pass
@@ -0,0 +1,55 @@
+"""Filesystem helpers shared across cospec components."""
+
+import os
+import stat
+import tempfile
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Iterator, TextIO
+
+
+def _current_umask() -> int:
+    # The umask can only be read by setting it, so restore it immediately
+    umask = os.umask(0)
+    os.umask(umask)
+    return umask
+
+
+# Read once at import: swapping the umask later would race with other threads creating files
+_UMASK = _current_umask()
+
+
+def _target_mode(path: Path) -> int:
+    """Permission bits for the replacement: the existing file's, or the umask default for a new file."""
+    try:
+        return stat.S_IMODE(path.stat().st_mode)
+    except FileNotFoundError:
+        return 0o666 & ~_UMASK
+
+
+@contextmanager
+def atomic_writer(path: Path, encoding: str = "utf-8") -> Iterator[TextIO]:
+    """Open a temp file next to ``path`` that replaces it only when the block succeeds.
+
+    Readers (and concurrent writers) never observe a partially written file, and a
+    failure inside the block leaves the previous content (or no file) in place. The
+    replacement keeps the existing file's permissions rather than mkstemp's 0600.
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, temp_path = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w", encoding=encoding) as f:
+            yield f
+            f.flush()
+            os.fchmod(f.fileno(), _target_mode(path))
+            os.fsync(f.fileno())
+        os.replace(temp_path, path)
+    except BaseException:
+        Path(temp_path).unlink(missing_ok=True)
+        raise
+
+
+def atomic_write_text(path: Path, content: str, encoding: str = "utf-8") -> None:
+    """Write text to a file atomically (see ``atomic_writer``)."""
+    with atomic_writer(path, encoding=encoding) as f:
+        f.write(content)
@@ -3,7 +3,7 @@
 import subprocess
 from abc import ABC, abstractmethod
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, Iterator, List, Optional
 
 
 class CLIInterface(ABC):
@@ -162,6 +162,36 @@ class LLMInterface(ABC):
         """
         pass
 
+    def stream(self, prompt: str, context: Optional[Dict[str, Any]] = None) -> Iterator[str]:
+        """Execute a query and yield the response incrementally.
+
+        Connectors without native streaming yield the full ``query`` result as a single chunk.
+
+        Args:
+            prompt: The prompt to send to the LLM
+            context: Optional context information
+
+        Returns:
+            Iterator over response text chunks
+        """
+        yield self.query(prompt, context)
+
+    def batch_query(self, prompts: List[str], context: Optional[Dict[str, Any]] = None) -> List[Optional[str]]:
+        """Execute several independent prompts, returning the responses in order.
+
+        Connectors override this to pack prompts into fewer invocations or run them concurrently.
+        Overrides may return ``None`` for individual prompts that failed, so that one failure does not
+        discard the other answers.
+
+        Args:
+            prompts: The prompts to send to the LLM
+            context: Optional context information shared by all prompts
+
+        Returns:
+            LLM responses in the same order as ``prompts`` (``None`` where a prompt failed)
+        """
+        return [self.query(prompt, context) for prompt in prompts]
+
     @abstractmethod
     def validate_response(self, response: str) -> bool:
         """Validate LLM response format.
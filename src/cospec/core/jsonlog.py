@@ -0,0 +1,166 @@
+"""JSON-lines logger with a queue-backed background writer.
+
+Each record is serialised to one JSON line on the calling thread and put on a queue;
+a daemon thread drains the queue and writes the lines in batches. Logging from
+concurrent or batch runs therefore never waits on terminal rendering or file I/O.
+Records carry the bound context (e.g. ``tool``) plus any per-call fields such as
+``phase`` and ``duration``.
+"""
+
+import atexit
+import datetime
+import json
+import queue
+import sys
+import threading
+from pathlib import Path
+from typing import Any, Dict, List, Optional, TextIO, Union
+
+from cospec.core.exceptions import ConfigurationError
+from cospec.core.interfaces import LoggerInterface
+
+LEVELS = {"debug": 10, "info": 20, "warning": 30, "error": 40, "critical": 50}
+
+# Items on the writer queue: a JSON line, a flush marker, or None to stop
+_Item = Union[str, threading.Event, None]
+
+
+def level_number(level: str) -> int:
+    """Numeric severity of a level name.
+
+    Raises:
+        ConfigurationError: If the level is unknown.
+    """
+    try:
+        return LEVELS[level.lower()]
+    except KeyError:
+        raise ConfigurationError(f"Unknown log level '{level}'. Choose from: {', '.join(LEVELS)}") from None
+
+
+class JsonLineWriter:
+    """Writes lines to a file (appending) or to stderr from a background thread."""
+
+    def __init__(self, path: Optional[Path] = None):
+        self.path = path
+        self._queue: "queue.SimpleQueue[_Item]" = queue.SimpleQueue()
+        self._closed = False
+        self._thread = threading.Thread(target=self._drain, name="cospec-jsonlog", daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+
+    def write(self, line: str) -> None:
+        """Queue a line (never blocks on I/O)."""
+        if not self._closed:
+            self._queue.put(line)
+
+    def flush(self, timeout: float = 5.0) -> None:
+        """Wait until every line queued so far has been written."""
+        if self._closed:
+            return
+        written = threading.Event()
+        self._queue.put(written)
+        written.wait(timeout)
+
+    def close(self, timeout: float = 5.0) -> None:
+        """Write the remaining lines and stop the writer thread."""
+        if self._closed:
+            return
+        self._closed = True
+        self._queue.put(None)
+        self._thread.join(timeout)
+
+    def _open(self) -> TextIO:
+        if self.path is None:
+            return sys.stderr
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        return self.path.open("a", encoding="utf-8")
+
+    def _drain(self) -> None:
+        stream = self._open()
+        try:
+            running = True
+            while running:
+                batch: List[str] = []
+                markers: List[threading.Event] = []
+                item = self._queue.get()
+                # Take everything that is already queued so one write covers the whole burst
+                while True:
+                    if item is None:
+                        running = False
+                    elif isinstance(item, threading.Event):
+                        markers.append(item)
+                    else:
+                        batch.append(item)
+                    try:
+                        item = self._queue.get_nowait()
+                    except queue.Empty:
+                        break
+                if batch:
+                    try:
+                        stream.write("\n".join(batch) + "\n")
+                        stream.flush()
+                    except (OSError, ValueError):
+                        # A closed or full log destination must not break the command
+                        pass
+                for marker in markers:
+                    marker.set()
+        finally:
+            if stream is not sys.stderr:
+                stream.close()
+
+
+class JsonLogger(LoggerInterface):
+    """Logger that emits one JSON object per record.
+
+    Records below ``level`` are dropped before they are serialised. ``extra=`` and any
+    other keyword arguments become fields of the record.
+    """
+
+    def __init__(
+        self,
+        writer: Optional[JsonLineWriter] = None,
+        level: str = "debug",
+        context: Optional[Dict[str, Any]] = None,
+    ):
+        # Validated first so that an unknown level does not leave a writer thread behind
+        self._threshold = level_number(level)
+        self.writer = writer or JsonLineWriter()
+        self.level = level
+        self.context: Dict[str, Any] = dict(context or {})
+
+    def bind(self, **context: Any) -> "JsonLogger":
+        """Return a logger sharing this writer whose records also carry ``context``."""
+        return JsonLogger(self.writer, self.level, {**self.context, **context})
+
+    def _log(self, level: str, message: str, extra: Optional[Dict[str, Any]] = None, **fields: Any) -> None:
+        if LEVELS[level] < self._threshold:
+            return
+        record = {
+            "ts": datetime.datetime.now(datetime.timezone.utc).isoformat(timespec="milliseconds"),
+            "level": level,
+            "message": message,
+            **self.context,
+            **(extra or {}),
+            **fields,
+        }
+        self.writer.write(json.dumps(record, ensure_ascii=False, default=str))
+
+    def debug(self, message: str, **kwargs: Any) -> None:
+        """Log debug message."""
+        self._log("debug", message, **kwargs)
+
+    def info(self, message: str, **kwargs: Any) -> None:
+        """Log info message."""
+        self._log("info", message, **kwargs)
+
+    def warning(self, message: str, **kwargs: Any) -> None:
+        """Log warning message."""
+        self._log("warning", message, **kwargs)
+
+    def error(self, message: str, **kwargs: Any) -> None:
+        """Log error message."""
+        self._log("error", message, **kwargs)
+
+    def critical(self, message: str, **kwargs: Any) -> None:
+        """Log critical message."""
+        self._log("critical", message, **kwargs)
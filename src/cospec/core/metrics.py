@@ -0,0 +1,313 @@
+"""Local metrics store for tool invocations (``.cospec/metrics.db``).
+
+Every tool run is appended to a SQLite table. Records are buffered in memory and
+written in one transaction per batch by a background thread (once ``BATCH_SIZE``
+records are pending or ``FLUSH_INTERVAL`` seconds have passed) and at interpreter
+exit, so recording adds no I/O to the calling thread. ``cospec stats`` and the review
+tool selection read the table back.
+"""
+
+import atexit
+import datetime
+import sqlite3
+import statistics
+import threading
+import warnings
+from dataclasses import astuple, dataclass, fields
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence
+
+METRICS_PATH = Path(".cospec") / "metrics.db"
+
+BATCH_SIZE = 50
+FLUSH_INTERVAL = 5.0
+# Records kept for retry while the database cannot be written; the oldest are dropped beyond this
+MAX_PENDING = 20 * BATCH_SIZE
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS invocations (
+    ts REAL NOT NULL,
+    tool TEXT NOT NULL,
+    command TEXT NOT NULL,
+    prompt_bytes INTEGER NOT NULL,
+    estimated_tokens INTEGER NOT NULL,
+    wall_time REAL NOT NULL,
+    exit_code INTEGER,
+    cache_hit INTEGER NOT NULL,
+    output_bytes INTEGER NOT NULL,
+    predicted_time REAL,
+    actual_tokens INTEGER
+);
+CREATE INDEX IF NOT EXISTS invocations_tool_ts ON invocations (tool, ts);
+"""
+
+
+@dataclass(frozen=True)
+class Invocation:
+    """A single tool invocation (field order matches the table columns)."""
+
+    ts: float
+    tool: str
+    command: str
+    prompt_bytes: int
+    estimated_tokens: int
+    wall_time: float
+    exit_code: Optional[int]
+    cache_hit: bool
+    output_bytes: int
+    # Preflight latency prediction and the prompt tokens reported by the endpoint (if any)
+    predicted_time: Optional[float] = None
+    actual_tokens: Optional[int] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.exit_code == 0
+
+
+# Columns added after the first release; older databases are migrated on connect
+_ADDED_COLUMNS = {"predicted_time": "REAL", "actual_tokens": "INTEGER"}
+
+_COLUMNS = ", ".join(f.name for f in fields(Invocation))
+_PLACEHOLDERS = ", ".join("?" for _ in fields(Invocation))
+
+
+def _connect(path: Path) -> sqlite3.Connection:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    # The store's connection is shared by the recording threads and the background flusher
+    connection = sqlite3.connect(path, timeout=10, check_same_thread=False)
+    # WAL lets `cospec stats` read while another command is writing
+    connection.execute("PRAGMA journal_mode=WAL")
+    connection.executescript(_SCHEMA)
+    existing = {row[1] for row in connection.execute("PRAGMA table_info(invocations)")}
+    for column, column_type in _ADDED_COLUMNS.items():
+        if column not in existing:
+            connection.execute(f"ALTER TABLE invocations ADD COLUMN {column} {column_type}")
+    return connection
+
+
+class MetricsStore:
+    """Buffered writer for the invocations table.
+
+    The store keeps one connection (opened, and the schema applied, on first use) and
+    writes batches from a background thread that exits once the buffer is empty.
+    """
+
+    def __init__(self, path: Optional[Path] = None):
+        self.path = path or Path.cwd() / METRICS_PATH
+        self._pending: List[Invocation] = []
+        # _lock guards the buffer and the flusher thread; _db_lock serialises use of the connection
+        self._lock = threading.Lock()
+        self._db_lock = threading.Lock()
+        self._connection: Optional[sqlite3.Connection] = None
+        self._due = threading.Event()
+        self._flusher: Optional[threading.Thread] = None
+
+    def record(self, invocation: Invocation) -> None:
+        """Buffer an invocation; the background thread writes it once the batch is full or old enough."""
+        with self._lock:
+            self._pending.append(invocation)
+            if self._flusher is None:
+                self._flusher = threading.Thread(target=self._flush_loop, name="cospec-metrics", daemon=True)
+                self._flusher.start()
+            if len(self._pending) >= BATCH_SIZE:
+                self._due.set()
+
+    def _flush_loop(self) -> None:
+        while True:
+            self._due.wait(FLUSH_INTERVAL)
+            self._due.clear()
+            try:
+                self.flush()
+            except (OSError, sqlite3.Error):
+                # The batch stays buffered and is retried on the next pass
+                pass
+            with self._lock:
+                if not self._pending:
+                    self._flusher = None
+                    return
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._connection is None:
+            self._connection = _connect(self.path)
+        return self._connection
+
+    def flush(self) -> None:
+        """Write all buffered invocations in one transaction.
+
+        If the write fails, the batch is put back into the buffer (up to ``MAX_PENDING``
+        records) for the next attempt and the error is raised.
+        """
+        with self._db_lock:
+            with self._lock:
+                batch, self._pending = self._pending, []
+            if not batch:
+                return
+            try:
+                connection = self._connect()
+                with connection:
+                    connection.executemany(
+                        f"INSERT INTO invocations ({_COLUMNS}) VALUES ({_PLACEHOLDERS})",
+                        [astuple(invocation) for invocation in batch],
+                    )
+            except (OSError, sqlite3.Error):
+                # Reconnect on the next attempt in case the connection itself is broken
+                self._close_connection()
+                with self._lock:
+                    self._pending = (batch + self._pending)[-MAX_PENDING:]
+                raise
+
+    def _close_connection(self) -> None:
+        if self._connection is not None:
+            self._connection.close()
+            self._connection = None
+
+    def close(self) -> None:
+        """Write the buffered invocations and close the connection."""
+        try:
+            self.flush()
+        finally:
+            with self._db_lock:
+                self._close_connection()
+
+    def load(
+        self, since: Optional[float] = None, tool: Optional[str] = None, limit: Optional[int] = None
+    ) -> List[Invocation]:
+        """Read stored invocations (pending ones are flushed first), oldest first.
+
+        With ``limit``, only the most recent ``limit`` invocations are returned.
+        """
+        self.flush()
+        if self._connection is None and not self.path.exists():
+            return []
+
+        query = f"SELECT {_COLUMNS} FROM invocations WHERE ts >= ?"
+        params: List[object] = [since or 0.0]
+        if tool:
+            query += " AND tool = ?"
+            params.append(tool)
+        with self._db_lock:
+            connection = self._connect()
+            if limit is None:
+                rows = connection.execute(query + " ORDER BY ts", params).fetchall()
+            else:
+                rows = connection.execute(query + " ORDER BY ts DESC LIMIT ?", [*params, limit]).fetchall()
+                rows.reverse()
+        return [
+            Invocation(
+                ts,
+                tool_name,
+                command,
+                prompt_bytes,
+                tokens,
+                wall_time,
+                exit_code,
+                bool(cache_hit),
+                output_bytes,
+                predicted_time,
+                actual_tokens,
+            )
+            for (
+                ts,
+                tool_name,
+                command,
+                prompt_bytes,
+                tokens,
+                wall_time,
+                exit_code,
+                cache_hit,
+                output_bytes,
+                predicted_time,
+                actual_tokens,
+            ) in rows
+        ]
+
+
+_stores: Dict[Path, MetricsStore] = {}
+_stores_lock = threading.Lock()
+
+
+def get_metrics_store(path: Optional[Path] = None) -> MetricsStore:
+    """Return the shared store for a path (defaults to the current project's metrics.db)."""
+    path = path or Path.cwd() / METRICS_PATH
+    with _stores_lock:
+        store = _stores.get(path)
+        if store is None:
+            store = MetricsStore(path)
+            _stores[path] = store
+        return store
+
+
+def flush_metrics() -> None:
+    """Write the buffered invocations of every store."""
+    with _stores_lock:
+        stores = list(_stores.values())
+    for store in stores:
+        try:
+            store.flush()
+        except (OSError, sqlite3.Error) as e:
+            # Metrics must never turn a successful command into a failure, but the loss is reported
+            warnings.warn(f"Could not write tool metrics to {store.path}: {e}", RuntimeWarning, stacklevel=2)
+
+
+atexit.register(flush_metrics)
+
+
+@dataclass(frozen=True)
+class ToolSummary:
+    """Aggregated metrics of one tool."""
+
+    tool: str
+    runs: int
+    failures: int
+    cache_hits: int
+    p50: float
+    p95: float
+    prompt_tokens_per_sec: float
+    output_bytes_per_sec: float
+
+
+def percentile(sorted_values: Sequence[float], fraction: float) -> float:
+    """Nearest-rank percentile of already sorted values (``fraction`` in 0..1)."""
+    index = min(len(sorted_values) - 1, max(0, round(fraction * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+def summarize(invocations: Sequence[Invocation]) -> List[ToolSummary]:
+    """Per-tool latency percentiles and throughput; cache hits are excluded from timings."""
+    by_tool: Dict[str, List[Invocation]] = {}
+    for invocation in invocations:
+        by_tool.setdefault(invocation.tool, []).append(invocation)
+
+    summaries = []
+    for tool, runs in sorted(by_tool.items()):
+        executed = [run for run in runs if not run.cache_hit]
+        timed = sorted(run.wall_time for run in executed if run.ok)
+        busy = sum(run.wall_time for run in executed if run.ok)
+        summaries.append(
+            ToolSummary(
+                tool=tool,
+                runs=len(runs),
+                failures=sum(1 for run in executed if not run.ok),
+                cache_hits=len(runs) - len(executed),
+                p50=percentile(timed, 0.5) if timed else 0.0,
+                p95=percentile(timed, 0.95) if timed else 0.0,
+                prompt_tokens_per_sec=sum(run.estimated_tokens for run in executed if run.ok) / busy if busy else 0.0,
+                output_bytes_per_sec=sum(run.output_bytes for run in executed if run.ok) / busy if busy else 0.0,
+            )
+        )
+    return summaries
+
+
+def daily_trend(invocations: Sequence[Invocation]) -> Dict[str, Dict[str, Dict[str, float]]]:
+    """Per-tool, per-day run count and median wall time: ``{tool: {YYYY-MM-DD: {"runs", "p50"}}}``."""
+    grouped: Dict[str, Dict[str, List[float]]] = {}
+    for invocation in invocations:
+        if invocation.cache_hit:
+            continue
+        day = datetime.date.fromtimestamp(invocation.ts).isoformat()
+        grouped.setdefault(invocation.tool, {}).setdefault(day, []).append(invocation.wall_time)
+
+    return {
+        tool: {day: {"runs": len(times), "p50": statistics.median(times)} for day, times in sorted(days.items())}
+        for tool, days in grouped.items()
+    }
@@ -0,0 +1,225 @@
+"""Discovery of third-party connectors and AI-Agents through package entry points.
+
+Plugins are declared in the ``cospec.connectors`` and ``cospec.agents`` entry point
+groups, e.g. in a plugin's pyproject.toml::
+
+    [project.entry-points."cospec.connectors"]
+    bedrock = "cospec_bedrock:BedrockConnector"
+
+    [project.entry-points."cospec.agents"]
+    aider = "cospec_aider:TOOL"
+
+A connector entry point is named after the ``type`` of the tools it serves and must
+be callable as ``factory(tool_name, tool_config)``. An agent entry point is named
+after the tool and provides a ``ToolConfig``, a mapping of its fields, or a callable
+returning either; it is used when a tool is selected that is not in the config.
+
+Scanning installed distributions is slow, so the entry points found are cached in
+``~/.cache/cospec/plugins.json`` and rescanned only when ``sys.path`` changes
+(installing or removing a package changes the mtime of its site-packages directory).
+Plugin modules are imported only when their tool is actually used, and names that
+no plugin provides are remembered for the rest of the process.
+"""
+
+import hashlib
+import importlib
+import json
+import os
+import sys
+import threading
+from dataclasses import asdict, dataclass
+from importlib import metadata
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Callable, Dict, Optional, Set, Tuple
+
+from cospec.core.exceptions import ConfigurationError
+from cospec.core.fileutils import atomic_write_text
+
+if TYPE_CHECKING:
+    from cospec.core.config import ToolConfig
+
+CONNECTOR_GROUP = "cospec.connectors"
+AGENT_GROUP = "cospec.agents"
+GROUPS = (CONNECTOR_GROUP, AGENT_GROUP)
+
+_INDEX_VERSION = 1
+
+PluginIndex = Dict[str, Dict[str, "PluginSpec"]]
+
+
+@dataclass(frozen=True)
+class PluginSpec:
+    """An entry point found during discovery (not yet imported)."""
+
+    name: str
+    group: str
+    value: str
+    distribution: str = ""
+
+    def load(self) -> Any:
+        """Import the plugin module and return the referenced object."""
+        module_name, _, attribute = self.value.partition(":")
+        obj: Any = importlib.import_module(module_name.strip())
+        for part in filter(None, attribute.strip().split(".")):
+            obj = getattr(obj, part)
+        return obj
+
+
+_index: Optional[PluginIndex] = None
+_loaded: Dict[PluginSpec, Any] = {}
+# (group, name) lookups that found no plugin; cleared when the index is refreshed
+_missing: Set[Tuple[str, str]] = set()
+_lock = threading.RLock()
+
+
+def index_path() -> Path:
+    """Location of the on-disk discovery index (``COSPEC_PLUGIN_INDEX`` overrides it)."""
+    override = os.environ.get("COSPEC_PLUGIN_INDEX")
+    if override:
+        return Path(override)
+    cache_home = os.environ.get("XDG_CACHE_HOME") or str(Path.home() / ".cache")
+    return Path(cache_home) / "cospec" / "plugins.json"
+
+
+def _environment_key() -> str:
+    """Fingerprint of the import path: the interpreter plus every sys.path entry and its mtime."""
+    digest = hashlib.sha256(sys.version.encode("utf-8"))
+    for entry in sys.path:
+        try:
+            mtime = os.stat(entry or ".").st_mtime_ns
+        except OSError:
+            mtime = 0
+        digest.update(f"{entry}\0{mtime}\n".encode())
+    return digest.hexdigest()
+
+
+def _scan() -> PluginIndex:
+    index: PluginIndex = {group: {} for group in GROUPS}
+    entry_points = metadata.entry_points()
+    for group in GROUPS:
+        for entry_point in entry_points.select(group=group):
+            dist = getattr(entry_point, "dist", None)
+            index[group].setdefault(
+                entry_point.name,
+                PluginSpec(entry_point.name, group, entry_point.value, dist.name if dist else ""),
+            )
+    return index
+
+
+def _read_index(path: Path, key: str) -> Optional[PluginIndex]:
+    try:
+        data = json.loads(path.read_text(encoding="utf-8"))
+        if data.get("version") != _INDEX_VERSION or data.get("key") != key:
+            return None
+        return {
+            group: {name: PluginSpec(**spec) for name, spec in data["plugins"].get(group, {}).items()}
+            for group in GROUPS
+        }
+    except (OSError, ValueError, KeyError, TypeError, AttributeError):
+        return None
+
+
+def _write_index(path: Path, key: str, index: PluginIndex) -> None:
+    data = {
+        "version": _INDEX_VERSION,
+        "key": key,
+        "plugins": {group: {name: asdict(spec) for name, spec in specs.items()} for group, specs in index.items()},
+    }
+    try:
+        atomic_write_text(path, json.dumps(data, indent=1))
+    except OSError:
+        # The index is only an optimization; a read-only home directory just means rescanning
+        pass
+
+
+def plugin_index(refresh: bool = False) -> PluginIndex:
+    """Return all discovered plugins by group, using the cached index when it is current."""
+    global _index
+    with _lock:
+        if _index is not None and not refresh:
+            return _index
+
+        path = index_path()
+        key = _environment_key()
+        index = None if refresh else _read_index(path, key)
+        if index is None:
+            index = _scan()
+            _write_index(path, key, index)
+        _index = index
+        _missing.clear()
+        return index
+
+
+def discover_plugins(group: str) -> Dict[str, PluginSpec]:
+    """Plugins of one entry point group, keyed by name (nothing is imported)."""
+    return dict(plugin_index().get(group, {}))
+
+
+def load_plugin(group: str, name: str) -> Optional[Any]:
+    """Import and return a plugin object, or None if no such plugin is installed.
+
+    Raises:
+        ConfigurationError: If the plugin is installed but cannot be imported.
+    """
+    if (group, name) in _missing:
+        return None
+    spec = plugin_index().get(group, {}).get(name)
+    if spec is None:
+        _missing.add((group, name))
+        return None
+
+    with _lock:
+        if spec in _loaded:
+            return _loaded[spec]
+        try:
+            obj = spec.load()
+        except ImportError:
+            # The cached index may predate an uninstall or upgrade; rescan once before giving up
+            fresh = plugin_index(refresh=True).get(group, {}).get(name)
+            if fresh is None:
+                _missing.add((group, name))
+                return None
+            try:
+                obj = fresh.load()
+            except (ImportError, AttributeError) as e:
+                raise ConfigurationError(f"Failed to load plugin '{name}' ({fresh.value}): {e}", e) from e
+            spec = fresh
+        except AttributeError as e:
+            raise ConfigurationError(f"Failed to load plugin '{name}' ({spec.value}): {e}", e) from e
+        _loaded[spec] = obj
+        return obj
+
+
+def load_connector_factory(tool_type: str) -> Optional[Callable[..., Any]]:
+    """Connector factory registered for a tool ``type``, or None."""
+    return load_plugin(CONNECTOR_GROUP, tool_type)
+
+
+def load_agent_tool(name: str) -> Optional["ToolConfig"]:
+    """Tool configuration provided by an AI-Agent plugin, or None.
+
+    Raises:
+        ConfigurationError: If the plugin does not provide a valid tool configuration.
+    """
+    from cospec.core.config import ToolConfig
+
+    provided = load_plugin(AGENT_GROUP, name)
+    if provided is None:
+        return None
+    if callable(provided) and not isinstance(provided, ToolConfig):
+        provided = provided()
+    if isinstance(provided, ToolConfig):
+        return provided.model_copy()
+    try:
+        return ToolConfig.model_validate(provided)
+    except ValueError as e:
+        raise ConfigurationError(f"Plugin '{name}' does not provide a valid tool configuration: {e}", e) from e
+
+
+def clear_plugin_cache() -> None:
+    """Forget the in-process index, loaded plugins and missed lookups (primarily for testing)."""
+    global _index
+    with _lock:
+        _index = None
+        _loaded.clear()
+        _missing.clear()
@@ -0,0 +1,157 @@
+"""Preflight estimates for a prompt before it is sent to a tool.
+
+The prompt's token count is approximated with the tool's model-family ratio and
+corrected by the prompt token counts that endpoints reported for earlier runs. The
+latency is predicted from the tool's recorded runs in the metrics store. Callers
+compare the estimate with the tool's limit to warn or to split the prompt into
+shards, and the prediction is stored with the run so that estimates can be checked
+against actual values later.
+"""
+
+import math
+import sqlite3
+import statistics
+import time
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Callable, List, Optional, Sequence, Tuple
+
+from cospec.core.config import ToolConfig
+from cospec.core.tokens import CONTEXT_LIMITS, estimate_tokens, model_family
+
+if TYPE_CHECKING:
+    from cospec.core.metrics import Invocation, MetricsStore
+
+# Only recent runs describe the tool's current speed
+HISTORY_WINDOW_DAYS = 30
+MIN_RUNS_FOR_FIT = 3
+# Shards are filled to this fraction of the limit to absorb estimation error
+SHARD_FILL = 0.9
+# Each shard is a separate tool run; beyond this the tool's limit is too small for the project
+MAX_SHARDS = 8
+
+FILE_MARKER = "--- File: "
+
+
+@dataclass(frozen=True)
+class Preflight:
+    """Estimated size and duration of one prompt for one tool."""
+
+    tool: str
+    family: Optional[str]
+    estimated_tokens: int
+    limit: Optional[int]
+    predicted_time: Optional[float]
+    calibration: float = 1.0
+
+    @property
+    def over_limit(self) -> bool:
+        return self.limit is not None and self.estimated_tokens > self.limit
+
+    def estimate(self, text: str) -> int:
+        """Estimate another text's tokens the same way (family ratio and calibration)."""
+        return math.ceil(estimate_tokens(text, self.family) * self.calibration)
+
+    def describe(self) -> str:
+        parts = [f"{self.tool}: ~{self.estimated_tokens:,} tokens"]
+        if self.limit is not None:
+            parts.append(f"limit {self.limit:,}")
+        if self.predicted_time is not None:
+            parts.append(f"predicted {self.predicted_time:.1f}s")
+        else:
+            parts.append("no latency history")
+        return ", ".join(parts)
+
+
+def calibration_factor(invocations: Sequence["Invocation"]) -> float:
+    """Median ratio of endpoint-reported to estimated prompt tokens (1.0 without reported counts)."""
+    ratios = [
+        invocation.actual_tokens / invocation.estimated_tokens
+        for invocation in invocations
+        if invocation.actual_tokens and invocation.estimated_tokens
+    ]
+    return statistics.median(ratios) if ratios else 1.0
+
+
+def predict_latency(invocations: Sequence["Invocation"], tokens: int) -> Optional[float]:
+    """Predict the wall time for a prompt of ``tokens`` from successful, executed runs.
+
+    With enough runs of different sizes a linear fit (fixed overhead plus time per
+    prompt token) is used; otherwise the median wall time.
+    """
+    runs = [
+        (invocation.estimated_tokens, invocation.wall_time)
+        for invocation in invocations
+        if invocation.ok and not invocation.cache_hit
+    ]
+    if not runs:
+        return None
+    if len(runs) >= MIN_RUNS_FOR_FIT and len({size for size, _ in runs}) > 1:
+        slope, intercept = statistics.linear_regression([size for size, _ in runs], [wall for _, wall in runs])
+        if slope > 0:
+            return max(0.0, intercept + slope * tokens)
+    return statistics.median(wall for _, wall in runs)
+
+
+def run_preflight(
+    prompt: str, tool_name: str, tool_config: ToolConfig, store: Optional["MetricsStore"] = None
+) -> Preflight:
+    """Estimate tokens, limit and latency of ``prompt`` for a tool."""
+    from cospec.core.metrics import get_metrics_store
+
+    family = model_family(tool_config.model, tool_config.command, tool_name)
+    try:
+        since = time.time() - HISTORY_WINDOW_DAYS * 86400
+        invocations = (store or get_metrics_store()).load(since=since, tool=tool_name)
+    except (OSError, sqlite3.Error):
+        # Without history the estimate is uncalibrated and there is no latency prediction
+        invocations = []
+
+    calibration = calibration_factor(invocations)
+    raw_tokens = estimate_tokens(prompt, family)
+    return Preflight(
+        tool=tool_name,
+        family=family,
+        estimated_tokens=math.ceil(raw_tokens * calibration),
+        limit=tool_config.max_prompt_tokens or CONTEXT_LIMITS.get(family or ""),
+        # Stored runs carry uncalibrated estimates, so the latency fit is evaluated on the same scale
+        predicted_time=predict_latency(invocations, raw_tokens),
+        calibration=calibration,
+    )
+
+
+def shard_context(context: str, max_tokens: int, count: Callable[[str], int]) -> List[str]:
+    """Split a context into shards of at most ``max_tokens`` (as measured by ``count``).
+
+    Shards break between ``--- File:`` blocks; a block that is too large on its own is
+    split between lines. Sizes are summed per piece, which slightly overestimates.
+    """
+    blocks: List[Tuple[str, int]] = []
+    for index, block in enumerate(context.split(FILE_MARKER)):
+        text = block if index == 0 else FILE_MARKER + block
+        tokens = count(text)
+        if tokens <= max_tokens:
+            blocks.append((text, tokens))
+            continue
+        piece, piece_tokens = "", 0
+        for line in text.splitlines(keepends=True):
+            line_tokens = count(line)
+            if piece and piece_tokens + line_tokens > max_tokens:
+                blocks.append((piece, piece_tokens))
+                piece, piece_tokens = "", 0
+            piece += line
+            piece_tokens += line_tokens
+        if piece:
+            blocks.append((piece, piece_tokens))
+
+    shards: List[str] = []
+    current: List[str] = []
+    current_tokens = 0
+    for text, tokens in blocks:
+        if current and current_tokens + tokens > max_tokens:
+            shards.append("".join(current))
+            current, current_tokens = [], 0
+        current.append(text)
+        current_tokens += tokens
+    if "".join(current).strip():
+        shards.append("".join(current))
+    return shards
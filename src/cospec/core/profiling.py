@@ -0,0 +1,216 @@
+"""CPU and memory profiling for ``cospec --profile cpu|mem <command>``.
+
+CPU mode runs the command under cProfile and writes a ``.pstats`` file plus a top-N
+summary. Before Python 3.12 cProfile only sees the thread that enables it, so threads
+started while profiling (e.g. batch tool runs) get their own profiler, merged into the
+report once they have finished; from 3.12 on cProfile is built on ``sys.monitoring``
+and one profiler already sees every thread. Memory mode runs the command under tracemalloc and records the
+traced memory at each phase boundary reported through ``checkpoint()`` (after context
+collection, after prompt build and after tool execution); only the snapshot of the
+largest checkpoint is kept, for the top allocation sites. Reports are written to
+``.cospec/profiles/``.
+"""
+
+import datetime
+import sys
+import threading
+import tracemalloc
+from dataclasses import dataclass
+from pathlib import Path
+from types import FrameType
+from typing import Any, List, Optional, Tuple, Union
+
+from cospec.core.fileutils import atomic_write_text
+
+PROFILE_DIR = Path(".cospec") / "profiles"
+PROFILE_MODES = ("cpu", "mem")
+TOP_N = 20
+
+# Allocations made by the profiler itself or by the import system are not interesting
+_IGNORED_FRAMES = (
+    tracemalloc.Filter(False, tracemalloc.__file__),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap_external>"),
+    tracemalloc.Filter(False, "<unknown>"),
+)
+
+
+# cProfile observes only the enabling thread before 3.12 (and allows a single active profiler from 3.12)
+_PER_THREAD_PROFILERS = sys.version_info < (3, 12)
+
+
+def _mb(size: int) -> str:
+    return f"{size / (1024 * 1024):.1f} MB"
+
+
+class CpuProfile:
+    """cProfile around a whole command, including the threads it starts."""
+
+    mode = "cpu"
+
+    def __init__(self) -> None:
+        # cProfile and pstats are imported only when profiling, since instrumented modules import this one
+        import cProfile
+
+        self._profile_class: Any = cProfile.Profile
+        self._profiler: Any = cProfile.Profile()
+        self._threads: List[Tuple[threading.Thread, Any]] = []
+        self._lock = threading.Lock()
+        self.running_threads = 0
+
+    def start(self) -> None:
+        if _PER_THREAD_PROFILERS:
+            threading.setprofile(self._profile_thread)
+        self._profiler.enable()
+
+    def _profile_thread(self, frame: FrameType, event: str, arg: Any) -> None:
+        """Runs once in each new thread: hand the thread over to a profiler of its own."""
+        profiler = self._profile_class()
+        try:
+            # Replaces this hook for the rest of the thread
+            profiler.enable()
+        except ValueError:
+            # Another profiling tool owns the thread; profiling must never stop it from running
+            sys.setprofile(None)
+            return
+        with self._lock:
+            self._threads.append((threading.current_thread(), profiler))
+
+    def checkpoint(self, name: str) -> None:
+        return None
+
+    def stop(self, path_stem: Path) -> Tuple[Path, str]:
+        """Write ``<stem>.pstats`` and ``<stem>.cpu.txt`` (top functions by cumulative time)."""
+        if _PER_THREAD_PROFILERS:
+            threading.setprofile(None)
+        self._profiler.disable()
+        pstats_path = path_stem.with_suffix(".pstats")
+        pstats_path.parent.mkdir(parents=True, exist_ok=True)
+        self._stats().dump_stats(pstats_path)
+
+        summary = self.summary()
+        atomic_write_text(path_stem.with_suffix(".cpu.txt"), summary)
+        return pstats_path, summary
+
+    def _stats(self, stream: Any = None) -> Any:
+        """Stats of the calling thread merged with those of the finished threads."""
+        import pstats
+
+        stats = pstats.Stats(self._profiler, stream=stream)
+        with self._lock:
+            threads = list(self._threads)
+        # A thread that is still running (e.g. an idle pool worker) is still writing to its profiler
+        finished = [profiler for thread, profiler in threads if not thread.is_alive()]
+        self.running_threads = len(threads) - len(finished)
+        for profiler in finished:
+            stats.add(profiler)
+        return stats
+
+    def summary(self) -> str:
+        import io
+        import pstats
+
+        buffer = io.StringIO()
+        stats = self._stats(buffer)
+        stats.strip_dirs().sort_stats(pstats.SortKey.CUMULATIVE).print_stats(TOP_N)
+        if self.running_threads:
+            buffer.write(f"{self.running_threads} threads were still running and are not included.\n")
+        return buffer.getvalue()
+
+
+@dataclass
+class MemoryCheckpoint:
+    """Traced memory at a phase boundary."""
+
+    name: str
+    current: int
+    peak: int
+
+
+class MemoryProfile:
+    """tracemalloc with phase totals, plus a snapshot of the largest phase."""
+
+    mode = "mem"
+
+    def __init__(self) -> None:
+        self.checkpoints: List[MemoryCheckpoint] = []
+        self.largest: Optional[MemoryCheckpoint] = None
+        self.largest_snapshot: Optional[tracemalloc.Snapshot] = None
+
+    def start(self) -> None:
+        tracemalloc.start()
+
+    def checkpoint(self, name: str) -> None:
+        current, peak = tracemalloc.get_traced_memory()
+        phase = MemoryCheckpoint(name, current, peak)
+        self.checkpoints.append(phase)
+        # Snapshots are large: keep only the one of the largest checkpoint so far
+        if self.largest is None or current > self.largest.current:
+            self.largest = phase
+            self.largest_snapshot = tracemalloc.take_snapshot().filter_traces(_IGNORED_FRAMES)
+
+    def stop(self, path_stem: Path) -> Tuple[Path, str]:
+        """Take a final checkpoint, stop tracing and write ``<stem>.mem.txt``."""
+        self.checkpoint("end")
+        tracemalloc.stop()
+        path = path_stem.with_suffix(".mem.txt")
+        summary = self.summary()
+        atomic_write_text(path, summary)
+        return path, summary
+
+    def summary(self) -> str:
+        if not self.checkpoints:
+            return "No memory checkpoints recorded.\n"
+
+        lines = [f"Peak traced memory: {_mb(max(c.peak for c in self.checkpoints))}", "", "Phase checkpoints:"]
+        previous = 0
+        for phase in self.checkpoints:
+            lines.append(
+                f"  {phase.name:<20} current {_mb(phase.current):>10} "
+                f"({phase.current - previous:+,d} B)  peak {_mb(phase.peak):>10}"
+            )
+            previous = phase.current
+
+        # The largest checkpoint is where the retained copies (e.g. of prompt strings) add up
+        if self.largest is not None and self.largest_snapshot is not None:
+            lines.extend(["", f"Top {TOP_N} allocation sites at '{self.largest.name}':"])
+            for stat in self.largest_snapshot.statistics("lineno")[:TOP_N]:
+                frame = stat.traceback[0]
+                lines.append(f"  {_mb(stat.size):>10} {stat.count:>8} blocks  {frame.filename}:{frame.lineno}")
+        return "\n".join(lines) + "\n"
+
+
+Profile = Union[CpuProfile, MemoryProfile]
+
+_profile: Optional[Profile] = None
+
+
+def checkpoint(name: str) -> None:
+    """Mark a phase boundary (a no-op unless memory profiling is active)."""
+    if _profile is not None:
+        _profile.checkpoint(name)
+
+
+def start_profiling(mode: str) -> Profile:
+    """Start profiling the current command.
+
+    Raises:
+        ValueError: If the mode is not one of PROFILE_MODES.
+    """
+    global _profile
+    if mode not in PROFILE_MODES:
+        raise ValueError(f"Unknown profile mode '{mode}'. Choose from: {', '.join(PROFILE_MODES)}")
+    _profile = CpuProfile() if mode == "cpu" else MemoryProfile()
+    _profile.start()
+    return _profile
+
+
+def stop_profiling(command: str, root: Optional[Path] = None) -> Optional[Tuple[Path, str]]:
+    """Stop the active profile and write its report; returns the report path and summary."""
+    global _profile
+    profile, _profile = _profile, None
+    if profile is None:
+        return None
+    timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
+    stem = (root or Path.cwd()) / PROFILE_DIR / f"{command}_{timestamp}"
+    return profile.stop(stem)
@@ -0,0 +1,314 @@
+"""Searchable store of review reports (``.cospec/reports.db``).
+
+Every review report is ingested with its metadata (tool, timestamp, git commit,
+prompt hash) and its findings split per Markdown heading. The findings are kept in
+an SQLite FTS5 table, so looking up past issues is an indexed query instead of a
+grep over ``docs/review_*.md``. The trigram tokenizer is used because reports are
+often Japanese, which has no word separators; search terms shorter than three
+characters, and every search on SQLite builds without the trigram tokenizer, fall
+back to a substring scan.
+"""
+
+import datetime
+import hashlib
+import re
+import sqlite3
+import subprocess
+from dataclasses import dataclass
+from pathlib import Path
+from typing import List, Optional, Tuple
+
+REPORTS_PATH = Path(".cospec") / "reports.db"
+
+# Reports written by `cospec review`: docs/review_<YYYYmmdd_HHMMSS>_<tool>.md
+REPORT_NAME = re.compile(r"review_(\d{8}_\d{6})_(.+)\.md")
+REPORT_GLOB = "docs/review_*.md"
+
+_HEADING = re.compile(r"^(#{1,6})\s+(.*?)\s*#*\s*$")
+_FENCE = re.compile(r"^\s*(```|~~~)")
+
+MIN_TRIGRAM_TERM = 3
+# Snippet highlight markers (control characters never occur in reports)
+MATCH_START, MATCH_END = "\x02", "\x03"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS reports (
+    id INTEGER PRIMARY KEY,
+    path TEXT NOT NULL UNIQUE,
+    tool TEXT NOT NULL,
+    created REAL NOT NULL,
+    git_commit TEXT,
+    prompt_hash TEXT,
+    finding_count INTEGER NOT NULL,
+    content TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS reports_created ON reports (created);
+"""
+
+_FTS_SCHEMA = """
+CREATE VIRTUAL TABLE IF NOT EXISTS findings USING fts5(
+    report_id UNINDEXED, position UNINDEXED, heading, body, tokenize='{tokenizer}'
+)
+"""
+
+
+# ReportInfo fields, selected from ``reports r``
+_REPORT_COLUMNS = "r.id, r.path, r.tool, r.created, r.git_commit, r.prompt_hash, r.finding_count"
+
+
+@dataclass(frozen=True)
+class Finding:
+    """A section of a report (the text under one heading)."""
+
+    heading: str
+    body: str
+
+
+@dataclass(frozen=True)
+class ReportInfo:
+    """Metadata of a stored report."""
+
+    id: int
+    path: str
+    tool: str
+    created: float
+    git_commit: Optional[str]
+    prompt_hash: Optional[str]
+    findings: int
+
+    @property
+    def created_text(self) -> str:
+        return datetime.datetime.fromtimestamp(self.created).strftime("%Y-%m-%d %H:%M:%S")
+
+
+@dataclass(frozen=True)
+class SearchHit:
+    """A finding matching a search, with the matched terms marked in ``snippet``."""
+
+    report: ReportInfo
+    heading: str
+    snippet: str
+
+
+def split_findings(content: str) -> List[Finding]:
+    """Split a Markdown report into one finding per heading (headings in code blocks are ignored)."""
+    findings: List[Finding] = []
+    heading = ""
+    lines: List[str] = []
+    in_fence = False
+
+    for line in content.splitlines():
+        if _FENCE.match(line):
+            in_fence = not in_fence
+        match = None if in_fence else _HEADING.match(line)
+        if match:
+            if heading or "".join(lines).strip():
+                findings.append(Finding(heading, "\n".join(lines).strip()))
+            heading, lines = match.group(2), []
+        else:
+            lines.append(line)
+    if heading or "".join(lines).strip():
+        findings.append(Finding(heading, "\n".join(lines).strip()))
+    return findings
+
+
+def prompt_hash(prompt: str) -> str:
+    """Short, stable identifier of the prompt a report was generated from."""
+    return hashlib.sha256(prompt.encode("utf-8")).hexdigest()[:16]
+
+
+def current_commit(root: Optional[Path] = None) -> Optional[str]:
+    """HEAD commit of the project (None outside a git repository or without git)."""
+    try:
+        result = subprocess.run(
+            ["git", "rev-parse", "HEAD"], cwd=root or Path.cwd(), capture_output=True, text=True, timeout=10
+        )
+    except (OSError, subprocess.TimeoutExpired):
+        return None
+    if result.returncode != 0:
+        return None
+    return result.stdout.strip() or None
+
+
+def parse_report_name(path: Path) -> Tuple[Optional[str], Optional[float]]:
+    """Tool and timestamp encoded in a ``review_<date>_<tool>.md`` file name."""
+    match = REPORT_NAME.fullmatch(path.name)
+    if not match:
+        return None, None
+    created = datetime.datetime.strptime(match.group(1), "%Y%m%d_%H%M%S").timestamp()
+    return match.group(2), created
+
+
+def _match_query(query: str) -> str:
+    """Quote every term so that FTS5 syntax characters in reports' vocabulary are literal."""
+    return " ".join('"' + term.replace('"', '""') + '"' for term in query.split())
+
+
+class ReportStore:
+    """SQLite store of review reports with a full-text index over their findings."""
+
+    def __init__(self, path: Optional[Path] = None):
+        self.path = path or Path.cwd() / REPORTS_PATH
+        # Whether the findings index uses the trigram tokenizer (set on connect)
+        self._trigram = False
+
+    def _connect(self) -> sqlite3.Connection:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        connection = sqlite3.connect(self.path, timeout=10)
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.executescript(_SCHEMA)
+        try:
+            connection.execute(_FTS_SCHEMA.format(tokenizer="trigram"))
+        except sqlite3.OperationalError:
+            # SQLite < 3.34 has no trigram tokenizer; search then goes through the scan
+            connection.execute(_FTS_SCHEMA.format(tokenizer="unicode61"))
+        # Read the tokenizer from the schema: the index may have been created by an older SQLite
+        (schema,) = connection.execute("SELECT sql FROM sqlite_master WHERE name = 'findings'").fetchone()
+        self._trigram = "trigram" in schema
+        return connection
+
+    def ingest(
+        self,
+        path: Path,
+        content: Optional[str] = None,
+        tool: Optional[str] = None,
+        created: Optional[float] = None,
+        git_commit: Optional[str] = None,
+        prompt_digest: Optional[str] = None,
+    ) -> int:
+        """Store (or replace) a report and index its findings; returns the report id.
+
+        Missing metadata is taken from the ``review_<date>_<tool>.md`` file name and the file's mtime.
+        """
+        if content is None:
+            content = path.read_text(encoding="utf-8")
+        name_tool, name_created = parse_report_name(path)
+        tool = tool or name_tool or "unknown"
+        if created is None:
+            created = name_created if name_created is not None else path.stat().st_mtime
+
+        findings = split_findings(content)
+        connection = self._connect()
+        try:
+            with connection:
+                row = connection.execute("SELECT id FROM reports WHERE path = ?", (path.as_posix(),)).fetchone()
+                if row:
+                    report_id = int(row[0])
+                    connection.execute("DELETE FROM findings WHERE report_id = ?", (report_id,))
+                    connection.execute(
+                        "UPDATE reports SET tool = ?, created = ?, git_commit = ?, prompt_hash = ?, finding_count = ?, "
+                        "content = ? WHERE id = ?",
+                        (tool, created, git_commit, prompt_digest, len(findings), content, report_id),
+                    )
+                else:
+                    cursor = connection.execute(
+                        "INSERT INTO reports (path, tool, created, git_commit, prompt_hash, finding_count, content) "
+                        "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                        (path.as_posix(), tool, created, git_commit, prompt_digest, len(findings), content),
+                    )
+                    report_id = int(cursor.lastrowid or 0)
+                connection.executemany(
+                    "INSERT INTO findings (report_id, position, heading, body) VALUES (?, ?, ?, ?)",
+                    [(report_id, position, finding.heading, finding.body) for position, finding in enumerate(findings)],
+                )
+        finally:
+            connection.close()
+        return report_id
+
+    def _report_query(self) -> str:
+        return f"SELECT {_REPORT_COLUMNS} FROM reports r"
+
+    def list(self, tool: Optional[str] = None, limit: int = 20) -> List[ReportInfo]:
+        """Stored reports, newest first."""
+        if not self.path.exists():
+            return []
+        query = self._report_query()
+        params: List[object] = []
+        if tool:
+            query += " WHERE r.tool = ?"
+            params.append(tool)
+        connection = self._connect()
+        try:
+            rows = connection.execute(query + " ORDER BY r.created DESC LIMIT ?", [*params, limit]).fetchall()
+        finally:
+            connection.close()
+        return [ReportInfo(*row) for row in rows]
+
+    def get(self, report_id: int) -> Optional[Tuple[ReportInfo, str]]:
+        """A report's metadata and content."""
+        if not self.path.exists():
+            return None
+        connection = self._connect()
+        try:
+            row = connection.execute(self._report_query() + " WHERE r.id = ?", (report_id,)).fetchone()
+            content = connection.execute("SELECT content FROM reports WHERE id = ?", (report_id,)).fetchone()
+        finally:
+            connection.close()
+        if row is None or content is None:
+            return None
+        return ReportInfo(*row), content[0]
+
+    def search(self, query: str, tool: Optional[str] = None, limit: int = 20) -> List[SearchHit]:
+        """Findings matching all terms of ``query``, best matches first."""
+        terms = query.split()
+        if not terms or not self.path.exists():
+            return []
+
+        connection = self._connect()
+        report_columns = _REPORT_COLUMNS
+        params: List[object]
+        if self._trigram and all(len(term) >= MIN_TRIGRAM_TERM for term in terms):
+            sql = (
+                f"SELECT {report_columns}, f.heading, "
+                f"snippet(findings, 3, '{MATCH_START}', '{MATCH_END}', '…', 40) "
+                "FROM findings f JOIN reports r ON r.id = f.report_id WHERE findings MATCH ?"
+            )
+            params = [_match_query(query)]
+            order = " ORDER BY bm25(findings), r.created DESC"
+        else:
+            # No trigram index, or terms too short for it: scan the findings
+            sql = (
+                f"SELECT {report_columns}, f.heading, f.body "
+                "FROM findings f JOIN reports r ON r.id = f.report_id WHERE "
+                + " AND ".join("(f.heading || ' ' || f.body) LIKE ?" for _ in terms)
+            )
+            params = [f"%{term}%" for term in terms]
+            order = " ORDER BY r.created DESC"
+        if tool:
+            sql += " AND r.tool = ?"
+            params.append(tool)
+
+        try:
+            rows = connection.execute(sql + order + " LIMIT ?", [*params, limit]).fetchall()
+        finally:
+            connection.close()
+
+        hits = []
+        for *report_row, heading, text in rows:
+            report = ReportInfo(*report_row)
+            snippet = text if MATCH_START in text else _scan_snippet(text, terms)
+            hits.append(SearchHit(report, heading, snippet))
+        return hits
+
+
+def _scan_snippet(body: str, terms: List[str], width: int = 60) -> str:
+    """Snippet around the first occurrence of the first term, with all terms marked."""
+    lowered = body.lower()
+    index = max(lowered.find(terms[0].lower()), 0)
+    start = max(index - width // 2, 0)
+    snippet = body[start : start + width].replace("\n", " ")
+    for term in terms:
+        snippet = re.sub(re.escape(term), lambda m: f"{MATCH_START}{m.group(0)}{MATCH_END}", snippet, flags=re.I)
+    return ("…" if start else "") + snippet + ("…" if start + width < len(body) else "")
+
+
+def ingest_report(path: Path, tool: str, prompt: Optional[str] = None, root: Optional[Path] = None) -> int:
+    """Store a freshly written review report with the current commit and the prompt's hash."""
+    root = root or Path.cwd()
+    return ReportStore(root / REPORTS_PATH).ingest(
+        path,
+        tool=tool,
+        created=path.stat().st_mtime,
+        git_commit=current_commit(root),
+        prompt_digest=prompt_hash(prompt) if prompt is not None else None,
+    )
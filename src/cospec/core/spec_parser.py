@@ -0,0 +1,204 @@
+"""Single-pass SPEC.md parser producing a cached, structured spec model.
+
+Both ``HearerAgent`` and ``TestGeneratorAgent`` read the same structure instead of
+running their own regex passes over the full document.
+"""
+
+import hashlib
+import re
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+
+# Inline "key: value" clauses recognised anywhere in a line, keyed by clause name
+CLAUSE_MARKERS: Dict[str, str] = {
+    "時点": "- 時点: ",
+    "引数": "- 引数: ",
+    "失敗時": "失敗時: ",
+    "エラー": "エラー: ",
+    "例外": "例外: ",
+    "出力": "出力: ",
+    "結果": "結果: ",
+}
+
+# Subsection titles inside an FR section and the FeatureRequirement list they fill
+BEHAVIOR_SECTION = "期待される挙動"
+INPUT_SECTION = "ユーザー入力"
+OUTPUT_SECTION = "出力"
+
+_FR_HEADING = re.compile(r"^(FR-\d+):\s*(.+)$")
+_CACHE_SIZE = 16
+
+
+@dataclass(frozen=True)
+class SpecClause:
+    """An inline ``key: value`` clause (e.g. ``失敗時: ...``) found in the spec."""
+
+    key: str
+    value: str
+    line: int
+    section: str
+
+
+@dataclass(frozen=True)
+class SpecSection:
+    """A heading and the lines up to the next heading (line numbers are 0-based, end exclusive)."""
+
+    title: str
+    level: int
+    start: int
+    end: int
+    text: str
+
+
+@dataclass(frozen=True)
+class FeatureRequirement:
+    """A functional requirement (``FR-xxx``) with its bulleted subsections."""
+
+    fr_id: str
+    title: str
+    start: int
+    end: int
+    behaviors: Tuple[str, ...]
+    inputs: Tuple[str, ...]
+    outputs: Tuple[str, ...]
+
+
+@dataclass(frozen=True)
+class SpecModel:
+    """Structured view of a SPEC.md document."""
+
+    digest: str
+    sections: Tuple[SpecSection, ...]
+    features: Tuple[FeatureRequirement, ...]
+    clauses: Tuple[SpecClause, ...]
+
+    def clauses_for(self, key: str, section: Optional[str] = None) -> List[SpecClause]:
+        """Return clauses with the given key, optionally restricted to sections with the given title."""
+        return [c for c in self.clauses if c.key == key and (section is None or c.section == section)]
+
+    def section_at(self, line: int) -> Optional[SpecSection]:
+        """Return the section containing the given line."""
+        for section in self.sections:
+            if section.start <= line < section.end:
+                return section
+        return None
+
+    def feature_at(self, line: int) -> Optional[FeatureRequirement]:
+        """Return the FR section containing the given line."""
+        for feature in self.features:
+            if feature.start <= line < feature.end:
+                return feature
+        return None
+
+
+class _FeatureBuilder:
+    def __init__(self, fr_id: str, title: str, level: int, start: int):
+        self.fr_id = fr_id
+        self.title = title
+        self.level = level
+        self.start = start
+        self.lists: Dict[str, List[str]] = {BEHAVIOR_SECTION: [], INPUT_SECTION: [], OUTPUT_SECTION: []}
+
+    def build(self, end: int) -> FeatureRequirement:
+        return FeatureRequirement(
+            fr_id=self.fr_id,
+            title=self.title,
+            start=self.start,
+            end=end,
+            behaviors=tuple(self.lists[BEHAVIOR_SECTION]),
+            inputs=tuple(self.lists[INPUT_SECTION]),
+            outputs=tuple(self.lists[OUTPUT_SECTION]),
+        )
+
+
+def _heading(stripped: str) -> Tuple[int, str]:
+    level = len(stripped) - len(stripped.lstrip("#"))
+    return level, stripped[level:].strip()
+
+
+def _tokenize(content: str, digest: str) -> SpecModel:
+    lines = content.split("\n")
+    sections: List[SpecSection] = []
+    features: List[FeatureRequirement] = []
+    clauses: List[SpecClause] = []
+
+    section_title, section_level, section_start = "", 0, 0
+    feature: Optional[_FeatureBuilder] = None
+    in_fence = False
+
+    def close_section(end: int) -> None:
+        if end > section_start or section_title:
+            text = "\n".join(lines[section_start:end])
+            sections.append(SpecSection(section_title, section_level, section_start, end, text))
+
+    for index, line in enumerate(lines):
+        stripped = line.lstrip()
+        if not stripped:
+            continue
+
+        first = stripped[0]
+        if first == "`" and stripped.startswith("```"):
+            in_fence = not in_fence
+
+        if first == "#" and not in_fence:
+            level, title = _heading(stripped)
+            close_section(index)
+            section_title, section_level, section_start = title, level, index
+
+            if feature is not None and level <= feature.level:
+                features.append(feature.build(index))
+                feature = None
+
+            fr_match = _FR_HEADING.match(title)
+            if fr_match:
+                feature = _FeatureBuilder(fr_match.group(1), fr_match.group(2).strip(), level, index)
+            continue
+
+        if first == "-" and feature is not None and section_title in feature.lists:
+            feature.lists[section_title].append(stripped.strip().lstrip("- ").strip())
+
+        # Every clause marker ends in ": ", so most prose lines are skipped with a single scan
+        if ": " not in line:
+            continue
+
+        for key, marker in CLAUSE_MARKERS.items():
+            position = line.find(marker)
+            if position >= 0:
+                value = line[position + len(marker) :]
+                if value:
+                    clauses.append(SpecClause(key, value, index, section_title))
+
+    close_section(len(lines))
+    if feature is not None:
+        features.append(feature.build(len(lines)))
+
+    return SpecModel(digest, tuple(sections), tuple(features), tuple(clauses))
+
+
+_cache: "OrderedDict[str, SpecModel]" = OrderedDict()
+_cache_lock = threading.Lock()
+
+
+def spec_digest(content: str) -> str:
+    """Return the content hash used to cache parsed specs."""
+    return hashlib.sha256(content.encode("utf-8")).hexdigest()
+
+
+def parse_spec(content: str) -> SpecModel:
+    """Parse SPEC.md content into a SpecModel, reusing the cached model for identical content."""
+    digest = spec_digest(content)
+    with _cache_lock:
+        model = _cache.get(digest)
+        if model is not None:
+            _cache.move_to_end(digest)
+            return model
+
+    model = _tokenize(content, digest)
+
+    with _cache_lock:
+        _cache[digest] = model
+        while len(_cache) > _CACHE_SIZE:
+            _cache.popitem(last=False)
+    return model
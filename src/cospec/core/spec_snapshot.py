@@ -0,0 +1,172 @@
+"""Section-level snapshots of SPEC.md and diffs against them.
+
+Snapshots are stored as JSON in ``.cospec/snapshots/<id>.json`` (the id is a prefix of
+the spec digest) and hold one hash per section, keyed by the section's heading path
+(e.g. ``FR-001: Export / ユーザー入力``), so inserting a section does not shift the keys
+of the sections after it.
+"""
+
+import datetime
+import hashlib
+import json
+import re
+import subprocess
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from cospec.core.exceptions import CospecError
+from cospec.core.fileutils import atomic_write_text
+from cospec.core.spec_parser import SpecSection, parse_spec
+
+SNAPSHOT_DIR = Path(".cospec") / "snapshots"
+SPEC_PATH = Path("docs") / "SPEC.md"
+LATEST_REF = "last"
+
+_ID_LENGTH = 12
+_SNAPSHOT_ID = re.compile(r"[0-9a-f]{4,64}")
+
+
+@dataclass(frozen=True)
+class SpecSnapshot:
+    """Per-section hashes of a SPEC.md version."""
+
+    digest: str
+    created: str
+    sections: Dict[str, str]
+
+    @property
+    def snapshot_id(self) -> str:
+        return self.digest[:_ID_LENGTH]
+
+
+@dataclass
+class SpecDelta:
+    """Sections of the current SPEC.md that changed since a snapshot."""
+
+    changed: List[Tuple[str, SpecSection]] = field(default_factory=list)
+    added: List[Tuple[str, SpecSection]] = field(default_factory=list)
+    removed: List[str] = field(default_factory=list)
+
+    @property
+    def is_empty(self) -> bool:
+        return not (self.changed or self.added or self.removed)
+
+
+def _section_keys(sections: List[SpecSection]) -> List[str]:
+    """Build a unique heading-path key for each section."""
+    keys = []
+    stack: List[SpecSection] = []
+    seen: Dict[str, int] = {}
+
+    for section in sections:
+        while stack and stack[-1].level >= section.level:
+            stack.pop()
+        if section.level:
+            stack.append(section)
+
+        path = " / ".join(s.title for s in stack) if section.level else section.title
+        seen[path] = seen.get(path, 0) + 1
+        keys.append(path if seen[path] == 1 else f"{path} #{seen[path]}")
+    return keys
+
+
+def _hash(text: str) -> str:
+    return hashlib.sha256(text.strip().encode("utf-8")).hexdigest()
+
+
+def snapshot_spec(content: str) -> SpecSnapshot:
+    """Create a snapshot of SPEC.md content."""
+    model = parse_spec(content)
+    sections = list(model.sections)
+    return SpecSnapshot(
+        digest=model.digest,
+        created=datetime.datetime.now().isoformat(timespec="seconds"),
+        sections={key: _hash(section.text) for key, section in zip(_section_keys(sections), sections, strict=True)},
+    )
+
+
+def diff_spec(snapshot: SpecSnapshot, content: str) -> SpecDelta:
+    """Compare SPEC.md content with a snapshot section by section."""
+    sections = list(parse_spec(content).sections)
+    delta = SpecDelta()
+    current_keys = _section_keys(sections)
+
+    for key, section in zip(current_keys, sections, strict=True):
+        previous = snapshot.sections.get(key)
+        if previous is None:
+            delta.added.append((key, section))
+        elif previous != _hash(section.text):
+            delta.changed.append((key, section))
+
+    current = set(current_keys)
+    delta.removed = [key for key in snapshot.sections if key not in current]
+    return delta
+
+
+def _snapshot_from_json(data: Dict[str, Any]) -> SpecSnapshot:
+    return SpecSnapshot(digest=data["digest"], created=data.get("created", ""), sections=dict(data["sections"]))
+
+
+def _read_snapshot(path: Path) -> SpecSnapshot:
+    try:
+        return _snapshot_from_json(json.loads(path.read_text(encoding="utf-8")))
+    except (OSError, ValueError, KeyError, TypeError) as e:
+        raise CospecError(f"Invalid SPEC snapshot: {path}", e) from e
+
+
+def save_snapshot(snapshot: SpecSnapshot, root: Optional[Path] = None) -> Path:
+    """Store a snapshot under .cospec/snapshots/ (unchanged specs reuse the same file)."""
+    path = (root or Path.cwd()) / SNAPSHOT_DIR / f"{snapshot.snapshot_id}.json"
+    data = {"digest": snapshot.digest, "created": snapshot.created, "sections": snapshot.sections}
+    atomic_write_text(path, json.dumps(data, indent=2, ensure_ascii=False))
+    return path
+
+
+def latest_snapshot(root: Optional[Path] = None) -> Optional[SpecSnapshot]:
+    """Return the most recently saved snapshot, if any."""
+    snapshot_dir = (root or Path.cwd()) / SNAPSHOT_DIR
+    candidates = (
+        sorted(snapshot_dir.glob("*.json"), key=lambda p: p.stat().st_mtime_ns) if snapshot_dir.exists() else []
+    )
+    return _read_snapshot(candidates[-1]) if candidates else None
+
+
+def resolve_snapshot(ref: str, root: Optional[Path] = None) -> SpecSnapshot:
+    """Resolve a ``--since`` reference to a snapshot.
+
+    ``ref`` may be ``last``, a snapshot id (or unique id prefix), a snapshot JSON file,
+    a SPEC.md-style markdown file, or a git revision whose docs/SPEC.md is used.
+    ``last`` resolves to an empty snapshot when none has been saved yet.
+
+    Raises:
+        CospecError: If the reference cannot be resolved.
+    """
+    root = root or Path.cwd()
+    snapshot_dir = root / SNAPSHOT_DIR
+
+    if ref == LATEST_REF:
+        # Without a previous snapshot every section counts as added
+        return latest_snapshot(root) or SpecSnapshot(digest="", created="", sections={})
+
+    if _SNAPSHOT_ID.fullmatch(ref) and snapshot_dir.exists():
+        matches = sorted(snapshot_dir.glob(f"{ref}*.json"))
+        if len(matches) == 1:
+            return _read_snapshot(matches[0])
+
+    path = Path(ref)
+    if path.is_file():
+        if path.suffix == ".json":
+            return _read_snapshot(path)
+        return snapshot_spec(path.read_text(encoding="utf-8"))
+
+    try:
+        # "./" makes git resolve the path relative to the working directory, not the repository root
+        result = subprocess.run(
+            ["git", "show", f"{ref}:./{SPEC_PATH.as_posix()}"], cwd=root, capture_output=True, text=True
+        )
+    except OSError as e:
+        raise CospecError(f"'{ref}' is not a snapshot or file, and git is not available.", e) from e
+    if result.returncode != 0:
+        raise CospecError(f"'{ref}' is not a snapshot, file or git revision with {SPEC_PATH.as_posix()}.")
+    return snapshot_spec(result.stdout)
@@ -0,0 +1,94 @@
+"""Compiled ``{placeholder}`` templates with single-pass rendering and a file cache."""
+
+import re
+import threading
+from dataclasses import dataclass
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Callable, Dict, Mapping, TextIO, Tuple
+
+_PLACEHOLDER = re.compile(r"\{([^{}]+)\}")
+
+
+@dataclass(frozen=True)
+class CompiledTemplate:
+    """A template split once into literal segments and placeholder names.
+
+    ``literals`` always has one more element than ``names``: rendering writes
+    ``literals[0], value(names[0]), literals[1], ...``. Placeholders missing from
+    the context are written back verbatim, and substituted values are never
+    scanned again, so a value containing ``{name}`` is output as-is.
+    """
+
+    literals: Tuple[str, ...]
+    names: Tuple[str, ...]
+
+    @classmethod
+    def compile(cls, source: str) -> "CompiledTemplate":
+        """Parse the placeholders of a template string."""
+        literals = []
+        names = []
+        position = 0
+        for match in _PLACEHOLDER.finditer(source):
+            literals.append(source[position : match.start()])
+            names.append(match.group(1))
+            position = match.end()
+        literals.append(source[position:])
+        return cls(tuple(literals), tuple(names))
+
+    def _write(self, write: Callable[[str], Any], context: Mapping[str, Any]) -> None:
+        # literals has one more element than names; the tail is written after the loop
+        for literal, name in zip(self.literals, self.names, strict=False):
+            write(literal)
+            if name in context:
+                value = context[name]
+                write(value if isinstance(value, str) else str(value))
+            else:
+                write(f"{{{name}}}")
+        write(self.literals[-1])
+
+    def render_to(self, stream: TextIO, context: Mapping[str, Any]) -> None:
+        """Write the rendered template to a stream segment by segment."""
+        self._write(stream.write, context)
+
+    def render(self, context: Mapping[str, Any]) -> str:
+        """Render the template to a string (values are copied exactly once)."""
+        segments: list = []
+        self._write(segments.append, context)
+        return "".join(segments)
+
+
+@lru_cache(maxsize=32)
+def compile_template(source: str) -> CompiledTemplate:
+    """Compile a template string, reusing the result for repeated sources."""
+    return CompiledTemplate.compile(source)
+
+
+_cache: Dict[str, Tuple[int, int, CompiledTemplate]] = {}
+_cache_lock = threading.Lock()
+
+
+def load_template(path: Path) -> CompiledTemplate:
+    """Return the compiled template for a file, recompiling only when its mtime or size changes.
+
+    Raises:
+        FileNotFoundError: If the template file does not exist.
+    """
+    stat = path.stat()
+    key = str(path.resolve())
+
+    with _cache_lock:
+        cached = _cache.get(key)
+    if cached is not None and cached[0] == stat.st_mtime_ns and cached[1] == stat.st_size:
+        return cached[2]
+
+    template = CompiledTemplate.compile(path.read_text(encoding="utf-8"))
+    with _cache_lock:
+        _cache[key] = (stat.st_mtime_ns, stat.st_size, template)
+    return template
+
+
+def clear_template_cache() -> None:
+    """Drop all cached templates (primarily for testing)."""
+    with _cache_lock:
+        _cache.clear()
@@ -0,0 +1,133 @@
+"""Validation of generated pytest files: compilation, duplicate test detection and collection."""
+
+import ast
+import importlib.util
+import os
+import re
+import subprocess
+import sys
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+# Below this many files a process pool costs more to start than it saves
+PARALLEL_THRESHOLD = 16
+
+_COLLECT_ERROR = re.compile(r"^ERROR (\S+?\.py)\b")
+
+
+@dataclass
+class FileValidation:
+    """Validation result for a single generated test file."""
+
+    path: str
+    syntax_error: Optional[str] = None
+    duplicate_tests: List[str] = field(default_factory=list)
+    collection_error: bool = False
+
+    @property
+    def ok(self) -> bool:
+        return self.syntax_error is None and not self.duplicate_tests and not self.collection_error
+
+
+@dataclass
+class ValidationReport:
+    """Aggregated validation result for a set of generated test files."""
+
+    files: List[FileValidation]
+    collected: int = 0
+    collect_output: str = ""
+
+    @property
+    def ok(self) -> bool:
+        return all(f.ok for f in self.files)
+
+
+def _duplicate_tests(tree: ast.Module) -> List[str]:
+    """Find test functions defined more than once in the same scope (later definitions shadow earlier ones)."""
+    duplicates: List[str] = []
+    scopes: List[Tuple[str, List[ast.stmt]]] = [("", tree.body)]
+    scopes.extend((f"{node.name}::", node.body) for node in tree.body if isinstance(node, ast.ClassDef))
+
+    for prefix, body in scopes:
+        names = Counter(
+            node.name
+            for node in body
+            if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)) and node.name.startswith("test")
+        )
+        duplicates.extend(f"{prefix}{name}" for name, count in names.items() if count > 1)
+    return duplicates
+
+
+def check_file(path: str) -> FileValidation:
+    """Compile a file and look for duplicate test IDs (runs inside pool workers)."""
+    result = FileValidation(path=path)
+    try:
+        source = Path(path).read_text(encoding="utf-8")
+        tree = ast.parse(source, filename=path)
+        compile(tree, path, "exec")
+    except SyntaxError as e:
+        result.syntax_error = f"line {e.lineno}: {e.msg}"
+        return result
+    except (OSError, ValueError) as e:
+        result.syntax_error = str(e)
+        return result
+
+    result.duplicate_tests = _duplicate_tests(tree)
+    return result
+
+
+def _collect(collect_dir: Path) -> subprocess.CompletedProcess:
+    return subprocess.run(
+        [
+            sys.executable,
+            "-m",
+            "pytest",
+            "--collect-only",
+            "-q",
+            "-o",
+            "addopts=",
+            "-p",
+            "no:cacheprovider",
+            str(collect_dir),
+        ],
+        capture_output=True,
+        text=True,
+    )
+
+
+def validate_test_files(paths: List[Path], collect_dir: Optional[Path] = None) -> ValidationReport:
+    """Validate generated test files.
+
+    Every file is compiled (in a process pool for large sets), then pytest
+    collects ``collect_dir`` once to catch import-time and collection errors.
+    """
+    path_strings = [str(p) for p in paths]
+
+    if len(path_strings) >= PARALLEL_THRESHOLD:
+        workers = min(os.cpu_count() or 1, len(path_strings))
+        chunksize = max(1, len(path_strings) // (workers * 4))
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            files = list(executor.map(check_file, path_strings, chunksize=chunksize))
+    else:
+        files = [check_file(p) for p in path_strings]
+
+    report = ValidationReport(files=files)
+
+    if collect_dir is None or importlib.util.find_spec("pytest") is None:
+        return report
+
+    completed = _collect(collect_dir)
+    report.collect_output = completed.stdout + completed.stderr
+
+    by_name: Dict[str, FileValidation] = {Path(f.path).name: f for f in files}
+    for line in completed.stdout.splitlines():
+        if "::" in line and not line.startswith(("ERROR", "FAILED")):
+            report.collected += 1
+        match = _COLLECT_ERROR.match(line)
+        if match and Path(match.group(1)).name in by_name:
+            by_name[Path(match.group(1)).name].collection_error = True
+
+    return report
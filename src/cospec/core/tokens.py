@@ -0,0 +1,61 @@
+"""Local token-count approximation with per-model-family ratios.
+
+No tokenizer is shipped with cospec, so prompt sizes are estimated from character
+classes: ASCII text (code, English) and other text (mostly Japanese) compress very
+differently, and the ratio depends on the model family's vocabulary.
+"""
+
+import math
+from dataclasses import dataclass
+from typing import Dict, Optional
+
+
+@dataclass(frozen=True)
+class TokenRatio:
+    """Average characters per token for ASCII and for other (e.g. CJK) characters."""
+
+    ascii_chars_per_token: float
+    other_chars_per_token: float
+
+
+DEFAULT_RATIO = TokenRatio(4.0, 1.0)
+
+# Matched as substrings of the model name (or the command/tool name for CLI tools)
+TOKEN_RATIOS: Dict[str, TokenRatio] = {
+    "qwen": TokenRatio(3.8, 1.4),
+    "gpt": TokenRatio(4.0, 1.2),
+    "claude": TokenRatio(3.5, 0.9),
+    "gemini": TokenRatio(4.0, 1.3),
+    "llama": TokenRatio(3.8, 0.8),
+    "deepseek": TokenRatio(3.8, 1.4),
+}
+
+# Prompt limits (tokens) per model family; tools can override with ToolConfig.max_prompt_tokens
+CONTEXT_LIMITS: Dict[str, int] = {
+    "qwen": 128_000,
+    "gpt": 128_000,
+    "claude": 200_000,
+    "gemini": 1_000_000,
+    "llama": 128_000,
+    "deepseek": 64_000,
+}
+
+
+def model_family(*names: Optional[str]) -> Optional[str]:
+    """Return the first known family contained in any of the names (model, command, tool)."""
+    for name in names:
+        if not name:
+            continue
+        lowered = name.lower()
+        for family in TOKEN_RATIOS:
+            if family in lowered:
+                return family
+    return None
+
+
+def estimate_tokens(text: str, family: Optional[str] = None) -> int:
+    """Approximate token count of ``text`` for a model family (unknown families use DEFAULT_RATIO)."""
+    ratio = TOKEN_RATIOS.get(family or "", DEFAULT_RATIO)
+    ascii_chars = len(text.encode("ascii", "ignore"))
+    other_chars = len(text) - ascii_chars
+    return math.ceil(ascii_chars / ratio.ascii_chars_per_token) + math.ceil(other_chars / ratio.other_chars_per_token)
@@ -0,0 +1,140 @@
+"""History-driven tool selection.
+
+Tool selection reads the invocations recorded in the metrics store
+(``.cospec/metrics.db``) and derives per-tool statistics from them: p50/p95
+latency, success rate and the prompt sizes a tool has handled. Reviews are then
+assigned by these statistics instead of a uniform random choice.
+"""
+
+import random
+import statistics
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Dict, List, Optional, Sequence
+
+from cospec.core.metrics import percentile
+
+if TYPE_CHECKING:
+    from cospec.core.metrics import Invocation, MetricsStore
+
+# Most recent invocations considered per tool
+MAX_RUNS_PER_TOOL = 100
+# Tools with at least this many runs and a lower success rate are only used as a last resort
+MIN_RUNS_FOR_RELIABILITY = 3
+MIN_SUCCESS_RATE = 0.5
+
+POLICIES = ("fastest", "balanced", "diverse")
+
+
+@dataclass(frozen=True)
+class ToolStats:
+    """Aggregated history of a single tool."""
+
+    runs: int
+    successes: int
+    p50: Optional[float]
+    p95: Optional[float]
+    max_ok_prompt_bytes: int
+    min_failed_prompt_bytes: Optional[int]
+
+    @property
+    def success_rate(self) -> float:
+        return self.successes / self.runs if self.runs else 0.0
+
+    @property
+    def reliable(self) -> bool:
+        return self.runs < MIN_RUNS_FOR_RELIABILITY or self.success_rate >= MIN_SUCCESS_RATE
+
+    def handles(self, prompt_bytes: Optional[int]) -> bool:
+        """False if prompts this large have failed and never succeeded before."""
+        if prompt_bytes is None or self.min_failed_prompt_bytes is None:
+            return True
+        return prompt_bytes < self.min_failed_prompt_bytes or prompt_bytes <= self.max_ok_prompt_bytes
+
+
+def tool_stats(invocations: Sequence["Invocation"]) -> Optional[ToolStats]:
+    """Statistics of a tool's invocations (cache hits are ignored), or None if it has never been run."""
+    runs = [invocation for invocation in invocations if not invocation.cache_hit]
+    if not runs:
+        return None
+
+    ok_runs = [run for run in runs if run.ok]
+    failed_sizes = [run.prompt_bytes for run in runs if not run.ok]
+    durations = sorted(run.wall_time for run in ok_runs)
+    return ToolStats(
+        runs=len(runs),
+        successes=len(ok_runs),
+        p50=percentile(durations, 0.5) if durations else None,
+        p95=percentile(durations, 0.95) if durations else None,
+        max_ok_prompt_bytes=max((run.prompt_bytes for run in ok_runs), default=0),
+        min_failed_prompt_bytes=min(failed_sizes) if failed_sizes else None,
+    )
+
+
+def load_tool_stats(names: Sequence[str], store: Optional["MetricsStore"] = None) -> Dict[str, Optional[ToolStats]]:
+    """Statistics of each tool's most recent invocations in the metrics store."""
+    from cospec.core.metrics import get_metrics_store
+
+    store = store or get_metrics_store()
+    return {name: tool_stats(store.load(tool=name, limit=MAX_RUNS_PER_TOOL)) for name in names}
+
+
+def choose_tools(
+    candidates: Sequence[str],
+    count: int,
+    policy: str = "balanced",
+    store: Optional["MetricsStore"] = None,
+    prompt_bytes: Optional[int] = None,
+    rng: Optional[random.Random] = None,
+) -> List[str]:
+    """Pick up to ``count`` tools from ``candidates`` according to a selection policy.
+
+    Policies:
+        fastest: lowest p50 latency first (tools without history come after measured ones).
+        balanced: random, weighted by success rate divided by p50 latency.
+        diverse: uniform random choice, ignoring latency.
+
+    Tools that are unreliable or have failed on prompts of this size are only
+    used when there are not enough other candidates.
+    """
+    if policy not in POLICIES:
+        raise ValueError(f"Unknown tool selection policy '{policy}'. Choose from: {', '.join(POLICIES)}")
+
+    rng = rng or random.Random()
+    stats = load_tool_stats(candidates, store)
+
+    def suitable(name: str) -> bool:
+        measured = stats[name]
+        return measured is None or (measured.reliable and measured.handles(prompt_bytes))
+
+    def latency_key(name: str) -> tuple:
+        measured = stats[name]
+        p50 = measured.p50 if measured else None
+        return (p50 is None, p50 or 0.0, name)
+
+    preferred = [name for name in candidates if suitable(name)]
+    fallback = sorted((name for name in candidates if not suitable(name)), key=latency_key)
+
+    if policy == "fastest":
+        ordered = sorted(preferred, key=latency_key)
+    elif policy == "diverse":
+        ordered = rng.sample(preferred, len(preferred))
+    else:
+        known = [s.p50 for s in stats.values() if s and s.p50]
+        typical = statistics.median(known) if known else 1.0
+
+        def weight(name: str) -> float:
+            measured = stats[name]
+            if measured is None:
+                return 1.0 / typical
+            # Laplace smoothing keeps a single failure from excluding a tool entirely
+            success = (measured.successes + 1) / (measured.runs + 2)
+            return success / max(measured.p50 or typical, 1e-3)
+
+        ordered = []
+        remaining = list(preferred)
+        while remaining:
+            choice = rng.choices(remaining, weights=[weight(name) for name in remaining])[0]
+            ordered.append(choice)
+            remaining.remove(choice)
+
+    return (ordered + fallback)[:count]
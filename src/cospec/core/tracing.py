@@ -0,0 +1,145 @@
+"""Lightweight phase tracing with Chrome trace-event export.
+
+Spans are no-ops until tracing is started (``cospec --trace out.json <command>``), so
+instrumented code pays only a global lookup. The written file can be opened in
+``chrome://tracing`` or https://ui.perfetto.dev; spans from worker threads appear on
+their own tracks.
+"""
+
+import functools
+import json
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, TypeVar
+
+from cospec.core.fileutils import atomic_write_text
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+
+class Tracer:
+    """Collects completed spans as Chrome trace "complete" (``ph: X``) events."""
+
+    def __init__(self) -> None:
+        self._origin = time.perf_counter_ns()
+        self._events: List[Dict[str, Any]] = []
+        self._threads: Dict[int, str] = {}
+        self._lock = threading.Lock()
+
+    def complete(self, name: str, start_ns: int, end_ns: int, args: Dict[str, Any]) -> None:
+        """Record a finished span."""
+        tid = threading.get_ident()
+        event = {
+            "name": name,
+            "cat": "cospec",
+            "ph": "X",
+            "ts": (start_ns - self._origin) / 1000,
+            "dur": (end_ns - start_ns) / 1000,
+            "pid": os.getpid(),
+            "tid": tid,
+        }
+        if args:
+            event["args"] = args
+        with self._lock:
+            self._events.append(event)
+            if tid not in self._threads:
+                self._threads[tid] = threading.current_thread().name
+
+    @property
+    def events(self) -> List[Dict[str, Any]]:
+        """Recorded span events plus process and thread name metadata."""
+        pid = os.getpid()
+        with self._lock:
+            metadata = [{"name": "process_name", "ph": "M", "pid": pid, "args": {"name": "cospec"}}]
+            metadata.extend(
+                {"name": "thread_name", "ph": "M", "pid": pid, "tid": tid, "args": {"name": name}}
+                for tid, name in self._threads.items()
+            )
+            return metadata + list(self._events)
+
+    def write(self, path: Path) -> None:
+        """Write the trace as a Chrome trace-event JSON file."""
+        atomic_write_text(path, json.dumps({"traceEvents": self.events, "displayTimeUnit": "ms"}))
+
+
+class _Span:
+    __slots__ = ("tracer", "name", "args", "start")
+
+    def __init__(self, tracer: Tracer, name: str, args: Dict[str, Any]):
+        self.tracer = tracer
+        self.name = name
+        self.args = args
+        self.start = 0
+
+    def __enter__(self) -> "_Span":
+        self.start = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, exc_type: Any, exc: Any, tb: Any) -> None:
+        if exc_type is not None:
+            self.args["error"] = exc_type.__name__
+        self.tracer.complete(self.name, self.start, time.perf_counter_ns(), self.args)
+
+    def set(self, **args: Any) -> None:
+        """Attach values known only inside the span (e.g. output size)."""
+        self.args.update(args)
+
+
+class _NullSpan:
+    __slots__ = ()
+
+    def __enter__(self) -> "_NullSpan":
+        return self
+
+    def __exit__(self, exc_type: Any, exc: Any, tb: Any) -> None:
+        return None
+
+    def set(self, **args: Any) -> None:
+        return None
+
+
+_NULL_SPAN = _NullSpan()
+_tracer: Optional[Tracer] = None
+
+
+def span(name: str, **args: Any) -> Any:
+    """Context manager timing a phase; ``args`` are shown in the trace viewer."""
+    tracer = _tracer
+    if tracer is None:
+        return _NULL_SPAN
+    return _Span(tracer, name, args)
+
+
+def traced(name: str) -> Callable[[F], F]:
+    """Decorator wrapping every call of a function in a span."""
+
+    def decorator(func: F) -> F:
+        @functools.wraps(func)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            tracer = _tracer
+            if tracer is None:
+                return func(*args, **kwargs)
+            with _Span(tracer, name, {}):
+                return func(*args, **kwargs)
+
+        return wrapper  # type: ignore[return-value]
+
+    return decorator
+
+
+def start_tracing() -> Tracer:
+    """Start collecting spans (replacing any active tracer)."""
+    global _tracer
+    _tracer = Tracer()
+    return _tracer
+
+
+def stop_tracing(path: Optional[Path] = None) -> Optional[Tracer]:
+    """Stop collecting spans and write them to ``path`` if given; returns the stopped tracer."""
+    global _tracer
+    tracer, _tracer = _tracer, None
+    if tracer is not None and path is not None:
+        tracer.write(path)
+    return tracer
@@ -3,14 +3,17 @@ Dependency Injection module for cospec.
 
 This module provides:
 - Container: Singleton DI container for managing dependencies
+- Lifetime: Singleton, scoped and transient instance lifetimes
 - Registry: Component registration and discovery
 - Factories: Factory methods for creating component instances
 - BaseDeps: Base dependency container class
 - init_di(): Function to initialize the DI system
 """
 
+import threading
+
 from cospec.core.config import CospecConfig
-from cospec.dependencies.container import Container
+from cospec.dependencies.container import Container, Lifetime
 from cospec.dependencies.deps import AgentDeps, BaseDeps, CoreDeps
 from cospec.dependencies.factories import Factories
 from cospec.dependencies.registry import Registry
@@ -20,6 +23,7 @@ __all__ = [
     "CoreDeps",
     "AgentDeps",
     "Container",
+    "Lifetime",
     "Registry",
     "Factories",
     "DependencyManager",
@@ -31,26 +35,34 @@ class DependencyManager:
 
     _initialized: bool = False
     _container: Container = Container()
+    _lock = threading.Lock()
 
     @classmethod
     def initialize(cls, config: CospecConfig) -> None:
         """Initialize the dependency injection system."""
-        if cls._initialized:
-            return
+        with cls._lock:
+            if cls._initialized:
+                return
+
+            # Register core components
+            Factories.register_core_components(cls._container, config)
+
+            # Register agent components
+            Factories.register_agent_components(cls._container, config)
 
-        # Register core components
-        Factories.register_core_components(cls._container, config)
+            # Register LLM connectors (CLI subprocess and in-process)
+            Factories.register_connectors(cls._container, config)
 
-        # Register agent components
-        Factories.register_agent_components(cls._container, config)
+            # Resolve lifetimes once so that later resolves are plain lookups
+            cls._container.compile()
 
-        cls._initialized = True
+            cls._initialized = True
 
     @classmethod
     def get_container(cls) -> Container:
-        """Get the dependency injection container."""
+        """Get the dependency injection container, initializing it from the project config on first use."""
         if not cls._initialized:
-            raise RuntimeError("Dependency injection system not initialized. Call initialize() first.")
+            cls.initialize(CospecConfig.load_config())
         return cls._container
 
     @classmethod
@@ -61,8 +73,9 @@ class DependencyManager:
     @classmethod
     def reset(cls) -> None:
         """Reset the dependency injection system (for testing)."""
-        cls._container.reset()
-        cls._initialized = False
+        with cls._lock:
+            cls._container.reset()
+            cls._initialized = False
 
     @classmethod
     def is_initialized(cls) -> bool:
@@ -1,50 +1,249 @@
-from typing import Any, Callable, Dict, Optional, Type
+import contextlib
+import contextvars
+import enum
+import functools
+import inspect
+import threading
+import types
+import typing
+from typing import Any, Callable, Dict, Iterator, Optional, Tuple, Type
 
 from cospec.core.config import CospecConfig
 from cospec.core.interfaces import LLMInterface
 
 ConnectorRegistryType = Dict[str, Callable[[CospecConfig], LLMInterface]]
+Resolver = Callable[[], Any]
+
+_MISSING = object()
+
+
+class Lifetime(str, enum.Enum):
+    """How long a resolved instance lives."""
+
+    SINGLETON = "singleton"  # one instance per container, built lazily on first resolve
+    SCOPED = "scoped"  # one instance per Container.scope() (e.g. per command)
+    TRANSIENT = "transient"  # a new instance on every resolve
+
+
+class Dependency(typing.NamedTuple):
+    """A constructor or factory parameter that the container can inject."""
+
+    name: str
+    interface: Any
+    required: bool
+
+
+@functools.lru_cache(maxsize=None)
+def injection_plan(factory: Callable[..., Any]) -> Tuple[Dependency, ...]:
+    """Return the injectable parameters of a factory or class, introspected once per callable.
+
+    A parameter is injectable when it is annotated with a class (``Optional[X]`` is
+    unwrapped to ``X``); builtins such as ``str`` or ``int`` are plain values, and
+    string annotations that cannot be resolved are skipped.
+    """
+    target = factory.__init__ if inspect.isclass(factory) else factory
+    try:
+        hints = typing.get_type_hints(target)
+    except (NameError, TypeError):
+        # Annotations referring to TYPE_CHECKING-only imports: fall back to the resolvable ones
+        hints = {}
+    try:
+        parameters = inspect.signature(factory).parameters.values()
+    except (TypeError, ValueError):
+        return ()
+
+    dependencies = []
+    for parameter in parameters:
+        if parameter.kind in (inspect.Parameter.VAR_POSITIONAL, inspect.Parameter.VAR_KEYWORD):
+            continue
+        annotation = hints.get(parameter.name, parameter.annotation)
+        args = [arg for arg in typing.get_args(annotation) if arg is not type(None)]
+        if typing.get_origin(annotation) in (typing.Union, types.UnionType) and len(args) == 1:
+            annotation = args[0]
+        if inspect.isclass(annotation) and annotation.__module__ != "builtins":
+            dependencies.append(Dependency(parameter.name, annotation, parameter.default is inspect.Parameter.empty))
+    return tuple(dependencies)
+
+
+# Instances of the innermost active scope (None outside of any scope)
+_current_scope: contextvars.ContextVar[Optional[Dict[Type, Any]]] = contextvars.ContextVar(
+    "cospec_di_scope", default=None
+)
 
 
 class Container:
     _instance: Optional["Container"] = None
+    _instance_lock = threading.Lock()
     _factories: Dict[Type, Callable[..., Any]]
+    _lifetimes: Dict[Type, Lifetime]
     _instances: Dict[Type, Any]
+    _plan: Optional[Dict[Type, Resolver]]
+    _lock: threading.RLock
     _LLM_connectors: ConnectorRegistryType
 
     def __new__(cls):
         if cls._instance is None:
-            cls._instance = super(Container, cls).__new__(cls)
-            cls._instance._factories = {}
-            cls._instance._instances = {}
-            cls._instance._LLM_connectors = {}
+            with cls._instance_lock:
+                if cls._instance is None:
+                    instance = super(Container, cls).__new__(cls)
+                    instance._factories = {}
+                    instance._lifetimes = {}
+                    instance._instances = {}
+                    instance._plan = None
+                    instance._lock = threading.RLock()
+                    instance._LLM_connectors = {}
+                    cls._instance = instance
         return cls._instance
 
-    def register_factory(self, interface: Type, factory: Callable[..., Any]) -> None:
-        """Register a factory for a specific interface."""
-        self._factories[interface] = factory
+    def register_factory(
+        self, interface: Type, factory: Callable[..., Any], lifetime: Optional[Lifetime] = None
+    ) -> None:
+        """Register a factory for a specific interface.
+
+        Without an explicit lifetime, factories named ``*_singleton`` are singletons
+        and all others are transient.
+        """
+        if lifetime is None:
+            lifetime = Lifetime.SINGLETON if factory.__name__.endswith("_singleton") else Lifetime.TRANSIENT
+        with self._lock:
+            self._factories[interface] = factory
+            self._lifetimes[interface] = lifetime
+            self._instances.pop(interface, None)
+            self._plan = None
 
     def register_singleton(self, interface: Type, instance: Any) -> None:
         """Register a singleton instance for a specific interface."""
-        self._instances[interface] = instance
+        with self._lock:
+            self._factories.pop(interface, None)
+            self._lifetimes[interface] = Lifetime.SINGLETON
+            self._instances[interface] = instance
+            self._plan = None
 
     def register_connector(self, tool_name: str, connector: Callable[[CospecConfig], LLMInterface]) -> None:
         """Register an LLM connector factory for a specific tool."""
         self._LLM_connectors[tool_name] = connector
 
+    def compile(self) -> None:
+        """Build the resolution plan: one resolver per interface, chosen by its lifetime.
+
+        Factory parameters annotated with registered interfaces are wired in here, so
+        resolving never inspects signatures. Called by ``init_di`` after registration;
+        registering again invalidates the plan and it is rebuilt on the next resolve.
+        """
+        self._build_plan()
+
+    def _build_plan(self) -> Dict[Type, Resolver]:
+        with self._lock:
+            plan: Dict[Type, Resolver] = {}
+            for interface, lifetime in self._lifetimes.items():
+                if interface in self._instances:
+                    plan[interface] = self._constant(self._instances[interface])
+                    continue
+                factory = self._autowire(self._factories[interface])
+                if lifetime is Lifetime.SINGLETON:
+                    plan[interface] = self._singleton_resolver(interface, factory)
+                elif lifetime is Lifetime.SCOPED:
+                    plan[interface] = self._scoped_resolver(interface, factory)
+                else:
+                    plan[interface] = factory
+            self._plan = plan
+            return plan
+
+    def _autowire(self, factory: Callable[..., Any], **overrides: Any) -> Resolver:
+        """Bind a factory's injectable parameters to container resolves.
+
+        Optional parameters are injected only when their interface is registered;
+        required ones always are, so a missing registration fails at resolve time.
+        """
+        wired = [
+            (dependency.name, dependency.interface)
+            for dependency in injection_plan(factory)
+            if dependency.name not in overrides and (dependency.required or dependency.interface in self._lifetimes)
+        ]
+        if not wired and not overrides:
+            return factory
+
+        resolve = self.resolve
+
+        def create() -> Any:
+            kwargs = {name: resolve(interface) for name, interface in wired}
+            return factory(**kwargs, **overrides)
+
+        return create
+
+    def build(self, factory: Callable[..., Any], **overrides: Any) -> Any:
+        """Construct an unregistered class (or call a factory) with its dependencies injected.
+
+        ``overrides`` are passed as-is; e.g. ``build(ReviewerAgent, tool_name="qwen")``.
+        """
+        return self._autowire(factory, **overrides)()
+
+    @staticmethod
+    def _constant(instance: Any) -> Resolver:
+        return lambda: instance
+
+    def _singleton_resolver(self, interface: Type, factory: Callable[..., Any]) -> Resolver:
+        def resolve_singleton() -> Any:
+            instance = self._instances.get(interface, _MISSING)
+            if instance is _MISSING:
+                # Double-checked locking: concurrent first resolves build the instance only once
+                with self._lock:
+                    instance = self._instances.get(interface, _MISSING)
+                    if instance is _MISSING:
+                        instance = factory()
+                        self._instances[interface] = instance
+                    if self._plan is not None:
+                        # Later resolves skip this function and the lock entirely
+                        self._plan[interface] = self._constant(instance)
+            return instance
+
+        return resolve_singleton
+
+    @staticmethod
+    def _scoped_resolver(interface: Type, factory: Callable[..., Any]) -> Resolver:
+        def resolve_scoped() -> Any:
+            scope = _current_scope.get()
+            if scope is None:
+                # Outside of a scope there is nothing to share the instance with
+                return factory()
+            if interface not in scope:
+                scope[interface] = factory()
+            return scope[interface]
+
+        return resolve_scoped
+
+    @contextlib.contextmanager
+    def scope(self) -> Iterator[None]:
+        """Share scoped instances within the block (e.g. one command).
+
+        Scopes are tracked per thread and per asyncio task, so concurrent agents
+        each get their own scoped instances.
+        """
+        token = _current_scope.set({})
+        try:
+            yield
+        finally:
+            _current_scope.reset(token)
+
     def resolve(self, interface: Type) -> Any:
         """Resolve an instance for a specific interface."""
-        if interface in self._instances:
-            return self._instances[interface]
-
-        if interface in self._factories:
-            factory = self._factories[interface]
-            instance = factory()
-            if factory.__name__.endswith("_singleton"):
-                self._instances[interface] = instance
-            return instance
+        plan = self._plan
+        if plan is None:
+            plan = self._build_plan()
+
+        resolver = plan.get(interface)
+        if resolver is None:
+            raise ValueError(f"No factory or instance registered for {interface}")
+        return resolver()
+
+    def resolve_optional(self, interface: Type, default: Any = None) -> Any:
+        """Resolve an instance, or return ``default`` if the interface is not registered."""
+        plan = self._plan
+        if plan is None:
+            plan = self._build_plan()
 
-        raise ValueError(f"No factory or instance registered for {interface}")
+        resolver = plan.get(interface)
+        return default if resolver is None else resolver()
 
     def resolve_connector(self, tool_name: str, config: CospecConfig) -> LLMInterface:
         """Resolve an LLM connector instance for a specific tool."""
@@ -58,6 +257,9 @@ class Container:
 
     def reset(self) -> None:
         """Reset the container (primarily for testing)."""
-        self._factories.clear()
-        self._instances.clear()
-        self._LLM_connectors.clear()
+        with self._lock:
+            self._factories.clear()
+            self._lifetimes.clear()
+            self._instances.clear()
+            self._plan = None
+            self._LLM_connectors.clear()
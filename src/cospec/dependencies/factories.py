@@ -1,5 +1,8 @@
+from pathlib import Path
 from typing import Optional
 
+from rich.console import Console
+
 from cospec.agents.base import BaseAgent
 from cospec.agents.hearer import HearerAgent
 from cospec.agents.reviewer import ReviewerAgent
@@ -13,15 +16,18 @@ from cospec.core.adapters import (
     YamlTemplateRenderer,
 )
 from cospec.core.config import CospecConfig
+from cospec.core.exceptions import ConfigurationError
 from cospec.core.interfaces import (
     AnalyzerInterface,
     ConfigInterface,
     ExceptionHandlerInterface,
     FormatterInterface,
+    LLMInterface,
     LoggerInterface,
     TemplateRendererInterface,
 )
-from cospec.dependencies.container import Container
+from cospec.dependencies.container import Container, Lifetime
+from cospec.dependencies.deps import BaseDeps
 
 
 class Factories:
@@ -33,20 +39,36 @@ class Factories:
         return FileConfig(config)
 
     @staticmethod
-    def create_logger_singleton() -> LoggerInterface:
-        """Create a singleton logger instance."""
-        return ConsoleLogger()
+    def create_console_singleton() -> Console:
+        """Create the console shared by the logger and formatter (stderr, so command output on stdout stays clean)."""
+        return Console(stderr=True)
 
     @staticmethod
-    def create_formatter() -> FormatterInterface:
+    def create_logger_singleton(
+        config: Optional[CospecConfig] = None, console: Optional[Console] = None
+    ) -> LoggerInterface:
+        """Create a singleton logger instance (selected by ``log_format``: console or json)."""
+        if config is None:
+            return ConsoleLogger(console)
+        if config.log_format == "json":
+            from cospec.core.jsonlog import JsonLineWriter, JsonLogger, level_number
+
+            # Reject an unknown level before the writer thread is started
+            level_number(config.log_level)
+            writer = JsonLineWriter(Path(config.log_file) if config.log_file else None)
+            return JsonLogger(writer, level=config.log_level)
+        if config.log_format != "console":
+            raise ConfigurationError(f"Unknown log format '{config.log_format}'. Choose from: console, json")
+        return ConsoleLogger(console, level=config.log_level)
+
+    @staticmethod
+    def create_formatter(console: Optional[Console] = None) -> FormatterInterface:
         """Create a formatter instance."""
-        return RichFormatter()
+        return RichFormatter(console)
 
     @staticmethod
-    def create_exception_handler(logger: Optional[LoggerInterface] = None) -> ExceptionHandlerInterface:
+    def create_exception_handler(logger: LoggerInterface) -> ExceptionHandlerInterface:
         """Create an exception handler instance."""
-        if logger is None:
-            logger = Container().resolve(LoggerInterface)
         return GenericExceptionHandler(logger)
 
     @staticmethod
@@ -55,10 +77,8 @@ class Factories:
         return YamlTemplateRenderer()
 
     @staticmethod
-    def create_analyzer(config: Optional[ConfigInterface] = None) -> AnalyzerInterface:
+    def create_analyzer(config: CospecConfig) -> AnalyzerInterface:
         """Create a project analyzer instance."""
-        if config is None:
-            config = Container().resolve(ConfigInterface)
         return ProjectAnalyzer(config)
 
     @staticmethod
@@ -83,30 +103,41 @@ class Factories:
 
     @staticmethod
     def register_core_components(container: Container, config: CospecConfig) -> None:
-        """Register all core components in the container."""
+        """Register all core components in the container.
+
+        Factory parameters annotated with registered types (e.g. ``logger: LoggerInterface``)
+        are injected by the container.
+        """
+        container.register_singleton(CospecConfig, config)
         container.register_singleton(ConfigInterface, Factories.create_config_singleton(config))
-        container.register_singleton(LoggerInterface, Factories.create_logger_singleton())
-        container.register_factory(FormatterInterface, Factories.create_formatter)
-        container.register_factory(TemplateRendererInterface, Factories.create_template_renderer)
-        container.register_factory(AnalyzerInterface, Factories.create_analyzer)
+        container.register_factory(Console, Factories.create_console_singleton, Lifetime.SINGLETON)
+        container.register_factory(LoggerInterface, Factories.create_logger_singleton, Lifetime.SINGLETON)
+        container.register_factory(ExceptionHandlerInterface, Factories.create_exception_handler, Lifetime.SINGLETON)
+        container.register_factory(FormatterInterface, Factories.create_formatter, Lifetime.TRANSIENT)
+        container.register_factory(TemplateRendererInterface, Factories.create_template_renderer, Lifetime.SINGLETON)
+        container.register_factory(AnalyzerInterface, Factories.create_analyzer, Lifetime.SCOPED)
+        # The logger, exception handler, ... handed to the agents of one command
+        container.register_factory(BaseDeps, BaseDeps, Lifetime.SCOPED)
 
     @staticmethod
-    def register_agent_components(container: Container, config: CospecConfig) -> None:
-        """Register agent components in the container."""
-
-        def _create_base_agent(tool_name: Optional[str] = None) -> BaseAgent:
-            return Factories.create_base_agent(config, tool_name)
+    def register_connectors(container: Container, config: CospecConfig) -> None:
+        """Register an LLM connector for every configured tool."""
+        from cospec.core.connectors import create_connector
 
-        def _create_reviewer(tool_name: Optional[str] = None) -> ReviewerAgent:
-            return Factories.create_reviewer_agent(config, tool_name)
+        for tool_name in config.tools:
 
-        def _create_hearer(tool_name: Optional[str] = None) -> HearerAgent:
-            return Factories.create_hearer_agent(config, tool_name)
+            def _create_connector(cfg: CospecConfig, name: str = tool_name) -> LLMInterface:
+                return create_connector(name, cfg)
 
-        def _create_test_gen(tool_name: Optional[str] = None) -> TestGeneratorAgent:
-            return Factories.create_test_generator_agent(config, tool_name)
+            container.register_connector(tool_name, _create_connector)
 
-        container.register_factory(BaseAgent, _create_base_agent)
-        container.register_factory(ReviewerAgent, _create_reviewer)
-        container.register_factory(HearerAgent, _create_hearer)
-        container.register_factory(TestGeneratorAgent, _create_test_gen)
+    @staticmethod
+    def register_agent_components(container: Container, config: CospecConfig) -> None:
+        """Register agent components in the container.
+
+        Their ``config`` is injected from the CospecConfig registered by ``register_core_components``.
+        """
+        container.register_factory(BaseAgent, Factories.create_base_agent)
+        container.register_factory(ReviewerAgent, Factories.create_reviewer_agent)
+        container.register_factory(HearerAgent, Factories.create_hearer_agent)
+        container.register_factory(TestGeneratorAgent, Factories.create_test_generator_agent)
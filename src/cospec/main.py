@@ -1,21 +1,47 @@
+import contextlib
+import contextvars
 import datetime
+import importlib
+import os
+import sys
 from pathlib import Path
-from typing import Optional
+from typing import TYPE_CHECKING, Any, Dict, Iterable, Iterator, List, Optional, Type, TypeVar
 
 import typer
 
-from cospec.agents.hearer import HearerAgent
-from cospec.agents.reviewer import ReviewerAgent
-from cospec.agents.test_generator import TestGeneratorAgent
 from cospec.core.adapters import RichConsole, StandardFilesystem, SubprocessManager, TyperCLI
-from cospec.core.config import CospecConfig, ToolConfig
 from cospec.core.exceptions import (
     CospecError,
     PromptTemplateError,
     SpecNotFoundError,
     ToolExecutionError,
 )
-from cospec.dependencies import init_di
+
+if TYPE_CHECKING:
+    from cospec.agents.base import BaseAgent
+    from cospec.agents.test_generator import TestGeneratorAgent
+    from cospec.core.config import CospecConfig
+    from cospec.dependencies import Container
+
+# Heavy dependencies (agents, pydantic-settings config, DI) are imported inside the commands that need them,
+# so `cospec --help` and `cospec status` start fast. They stay reachable as module attributes (PEP 562).
+_LAZY_IMPORTS = {
+    "CospecConfig": "cospec.core.config",
+    "ToolConfig": "cospec.core.config",
+    "HearerAgent": "cospec.agents.hearer",
+    "ReviewerAgent": "cospec.agents.reviewer",
+    "TestGeneratorAgent": "cospec.agents.test_generator",
+}
+
+
+def __getattr__(name: str) -> Any:
+    """Resolve lazily imported names on first attribute access."""
+    module_name = _LAZY_IMPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module_name), name)
+    globals()[name] = value
+    return value
 
 
 def _analyze_help_output(help_output: str, command: str) -> list[str]:
@@ -38,24 +64,104 @@ def _analyze_help_output(help_output: str, command: str) -> list[str]:
     return args
 
 
+# Resources of the running command (closed when it finishes) and whether its container scope is entered
+_command_resources: contextvars.ContextVar[Optional[contextlib.ExitStack]] = contextvars.ContextVar(
+    "cospec_command_resources", default=None
+)
+_command_scoped: contextvars.ContextVar[bool] = contextvars.ContextVar("cospec_command_scoped", default=False)
+
 app = TyperCLI()
 agent_app = TyperCLI()
 app.add_typer(agent_app, name="agent")
+reports_app = TyperCLI(help="Search and browse stored review reports.")
+app.add_typer(reports_app, name="reports")
 console = RichConsole()
 
 
-def _initialize_di():
-    """Initialize dependency injection system."""
-    try:
-        config = CospecConfig()
-        init_di(config)
-    except Exception as e:
-        # Log initialization error but don't fail app startup
-        console.error(f"DI initialization warning: {e}")
+@app.callback()
+def main(
+    ctx: typer.Context,
+    trace: Optional[str] = typer.Option(
+        None, "--trace", help="Write a Chrome trace-event file (chrome://tracing, Perfetto) of the command's phases"
+    ),
+    profile: Optional[str] = typer.Option(
+        None,
+        "--profile",
+        help="Profile the command: cpu (cProfile) or mem (tracemalloc); reports go to .cospec/profiles/",
+    ),
+) -> None:
+    """
+    cospec: specification-driven development with AI-Agents.
+    """
+    _command_resources.set(ctx.with_resource(contextlib.ExitStack()))
+    _command_scoped.set(False)
+
+    if trace is not None:
+        from cospec.core.tracing import start_tracing, stop_tracing
+
+        start_tracing()
+        # Runs after the command, also when it exits with an error
+        ctx.call_on_close(lambda: stop_tracing(Path(trace)))
+
+    if profile is not None:
+        from cospec.core.profiling import PROFILE_MODES, start_profiling
+
+        if profile not in PROFILE_MODES:
+            console.print(
+                f"[red]Error:[/red] Unknown profile mode '{profile}'. Choose from: {', '.join(PROFILE_MODES)}"
+            )
+            raise typer.Exit(code=1)
+
+        start_profiling(profile)
+        ctx.call_on_close(lambda: _report_profile(ctx.invoked_subcommand or "cospec"))
+
+
+def _report_profile(command: str) -> None:
+    """Write the profile of the finished command and print its summary to stderr."""
+    from cospec.core.profiling import stop_profiling
 
+    result = stop_profiling(command)
+    if result is None:
+        return
+    path, summary = result
+    # stderr keeps machine-readable stdout (e.g. test-gen --format jsonl) intact
+    report_console = RichConsole(stderr=True)
+    report_console.print(summary, markup=False, highlight=False)
+    report_console.print(f"[bold]Profile written to {path}[/bold]")
 
-# Initialize DI on module import
-_initialize_di()
+
+def _command_container(config: "CospecConfig") -> "Container":
+    """DI container of the running command, initialized from the command's config.
+
+    The first call enters a container scope that ends with the command, so scoped
+    components are shared by everything the command builds.
+    """
+    from cospec.core.config import CospecConfig
+    from cospec.dependencies import DependencyManager
+
+    if DependencyManager.is_initialized() and DependencyManager.resolve(CospecConfig) is not config:
+        # Registered for another config (an earlier command in the same process)
+        DependencyManager.reset()
+    DependencyManager.initialize(config)
+    container = DependencyManager.get_container()
+
+    resources = _command_resources.get()
+    if resources is not None and not _command_scoped.get():
+        _command_scoped.set(True)
+        resources.enter_context(container.scope())
+    return container
+
+
+AgentT = TypeVar("AgentT", bound="BaseAgent")
+
+
+def _command_agent(config: "CospecConfig", agent_class: Type[AgentT], tool_name: Optional[str]) -> AgentT:
+    """Build a command's agent with the container's logger and exception handler (see ``log_format``)."""
+    from cospec.dependencies import BaseDeps
+
+    container = _command_container(config)
+    agent: AgentT = container.build(agent_class, tool_name=tool_name, deps=container.resolve(BaseDeps))
+    return agent
 
 
 @app.command()
@@ -161,40 +267,107 @@ def status() -> None:
 
 
 @app.command()
-def review(tool: Optional[str] = typer.Option(None, help="Tool to use (qwen, opencode)")) -> None:
+def review(
+    tool: Optional[str] = typer.Option(None, help="Tool to use (qwen, opencode)"),
+    policy: str = typer.Option(
+        "balanced", help="Tool selection policy based on past runs: fastest, balanced or diverse"
+    ),
+    auto_shard: bool = typer.Option(
+        True, "--auto-shard/--no-auto-shard", help="Split prompts over a tool's token limit into several reviews"
+    ),
+) -> None:
     """
     Review codebase against documentation using an AI agent.
     """
+    from cospec.core.tool_history import POLICIES
+
+    if policy not in POLICIES:
+        console.print(f"[red]Error:[/red] Unknown policy '{policy}'. Choose from: {', '.join(POLICIES)}")
+        raise typer.Exit(code=1)
+
     console.print("[bold blue]Reviewing project...[/bold blue]")
 
     try:
+        import sqlite3
+
+        from cospec.agents.reviewer import ReviewerAgent
+        from cospec.core.config import CospecConfig
+        from cospec.core.fileutils import atomic_write_text, atomic_writer
+        from cospec.core.reports import ingest_report
+        from cospec.core.tracing import span
+
         # 1. Load Config
         config = CospecConfig.load_config()
 
-        # 2. Determine tools to use
+        # 2. Build the prompt once; its size steers the tool selection
+        prompt = ReviewerAgent.build_review_prompt()
+
+        # 3. Determine tools to use
         if tool:
             tools_to_use = [tool]
         else:
-            tools_to_use = config.select_review_tools()
+            tools_to_use = config.select_review_tools(policy=policy, prompt_bytes=len(prompt.encode("utf-8")))
             if len(tools_to_use) > 1:
-                console.print(f"[yellow]Using {len(tools_to_use)} different tools for diverse review[/yellow]")
+                console.print(
+                    f"[yellow]Using {len(tools_to_use)} different tools for diverse review (policy: {policy})[/yellow]"
+                )
             else:
                 console.print("[yellow]Only 1 tool available for review[/yellow]")
 
-        # 3. Run reviews
+        # 4. Run reviews
         reports = []
         for tool_name in tools_to_use:
             console.print(f"Running {tool_name} (Language: {config.language})...")
-            agent = ReviewerAgent(config, tool_name=tool_name)
-            report_content = agent.review_project()
+            agent = _command_agent(config, ReviewerAgent, tool_name)
 
             date_str = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
             report_path = Path(f"docs/review_{date_str}_{tool_name}.md")
-            report_path.write_text(report_content, encoding="utf-8")
+
+            prompts, check = agent.plan_review(prompt, auto_shard=auto_shard)
+            console.print(f"[dim]Preflight {check.describe()}[/dim]")
+            if len(prompts) > 1:
+                console.print(
+                    f"[yellow]Prompt exceeds the {tool_name} limit; reviewing in {len(prompts)} parts[/yellow]"
+                )
+            elif check.over_limit:
+                console.print(
+                    f"[yellow]Warning:[/yellow] Prompt exceeds the {tool_name} limit "
+                    "and may be truncated or rejected (use --auto-shard to split it)"
+                )
+
+            if agent.tool_config.type == "cli" or len(prompts) > 1:
+                report_content = agent.review_prompts(prompts)
+                with span("write_report", path=str(report_path), chars=len(report_content)):
+                    atomic_write_text(report_path, report_content)
+            else:
+                # Stream tokens into the report and the console as they arrive
+                # Streamed into a temp file that only replaces the report once the stream completes,
+                # so a failure partway never leaves (or indexes) a truncated report
+                stream = agent.stream_review(prompts[0])
+                with (
+                    span("stream_report", path=str(report_path)),
+                    atomic_writer(report_path) as report_file,
+                ):
+                    for chunk in stream:
+                        report_file.write(chunk)
+                        console.print(chunk, end="", markup=False, highlight=False)
+                console.print()
+                if stream.stats.first_token_latency is not None:
+                    console.print(
+                        f"[dim]First token: {stream.stats.first_token_latency:.2f}s, "
+                        f"{stream.stats.tokens_per_sec:.1f} tokens/s[/dim]"
+                    )
+
+            try:
+                with span("ingest_report", path=str(report_path)):
+                    ingest_report(report_path, tool_name, prompt)
+            except (OSError, sqlite3.Error) as e:
+                console.print(f"[yellow]Warning:[/yellow] Failed to index the report: {e}")
+
             reports.append((tool_name, report_path))
             console.print(f"[green]Review with {tool_name} complete![/green] Report saved to: {report_path}\n")
 
-        # 4. Summary
+        # 5. Summary
         console.print("[bold blue]Review Summary:[/bold blue]")
         for tool_name, report_path in reports:
             console.print(f"  • {tool_name}: {report_path}")
@@ -205,7 +378,15 @@ def review(tool: Optional[str] = typer.Option(None, help="Tool to use (qwen, ope
 
 
 @app.command()
-def hear(output: Optional[Path] = None) -> None:
+def hear(
+    output: Optional[Path] = None,
+    focused: bool = typer.Option(
+        False, help="Embed only the spec sections, docs and source files related to the unclear points"
+    ),
+    since: Optional[str] = typer.Option(
+        None, help="Only hear about SPEC.md sections changed since a snapshot id, 'last', a file or a git ref"
+    ),
+) -> None:
     """
     Generate a mission prompt for an AI agent to conduct a hearing.
 
@@ -216,14 +397,30 @@ def hear(output: Optional[Path] = None) -> None:
     console.print("[bold blue]Generating mission prompt for AI Agent...[/bold blue]")
 
     try:
+        from cospec.agents.hearer import HearerAgent
+        from cospec.core.config import CospecConfig
+
         # 1. Load Config
         config = CospecConfig.load_config()
 
-        # 2. Initialize Agent (Tool name is irrelevant for prompt generation)
-        agent = HearerAgent(config)
+        # 2. Initialize Agent (the development tool is only used for the preflight estimate)
+        agent = _command_agent(config, HearerAgent, config.select_tool_for_development())
 
         # 3. Generate Prompt
-        prompt = agent.create_mission_prompt()
+        if since:
+            delta_prompt = agent.create_delta_mission_prompt(since)
+            if delta_prompt is None:
+                console.print(f"[green]No SPEC.md changes since {since}.[/green]")
+                return
+            prompt = delta_prompt
+        else:
+            prompt = agent.create_mission_prompt(focused=focused)
+
+        check = agent.preflight(prompt)
+        console.print(f"[dim]Preflight {check.describe()}[/dim]")
+        if check.over_limit:
+            hint = "" if focused else " (try --focused)"
+            console.print(f"[yellow]Warning:[/yellow] Mission prompt exceeds the {check.tool} limit{hint}")
 
         # 4. Output Result
         if output:
@@ -250,13 +447,37 @@ def hear(output: Optional[Path] = None) -> None:
 
 
 @app.command()
-def test_gen(tool: Optional[str] = None, output: Optional[Path] = None, validate: bool = False) -> None:
+def test_gen(
+    tool: Optional[str] = None,
+    output: Optional[Path] = None,
+    validate: bool = False,
+    implement: bool = typer.Option(False, help="Ask the tool to implement each feature's test bodies"),
+    dedupe: bool = typer.Option(True, "--dedupe/--no-dedupe", help="Merge near-duplicate scenarios"),
+    parametrize: bool = typer.Option(
+        False, help="Group scenarios of the same type into parametrized tests marked by priority"
+    ),
+    output_format: str = typer.Option("text", "--format", help="Scenario output format: text or jsonl"),
+    scenarios_only: bool = typer.Option(False, help="Only extract scenarios; do not generate test files"),
+    scenarios_file: Optional[Path] = None,
+) -> None:
     """
     Generate test cases from specifications (Test-Driven Generation).
     """
-    console.print("[bold blue]Generating test cases from specifications...[/bold blue]")
+    if output_format not in ("text", "jsonl"):
+        console.print(f"[red]Error:[/red] Unknown format '{output_format}' (expected 'text' or 'jsonl')")
+        raise typer.Exit(code=1)
+    if validate and scenarios_only:
+        console.print("[red]Error:[/red] --validate checks generated test files; drop --scenarios-only")
+        raise typer.Exit(code=1)
+
+    # In JSONL mode stdout carries only scenario records, so progress messages go to stderr
+    status = RichConsole(stderr=True) if output_format == "jsonl" else console
+    status.print("[bold blue]Generating test cases from specifications...[/bold blue]")
 
     try:
+        from cospec.agents.test_generator import TestGeneratorAgent
+        from cospec.core.config import CospecConfig
+
         # 1. Load Config
         config = CospecConfig.load_config()
 
@@ -264,12 +485,37 @@ def test_gen(tool: Optional[str] = None, output: Optional[Path] = None, validate
         tool_name = tool or config.select_tool_for_development()
 
         # 3. Initialize Agent
-        agent = TestGeneratorAgent(config, tool_name=tool_name)
+        agent = _command_agent(config, TestGeneratorAgent, tool_name)
+
+        if output_format == "jsonl":
+            _stream_test_scenarios(
+                agent,
+                status,
+                scenarios_file=scenarios_file,
+                output_dir=None if scenarios_only else (output or Path("tests/generated/")),
+                dedupe=dedupe,
+                implement=implement,
+                parametrize=parametrize,
+                validate=validate,
+            )
+            return
+
+        if scenarios_only:
+            scenarios = list(agent.iter_scenarios(dedupe=dedupe))
+            console.print(f"[bold]Extracted {len(scenarios)} test scenarios:[/bold]")
+            for i, scenario in enumerate(scenarios, 1):
+                console.print(f"  {i}. [{scenario['priority']}] {scenario['description']}")
+            return
 
         console.print(f"Running {agent.tool_name} (Language: {config.language})...")
 
         # 2. Generate Tests
-        result = agent.generate_tests(output_dir=output if output else Path("tests/generated/"))
+        result = agent.generate_tests(
+            output_dir=output if output else Path("tests/generated/"),
+            implement=implement,
+            dedupe=dedupe,
+            parametrize=parametrize,
+        )
 
         if result["status"] == "error":
             console.print(f"[red]Error:[/red] {result['message']}")
@@ -285,20 +531,46 @@ def test_gen(tool: Optional[str] = None, output: Optional[Path] = None, validate
             for i, scenario in enumerate(result["scenarios"], 1):
                 console.print(f"  {i}. [{scenario['priority']}] {scenario['description']}")
 
+        if result["merged"]:
+            console.print(f"\n[bold]Merged {len(result['merged'])} near-duplicate scenarios:[/bold]")
+            for scenario in result["merged"]:
+                console.print(f"  • {scenario['description']} → {scenario['duplicate_of']}")
+
         # 5. Display generated test files
         if result["test_files"]:
             console.print(f"\n[bold]Generated {len(result['test_files'])} test files:[/bold]")
             for filename in result["test_files"].keys():
                 console.print(f"  • {filename}")
+            console.print(
+                f"Written: {len(result['written'])}, unchanged: {len(result['unchanged'])}, "
+                f"removed: {len(result['removed'])}"
+            )
+            for filename in result["removed"]:
+                console.print(f"  [yellow]Removed stale file[/yellow]: {filename}")
 
         # 6. Validate generated files if requested
         if validate and result["test_files"]:
+            from cospec.core.test_validation import validate_test_files
+
             console.print("\n[bold]Validating generated test files...[/bold]")
-            for filename, content in result["test_files"].items():
-                if "import pytest" in content and "def test_" in content:
-                    console.print(f"  ✓ {filename} - Valid pytest format")
-                else:
-                    console.print(f"  ✗ {filename} - Invalid format")
+            output_dir = Path(result["output_dir"])
+            report = validate_test_files([output_dir / name for name in result["test_files"]], collect_dir=output_dir)
+            for file_result in report.files:
+                filename = Path(file_result.path).name
+                if file_result.ok:
+                    console.print(f"  ✓ {filename}")
+                    continue
+                console.print(f"  ✗ {filename}")
+                if file_result.syntax_error:
+                    console.print(f"      Syntax error: {file_result.syntax_error}")
+                for test_id in file_result.duplicate_tests:
+                    console.print(f"      Duplicate test: {test_id}")
+                if file_result.collection_error:
+                    console.print("      pytest failed to collect this file")
+            if report.collect_output:
+                console.print(f"pytest collected {report.collected} tests")
+            if not report.ok:
+                raise typer.Exit(code=1)
 
         # 7. Save results summary
         if output:
@@ -315,17 +587,274 @@ Scenarios:
             summary_file.write_text(summary_content, encoding="utf-8")
             console.print(f"\n[green]Summary saved to:[/green] {summary_file}")
 
+    except typer.Exit:
+        raise
     except CospecError as e:
-        console.print(f"[red]Cospec Error:[/red] {e}")
+        status.print(f"[red]Cospec Error:[/red] {e}")
         raise typer.Exit(code=1) from e
     except ToolExecutionError as e:
-        console.print(f"[red]Tool Error:[/red] {e}")
+        status.print(f"[red]Tool Error:[/red] {e}")
         raise typer.Exit(code=1) from e
     except Exception as e:
-        console.print(f"[red]Unexpected Error:[/red] {e}")
+        status.print(f"[red]Unexpected Error:[/red] {e}")
         raise typer.Exit(code=1) from e
 
 
+def _collect_into(
+    items: Iterable[Dict[str, Any]], collected: List[Dict[str, Any]], merged: List[Dict[str, Any]]
+) -> Iterator[Dict[str, Any]]:
+    """Pass items through while keeping a copy of each, near-duplicates (``duplicate_of``) apart."""
+    for item in items:
+        (merged if "duplicate_of" in item else collected).append(item)
+        yield item
+
+
+def _stream_test_scenarios(
+    agent: "TestGeneratorAgent",
+    status: RichConsole,
+    scenarios_file: Optional[Path],
+    output_dir: Optional[Path],
+    dedupe: bool,
+    implement: bool,
+    parametrize: bool,
+    validate: bool = False,
+) -> None:
+    """Write scenarios as JSON Lines while they are extracted, then generate test files unless output_dir is None.
+
+    Merged near-duplicates are written as scenario records carrying ``duplicate_of``. With ``validate``,
+    one ``{"record": "validation", ...}`` line per generated file follows on stdout.
+    """
+    from cospec.agents.test_generator import write_scenarios_jsonl
+
+    collected: List[Dict[str, Any]] = []
+    merged: List[Dict[str, Any]] = []
+    scenarios = _collect_into(agent.iter_scenarios(dedupe=dedupe, include_merged=True), collected, merged)
+
+    if scenarios_file:
+        scenarios_file.parent.mkdir(parents=True, exist_ok=True)
+        with scenarios_file.open("w", encoding="utf-8") as f:
+            write_scenarios_jsonl(scenarios, f)
+        status.print(f"Wrote {len(collected)} scenarios ({len(merged)} merged near-duplicates) to {scenarios_file}")
+    else:
+        try:
+            write_scenarios_jsonl(scenarios, sys.stdout)
+        except BrokenPipeError:
+            # The reader (e.g. `head`) closed the pipe; silence the flush at interpreter exit
+            os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+            return
+        status.print(f"Extracted {len(collected)} scenarios ({len(merged)} merged near-duplicates)")
+
+    if output_dir is None or not collected:
+        return
+
+    test_files, report = agent.write_test_files(collected, output_dir, implement=implement, parametrize=parametrize)
+    status.print(
+        f"Generated {len(test_files)} test files in {output_dir} "
+        f"(written: {len(report.written)}, unchanged: {len(report.unchanged)}, removed: {len(report.removed)})"
+    )
+
+    if validate and test_files:
+        import dataclasses
+        import json
+
+        from cospec.core.test_validation import validate_test_files
+
+        validation = validate_test_files([output_dir / name for name in test_files], collect_dir=output_dir)
+        for file_result in validation.files:
+            record = {"record": "validation", "ok": file_result.ok, **dataclasses.asdict(file_result)}
+            sys.stdout.write(json.dumps(record, ensure_ascii=False) + "\n")
+        sys.stdout.flush()
+        if not validation.ok:
+            status.print("[red]Validation failed[/red]")
+            raise typer.Exit(code=1)
+
+
+@app.command()
+def stats(
+    days: int = typer.Option(30, help="Only include invocations from the last N days"),
+    tool: Optional[str] = typer.Option(None, help="Only show one tool"),
+) -> None:
+    """
+    Show per-tool latency, throughput and daily trends from .cospec/metrics.db.
+    """
+    import time
+
+    from rich.table import Table
+
+    from cospec.core.metrics import daily_trend, get_metrics_store, summarize
+
+    try:
+        invocations = get_metrics_store().load(since=time.time() - days * 86400, tool=tool)
+    except Exception as e:
+        console.print(f"[red]Error:[/red] Failed to read metrics: {e}")
+        raise typer.Exit(code=1) from e
+
+    if not invocations:
+        console.print(f"[yellow]No tool invocations recorded in the last {days} days[/yellow]")
+        return
+
+    table = Table(title=f"Tool invocations (last {days} days)")
+    for column in ("Tool", "Runs", "Failed", "Cache hits", "p50 (s)", "p95 (s)", "Prompt tokens/s", "Output KB/s"):
+        table.add_column(column, justify="left" if column == "Tool" else "right")
+    for summary in summarize(invocations):
+        table.add_row(
+            summary.tool,
+            str(summary.runs),
+            str(summary.failures),
+            str(summary.cache_hits),
+            f"{summary.p50:.2f}",
+            f"{summary.p95:.2f}",
+            f"{summary.prompt_tokens_per_sec:.0f}",
+            f"{summary.output_bytes_per_sec / 1024:.1f}",
+        )
+    console.print(table)
+
+    trend = Table(title="Daily trend (runs / median seconds)")
+    trend.add_column("Day")
+    trends = daily_trend(invocations)
+    tools = sorted(trends)
+    for name in tools:
+        trend.add_column(name, justify="right")
+    for day in sorted({day for per_day in trends.values() for day in per_day}):
+        cells = []
+        for name in tools:
+            point = trends[name].get(day)
+            cells.append(f"{point['runs']:.0f} / {point['p50']:.2f}" if point else "-")
+        trend.add_row(day, *cells)
+    console.print(trend)
+
+
+def _highlight(snippet: str) -> str:
+    """Escape a search snippet for Rich and render the matched terms in bold."""
+    from rich.markup import escape
+
+    from cospec.core.reports import MATCH_END, MATCH_START
+
+    return escape(snippet).replace(MATCH_START, "[bold yellow]").replace(MATCH_END, "[/bold yellow]")
+
+
+@reports_app.command(name="search")
+def search_reports(
+    query: str,
+    tool: Optional[str] = typer.Option(None, help="Only search reports of one tool"),
+    limit: int = typer.Option(20, help="Maximum number of findings to show"),
+) -> None:
+    """
+    Search the findings of stored review reports (full-text, all terms must match).
+    """
+    from rich.table import Table
+
+    from cospec.core.reports import ReportStore
+
+    try:
+        hits = ReportStore().search(query, tool=tool, limit=limit)
+    except Exception as e:
+        console.print(f"[red]Error:[/red] Failed to search reports: {e}")
+        raise typer.Exit(code=1) from e
+
+    if not hits:
+        console.print(f"[yellow]No findings match '{query}'[/yellow]")
+        return
+
+    table = Table(title=f"Findings matching '{query}'")
+    for column in ("Report", "Date", "Tool", "Heading", "Match"):
+        table.add_column(column, justify="right" if column == "Report" else "left")
+    for hit in hits:
+        table.add_row(
+            str(hit.report.id), hit.report.created_text, hit.report.tool, hit.heading, _highlight(hit.snippet)
+        )
+    console.print(table)
+
+
+@reports_app.command(name="list")
+def list_reports(
+    tool: Optional[str] = typer.Option(None, help="Only list reports of one tool"),
+    limit: int = typer.Option(20, help="Maximum number of reports to show"),
+) -> None:
+    """
+    List stored review reports, newest first.
+    """
+    from rich.table import Table
+
+    from cospec.core.reports import ReportStore
+
+    try:
+        stored = ReportStore().list(tool=tool, limit=limit)
+    except Exception as e:
+        console.print(f"[red]Error:[/red] Failed to read reports: {e}")
+        raise typer.Exit(code=1) from e
+
+    if not stored:
+        console.print("[yellow]No reports stored. Run 'cospec review' or 'cospec reports ingest'.[/yellow]")
+        return
+
+    table = Table(title="Review reports")
+    for column in ("ID", "Date", "Tool", "Commit", "Findings", "Path"):
+        table.add_column(column, justify="right" if column in ("ID", "Findings") else "left")
+    for report in stored:
+        table.add_row(
+            str(report.id),
+            report.created_text,
+            report.tool,
+            (report.git_commit or "-")[:10],
+            str(report.findings),
+            report.path,
+        )
+    console.print(table)
+
+
+@reports_app.command(name="show")
+def show_report(report_id: int) -> None:
+    """
+    Show a stored review report.
+    """
+    from cospec.core.reports import ReportStore
+
+    try:
+        found = ReportStore().get(report_id)
+    except Exception as e:
+        console.print(f"[red]Error:[/red] Failed to read reports: {e}")
+        raise typer.Exit(code=1) from e
+
+    if found is None:
+        console.print(f"[red]Error:[/red] Report {report_id} not found")
+        raise typer.Exit(code=1)
+
+    report, content = found
+    console.print(f"[bold blue]Report {report.id}[/bold blue] {report.path}")
+    console.print(
+        f"[dim]Tool: {report.tool}  Date: {report.created_text}  Commit: {report.git_commit or '-'}  "
+        f"Prompt: {report.prompt_hash or '-'}[/dim]\n"
+    )
+    print(content)
+
+
+_REPORT_PATHS_ARGUMENT = typer.Argument(None, help="Reports to index")
+
+
+@reports_app.command(name="ingest")
+def ingest_reports(paths: Optional[List[Path]] = _REPORT_PATHS_ARGUMENT) -> None:
+    """
+    Index existing review reports (defaults to docs/review_*.md).
+    """
+    from cospec.core.reports import REPORT_GLOB, ReportStore
+
+    store = ReportStore()
+    files = paths or sorted(Path.cwd().glob(REPORT_GLOB))
+    if not files:
+        console.print("[yellow]No review reports found[/yellow]")
+        return
+
+    try:
+        for path in files:
+            report_id = store.ingest(Path(os.path.relpath(path)) if path.is_absolute() else path)
+            console.print(f"  {report_id}: {path}")
+    except Exception as e:
+        console.print(f"[red]Error:[/red] Failed to index reports: {e}")
+        raise typer.Exit(code=1) from e
+    console.print(f"[green]Indexed {len(files)} report(s)[/green]")
+
+
 @agent_app.command()
 def add(
     name: str,
@@ -340,6 +869,8 @@ def add(
     console.print(f"[bold blue]Adding AI-Agent '{name}'...[/bold blue]")
 
     try:
+        from cospec.core.config import CospecConfig, ToolConfig
+
         config = CospecConfig.load_config()
 
         if name in config.tools:
@@ -386,18 +917,34 @@ def list_agents() -> None:
     List all registered AI-Agents.
     """
     try:
+        from cospec.core.config import CospecConfig
+
         config = CospecConfig.load_config()
         console.print("[bold blue]Registered AI-Agents:[/bold blue]\n")
 
         for name, tool_config in config.tools.items():
             console.print(f"[bold]{name}[/bold]")
-            console.print(f"  Command: {tool_config.command}")
-            console.print(f"  Args: {' '.join(tool_config.args)}")
+            if tool_config.type == "http":
+                console.print(f"  Type: http ({tool_config.base_url or 'default endpoint'})")
+                console.print(f"  Model: {tool_config.model}")
+            else:
+                console.print(f"  Command: {tool_config.command}")
+                console.print(f"  Args: {' '.join(tool_config.args)}")
             console.print()
 
         if not config.tools:
             console.print("[yellow]No AI-Agents registered[/yellow]")
 
+        # Listed from the discovery index; plugin modules are not imported
+        from cospec.core.plugins import AGENT_GROUP, CONNECTOR_GROUP, discover_plugins
+
+        for title, group in (("AI-Agent plugins", AGENT_GROUP), ("Connector plugins", CONNECTOR_GROUP)):
+            plugins = discover_plugins(group)
+            if plugins:
+                console.print(f"[bold blue]{title}:[/bold blue]")
+                for spec in plugins.values():
+                    console.print(f"  {spec.name} ({spec.distribution or spec.value})")
+
     except Exception as e:
         console.print(f"[red]Error:[/red] {e}")
         raise typer.Exit(code=1) from e
@@ -411,18 +958,36 @@ def test(name: str) -> None:
     console.print(f"[bold blue]Testing AI-Agent '{name}'...[/bold blue]")
 
     try:
+        from cospec.core.config import CospecConfig
+
         config = CospecConfig.load_config()
 
-        if name not in config.tools:
+        tool_config = config.resolve_tool(name)
+        if tool_config is None:
             console.print(f"[red]Error:[/red] Agent '{name}' not found")
             console.print("Use 'cospec agent list' to see available agents")
             raise typer.Exit(code=1)
 
-        tool_config = config.tools[name]
-        console.print(f"Running: {tool_config.command} {' '.join(tool_config.args)}")
-
         test_prompt = "Hello! This is a test prompt."
 
+        if tool_config.type != "cli":
+            from cospec.core.connectors import create_connector
+
+            if tool_config.type == "http":
+                console.print(f"Querying: {tool_config.base_url or 'default endpoint'} (model: {tool_config.model})")
+            else:
+                console.print(f"Querying through '{tool_config.type}' connector plugin")
+            try:
+                response = create_connector(name, config).query(test_prompt)
+            except ToolExecutionError as e:
+                console.print(f"[red]Error:[/red] {e}")
+                raise typer.Exit(code=1) from None
+            console.print("[green]Success![/green] Agent responded:")
+            console.print(response)
+            return
+
+        console.print(f"Running: {tool_config.command} {' '.join(tool_config.args)}")
+
         cmd_args = [tool_config.command]
         for arg in tool_config.args:
             if "{prompt}" in arg:
@@ -0,0 +1,18 @@
+from pathlib import Path
+from typing import Dict, Iterator
+
+import pytest
+
+from cospec.core import metrics
+
+
+@pytest.fixture(autouse=True)
+def isolated_run_stores(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Iterator[None]:
+    """Keep the metrics store and the plugin index out of the checkout and the user's cache."""
+    stores: Dict[Path, metrics.MetricsStore] = {}
+    monkeypatch.setattr(metrics, "METRICS_PATH", tmp_path / metrics.METRICS_PATH)
+    monkeypatch.setattr(metrics, "_stores", stores)
+    monkeypatch.setenv("COSPEC_PLUGIN_INDEX", str(tmp_path / "plugins.json"))
+    yield
+    for store in stores.values():
+        store.close()
@@ -1,6 +1,7 @@
 from pathlib import Path
 from unittest.mock import MagicMock, patch
 
+import pytest
 from typer.testing import CliRunner
 
 from cospec.core.config import CospecConfig, ToolConfig
@@ -21,8 +22,9 @@ class TestAgentCommands:
         assert "qwen" in result.stdout
         assert "opencode" in result.stdout
 
-    def test_agent_add_success(self, tmp_path: Path) -> None:
+    def test_agent_add_success(self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
         """Test adding a new AI-Agent successfully."""
+        monkeypatch.chdir(tmp_path)
         with patch("cospec.core.adapters.SubprocessManager.run") as mock_run:
             mock_run.return_value = MagicMock(stdout="Usage: mycli [prompt] --help", stderr="", returncode=0)
 
@@ -1,3 +1,4 @@
+import json
 from unittest.mock import patch
 
 from typer.testing import CliRunner
@@ -74,3 +75,64 @@ def test_hear_command_general_exception():
         result = runner.invoke(app, ["hear"])
         assert result.exit_code == 1
         assert "Error: General Error" in result.stdout
+
+
+def test_test_gen_jsonl_scenarios_only(tmp_path, monkeypatch):
+    """
+    Test that 'test-gen --format jsonl --scenarios-only' writes only JSON records to stdout.
+    """
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "docs").mkdir()
+    (tmp_path / "docs" / "SPEC.md").write_text(
+        "## FR-001: Export\n\n### 期待される挙動\n- 成功時: 書き出す\n- 失敗時: エラーを表示\n", encoding="utf-8"
+    )
+    mock_config = CospecConfig(
+        default_tool="mock_tool",
+        dev_tool="mock_tool",
+        tools={"mock_tool": ToolConfig(command="mock_command", args=[])},
+    )
+
+    with patch("cospec.main.CospecConfig.load_config", return_value=mock_config):
+        result = runner.invoke(app, ["test-gen", "--format", "jsonl", "--scenarios-only"])
+
+    assert result.exit_code == 0
+    records = [json.loads(line) for line in result.stdout.splitlines()]
+    assert [r["description"] for r in records] == ["成功時: 書き出す", "失敗時: エラーを表示", "エラーを表示"]
+    assert not (tmp_path / "tests" / "generated").exists()
+
+
+def test_test_gen_jsonl_reports_merged_and_validation(tmp_path, monkeypatch):
+    """
+    Test that 'test-gen --format jsonl --validate' emits merged near-duplicates and validation records.
+    """
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "docs").mkdir()
+    (tmp_path / "docs" / "SPEC.md").write_text(
+        "## FR-001: Export\n\n### 期待される挙動\n- 成功時: 書き出す\n- 失敗時: エラーを表示\n", encoding="utf-8"
+    )
+    (tmp_path / "docs" / "PLAN.md").write_text("## Export\n\n- [ ] 成功時: 書き出す。\n", encoding="utf-8")
+    mock_config = CospecConfig(
+        default_tool="mock_tool",
+        dev_tool="mock_tool",
+        tools={"mock_tool": ToolConfig(command="mock_command", args=[])},
+    )
+
+    with patch("cospec.main.CospecConfig.load_config", return_value=mock_config):
+        result = runner.invoke(app, ["test-gen", "--format", "jsonl", "--validate", "--output", "out"])
+
+    assert result.exit_code == 0
+    records = [json.loads(line) for line in result.stdout.splitlines()]
+    merged = [r for r in records if "duplicate_of" in r]
+    assert merged and all(r["duplicate_of"] == "成功時: 書き出す" for r in merged)
+    validation = [r for r in records if r.get("record") == "validation"]
+    assert validation and all(r["ok"] for r in validation)
+
+
+def test_test_gen_rejects_validate_with_scenarios_only():
+    """
+    Test that '--validate' cannot be combined with '--scenarios-only'.
+    """
+    result = runner.invoke(app, ["test-gen", "--format", "jsonl", "--scenarios-only", "--validate"])
+
+    assert result.exit_code == 1
+    assert "--validate" in result.stdout
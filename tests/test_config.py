@@ -0,0 +1,97 @@
+import json
+import os
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+import pytest
+from typer.testing import CliRunner
+
+from cospec.core.config import CospecConfig, ToolConfig, clear_config_cache
+from cospec.main import app
+
+
+@pytest.fixture
+def layered_env(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Path:
+    """Isolate the user config directory, cwd and COSPEC_* environment."""
+    monkeypatch.setenv("XDG_CONFIG_HOME", str(tmp_path / "xdg"))
+    monkeypatch.chdir(tmp_path)
+    for key in list(os.environ):
+        if key.lower().startswith("cospec_"):
+            monkeypatch.delenv(key)
+    clear_config_cache()
+    yield tmp_path
+    clear_config_cache()
+
+
+def _write_json(path: Path, data: dict) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(data), encoding="utf-8")
+
+
+class TestLayeredConfig:
+    def test_layers_apply_in_order(self, layered_env: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+        """User config, then project config, then environment override the defaults."""
+        _write_json(
+            layered_env / "xdg" / "cospec" / "config.json",
+            {"language": "en", "default_tool": "user_tool", "tools": {"user_tool": {"command": "u"}}},
+        )
+        _write_json(
+            layered_env / ".cospec" / "config.json",
+            {"default_tool": "project_tool", "tools": {"project_tool": {"command": "p"}}},
+        )
+        monkeypatch.setenv("COSPEC_DEV_TOOL", "user_tool")
+
+        config = CospecConfig.load_config()
+
+        assert config.language == "en"
+        assert config.default_tool == "project_tool"
+        assert config.dev_tool == "user_tool"
+        assert set(config.tools) == {"user_tool", "project_tool"}
+
+    def test_snapshot_is_cached_until_a_source_changes(self, layered_env: Path) -> None:
+        project_config = layered_env / ".cospec" / "config.json"
+        _write_json(project_config, {"language": "en"})
+
+        first = CospecConfig.load_config()
+        first.language = "mutated"
+        second = CospecConfig.load_config()
+
+        assert second.language == "en"
+
+        _write_json(project_config, {"language": "ja", "default_tool": "qwen"})
+
+        assert CospecConfig.load_config().language == "ja"
+
+    def test_save_is_atomic_and_invalidates_cache(self, layered_env: Path) -> None:
+        config = CospecConfig.load_config()
+        config.tools["custom"] = ToolConfig(command="custom", args=["{prompt}"])
+        config.save_to_file()
+
+        config_dir = layered_env / ".cospec"
+        assert [p.name for p in config_dir.iterdir()] == ["config.json"]
+        assert "custom" in json.loads((config_dir / "config.json").read_text(encoding="utf-8"))["tools"]
+        assert "custom" in CospecConfig.load_config().tools
+
+    def test_agent_add_persists_only_the_project_layer(
+        self, layered_env: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Values from the user config and the environment are not copied into the project file."""
+        _write_json(
+            layered_env / "xdg" / "cospec" / "config.json",
+            {"language": "en", "tools": {"user_tool": {"command": "u"}}},
+        )
+        _write_json(layered_env / ".cospec" / "config.json", {"dev_tool": "project_tool"})
+        monkeypatch.setenv("COSPEC_DEFAULT_TOOL", "env_tool")
+        monkeypatch.setenv("COSPEC_LOG_FILE", "env.log")
+
+        with patch("cospec.core.adapters.SubprocessManager.run") as mock_run:
+            mock_run.return_value = MagicMock(stdout="Usage: mycli [prompt]", stderr="", returncode=0)
+            result = CliRunner().invoke(app, ["agent", "add", "mycli", "--command", "mycli"])
+
+        assert result.exit_code == 0
+        project = json.loads((layered_env / ".cospec" / "config.json").read_text(encoding="utf-8"))
+        assert project == {"dev_tool": "project_tool", "tools": {"mycli": {"command": "mycli", "args": ["{prompt}"]}}}
+
+        config = CospecConfig.load_config()
+        assert set(config.tools) == {"user_tool", "mycli"}
+        assert (config.language, config.default_tool, config.log_file) == ("en", "env_tool", "env.log")
@@ -0,0 +1,288 @@
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Iterator
+from unittest.mock import MagicMock, patch
+
+import pytest
+from typer.testing import CliRunner
+
+from cospec.agents.reviewer import ReviewerAgent
+from cospec.core.config import CospecConfig, ToolConfig
+from cospec.core.connectors import (
+    CLIConnector,
+    OpenAICompatibleConnector,
+    TokenStream,
+    close_http_clients,
+    create_connector,
+    pack_prompts,
+    unpack_answers,
+)
+from cospec.core.exceptions import InvalidToolError, ToolExecutionError
+from cospec.main import app
+
+
+class _StubHandler(BaseHTTPRequestHandler):
+    """Minimal OpenAI-compatible chat completions endpoint."""
+
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format: str, *args: object) -> None:
+        pass
+
+    def do_POST(self) -> None:
+        length = int(self.headers.get("Content-Length", 0))
+        body = json.loads(self.rfile.read(length))
+        self.server.requests.append(body)  # type: ignore[attr-defined]
+        self.server.client_ports.add(self.client_address[1])  # type: ignore[attr-defined]
+
+        prompt = body["messages"][-1]["content"]
+        if body.get("stream"):
+            self._stream_words(body["model"], f"echo: {prompt}")
+            return
+
+        payload = json.dumps(
+            {
+                "id": "chatcmpl-stub",
+                "object": "chat.completion",
+                "created": 0,
+                "model": body["model"],
+                "choices": [
+                    {
+                        "index": 0,
+                        "message": {"role": "assistant", "content": f"echo: {prompt}"},
+                        "finish_reason": "stop",
+                    }
+                ],
+            }
+        ).encode("utf-8")
+
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def _stream_words(self, model: str, text: str) -> None:
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Connection", "close")
+        self.end_headers()
+        for word in text.split(" "):
+            chunk = {
+                "id": "chatcmpl-stub",
+                "object": "chat.completion.chunk",
+                "created": 0,
+                "model": model,
+                "choices": [{"index": 0, "delta": {"content": word + " "}, "finish_reason": None}],
+            }
+            self.wfile.write(f"data: {json.dumps(chunk)}\n\n".encode("utf-8"))
+            self.wfile.flush()
+        self.wfile.write(b"data: [DONE]\n\n")
+        self.close_connection = True
+
+
+@pytest.fixture
+def stub_server() -> Iterator[ThreadingHTTPServer]:
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _StubHandler)
+    server.requests = []  # type: ignore[attr-defined]
+    server.client_ports = set()  # type: ignore[attr-defined]
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+    close_http_clients()
+
+
+def _http_config(server: ThreadingHTTPServer) -> CospecConfig:
+    base_url = f"http://127.0.0.1:{server.server_address[1]}/v1"
+    return CospecConfig(
+        default_tool="stub",
+        language="en",
+        tools={"stub": ToolConfig(type="http", base_url=base_url, model="stub-model")},
+    )
+
+
+class TestOpenAICompatibleConnector:
+    def test_query_returns_completion(self, stub_server: ThreadingHTTPServer) -> None:
+        connector = create_connector("stub", _http_config(stub_server))
+
+        assert connector.query("hello") == "echo: hello"
+        assert stub_server.requests[0]["model"] == "stub-model"  # type: ignore[attr-defined]
+
+    def test_connections_are_pooled(self, stub_server: ThreadingHTTPServer) -> None:
+        config = _http_config(stub_server)
+        first = create_connector("stub", config)
+        second = create_connector("stub", config)
+
+        for _ in range(3):
+            first.query("a")
+            second.query("b")
+
+        assert isinstance(first, OpenAICompatibleConnector)
+        assert first.client is second.client  # type: ignore[attr-defined]
+        assert len(stub_server.client_ports) == 1  # type: ignore[attr-defined]
+
+    def test_missing_model_is_rejected(self) -> None:
+        config = CospecConfig(tools={"stub": ToolConfig(type="http", base_url="http://localhost/v1")})
+
+        with pytest.raises(InvalidToolError):
+            create_connector("stub", config)
+
+    def test_agent_uses_connector_without_subprocess(self, stub_server: ThreadingHTTPServer) -> None:
+        agent = ReviewerAgent(_http_config(stub_server), tool_name="stub")
+
+        with patch("subprocess.run") as mock_run:
+            result = agent.run_tool("review this")
+
+        mock_run.assert_not_called()
+        assert result.startswith("echo: review this")
+
+    def test_stream_yields_sse_deltas(self, stub_server: ThreadingHTTPServer) -> None:
+        connector = create_connector("stub", _http_config(stub_server))
+
+        chunks = list(connector.stream("one two three"))
+
+        assert chunks == ["echo: ", "one ", "two ", "three "]
+
+    def test_agent_stream_records_stats(self, stub_server: ThreadingHTTPServer) -> None:
+        agent = ReviewerAgent(_http_config(stub_server), tool_name="stub")
+
+        stream = agent.stream_tool("a b")
+        text = "".join(stream)
+
+        assert text.startswith("echo: a b")
+        assert stream.stats.tokens > 1
+        assert stream.stats.first_token_latency is not None
+        assert stream.stats.duration >= stream.stats.first_token_latency
+
+    def test_batch_query_preserves_order(self, stub_server: ThreadingHTTPServer) -> None:
+        connector = create_connector("stub", _http_config(stub_server))
+
+        results = connector.batch_query([f"prompt {i}" for i in range(6)])
+
+        assert results == [f"echo: prompt {i}" for i in range(6)]
+        assert len(stub_server.requests) == 6  # type: ignore[attr-defined]
+
+
+class TestCLIConnectorBatch:
+    def _connector(self, tmp_path: Path, batch_size: int = 8, max_concurrency: int = 4) -> CLIConnector:
+        tool_config = ToolConfig(
+            command="mock", args=["{prompt}"], batch_size=batch_size, max_concurrency=max_concurrency
+        )
+        return CLIConnector("mock", tool_config, cache_dir=tmp_path)
+
+    def test_prompts_are_packed_into_one_call(self, tmp_path: Path) -> None:
+        packed_response = "<<<ANSWER 1>>>\nfirst\n<<<ANSWER 2>>>\nsecond\n<<<ANSWER 3>>>\nthird\n"
+
+        with patch("cospec.core.adapters.SubprocessManager.run") as mock_run:
+            mock_run.return_value = MagicMock(stdout=packed_response)
+            results = self._connector(tmp_path).batch_query(["a", "b", "c"])
+
+        assert results == ["first", "second", "third"]
+        assert mock_run.call_count == 1
+        assert "<<<TASK 3>>>" in mock_run.call_args.args[0][1]
+
+    def test_missing_answers_fall_back_to_single_calls(self, tmp_path: Path) -> None:
+        responses = [MagicMock(stdout="<<<ANSWER 2>>>\nsecond"), MagicMock(stdout="first (retried)")]
+
+        with patch("cospec.core.adapters.SubprocessManager.run", side_effect=responses) as mock_run:
+            results = self._connector(tmp_path).batch_query(["a", "b"])
+
+        assert results == ["first (retried)", "second"]
+        assert mock_run.call_count == 2
+
+    def test_batch_size_limits_prompts_per_call(self, tmp_path: Path) -> None:
+        def _answer(cmd_args: list, **kwargs: object) -> MagicMock:
+            count = cmd_args[1].count("<<<TASK")
+            return MagicMock(stdout="\n".join(f"<<<ANSWER {i}>>>\nok" for i in range(1, count + 1)))
+
+        with patch("cospec.core.adapters.SubprocessManager.run", side_effect=_answer) as mock_run:
+            results = self._connector(tmp_path, batch_size=2).batch_query(["a", "b", "c", "d"])
+
+        assert results == ["ok"] * 4
+        assert mock_run.call_count == 2
+
+    def test_chunks_run_concurrently(self, tmp_path: Path) -> None:
+        # Both invocations must be in flight at once for the barrier to release
+        barrier = threading.Barrier(2, timeout=5)
+
+        def _answer(cmd_args: list, **kwargs: object) -> MagicMock:
+            barrier.wait()
+            return MagicMock(stdout=f"done {cmd_args[1]}")
+
+        with patch("cospec.core.adapters.SubprocessManager.run", side_effect=_answer):
+            results = self._connector(tmp_path, batch_size=1, max_concurrency=2).batch_query(["a", "b"])
+
+        assert results == ["done a", "done b"]
+
+    def test_failed_chunk_yields_none_and_keeps_other_answers(self, tmp_path: Path) -> None:
+        def _answer(cmd_args: list, **kwargs: object) -> MagicMock:
+            if "<<<TASK 1>>>\nc" in cmd_args[1]:
+                raise ToolExecutionError("tool crashed")
+            return MagicMock(stdout="<<<ANSWER 1>>>\nfirst\n<<<ANSWER 2>>>\nsecond")
+
+        with patch("cospec.core.adapters.SubprocessManager.run", side_effect=_answer):
+            results = self._connector(tmp_path, batch_size=2).batch_query(["a", "b", "c", "d"])
+
+        assert results == ["first", "second", None, None]
+
+    def test_failed_retry_yields_none(self, tmp_path: Path) -> None:
+        responses = [MagicMock(stdout="<<<ANSWER 2>>>\nsecond"), ToolExecutionError("tool crashed")]
+
+        with patch("cospec.core.adapters.SubprocessManager.run", side_effect=responses):
+            results = self._connector(tmp_path).batch_query(["a", "b"])
+
+        assert results == [None, "second"]
+
+    def test_raises_when_every_prompt_fails(self, tmp_path: Path) -> None:
+        with patch("cospec.core.adapters.SubprocessManager.run", side_effect=ToolExecutionError("tool crashed")):
+            with pytest.raises(ToolExecutionError, match="tool crashed"):
+                self._connector(tmp_path, batch_size=1).batch_query(["a", "b"])
+
+
+def test_unpack_answers_roundtrip() -> None:
+    packed = pack_prompts(["x", "y"])
+
+    assert "<<<TASK 1>>>\nx" in packed
+    assert unpack_answers("<<<ANSWER 1>>>\n a \n<<<ANSWER 2>>>\nb", 2) == ["a", "b"]
+    assert unpack_answers("no markers", 2) == [None, None]
+
+
+def test_token_stream_wraps_plain_iterators() -> None:
+    stream = TokenStream(iter(["", "full response"]))
+
+    assert list(stream) == ["", "full response"]
+    assert stream.stats.tokens == 1
+    assert stream.stats.tokens_per_sec > 0
+
+
+class TestStreamFailures:
+    def _failing_stream(self) -> Iterator[str]:
+        yield "# Partial report\n"
+        raise ToolExecutionError("connection reset")
+
+    def test_stream_failure_goes_through_exception_handler(self, stub_server: ThreadingHTTPServer) -> None:
+        agent = ReviewerAgent(_http_config(stub_server), tool_name="stub")
+        agent.exception_handler = MagicMock()
+
+        with patch.object(OpenAICompatibleConnector, "stream", return_value=self._failing_stream()):
+            with pytest.raises(ToolExecutionError, match="Error running tool stub"):
+                "".join(agent.stream_tool("a"))
+
+        agent.exception_handler.handle.assert_called_once()
+
+    def test_failed_stream_leaves_no_report(
+        self, stub_server: ThreadingHTTPServer, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        monkeypatch.chdir(tmp_path)
+        (tmp_path / "docs").mkdir()
+        _http_config(stub_server).save_to_file(tmp_path / ".cospec" / "config.json")
+
+        with patch.object(OpenAICompatibleConnector, "stream", return_value=self._failing_stream()):
+            result = CliRunner().invoke(app, ["review", "--tool", "stub"])
+
+        assert result.exit_code == 1
+        assert list((tmp_path / "docs").iterdir()) == []
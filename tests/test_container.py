@@ -0,0 +1,189 @@
+import threading
+import time
+from typing import TYPE_CHECKING, Iterator, Optional
+
+import pytest
+from typer.testing import CliRunner
+
+from cospec.agents.hearer import HearerAgent
+from cospec.agents.reviewer import ReviewerAgent
+from cospec.core.config import CospecConfig, ToolConfig
+from cospec.core.interfaces import (
+    AnalyzerInterface,
+    ExceptionHandlerInterface,
+    FormatterInterface,
+    LoggerInterface,
+)
+from cospec.dependencies import Container, Lifetime, init_di, reset_di
+from cospec.dependencies.container import _current_scope, injection_plan
+from cospec.main import app
+
+if TYPE_CHECKING:
+    from cospec.dependencies.deps import BaseDeps
+
+
+@pytest.fixture
+def container() -> Iterator[Container]:
+    reset_di()
+    yield Container()
+    reset_di()
+
+
+class Service:
+    pass
+
+
+class TestContainer:
+    def test_lifetimes(self, container: Container) -> None:
+        class Singleton(Service):
+            pass
+
+        class Scoped(Service):
+            pass
+
+        class Transient(Service):
+            pass
+
+        container.register_factory(Singleton, Singleton, Lifetime.SINGLETON)
+        container.register_factory(Scoped, Scoped, Lifetime.SCOPED)
+        container.register_factory(Transient, Transient, Lifetime.TRANSIENT)
+        container.compile()
+
+        assert container.resolve(Singleton) is container.resolve(Singleton)
+        assert container.resolve(Transient) is not container.resolve(Transient)
+
+        with container.scope():
+            first = container.resolve(Scoped)
+            assert container.resolve(Scoped) is first
+        with container.scope():
+            assert container.resolve(Scoped) is not first
+
+    def test_factory_name_suffix_still_marks_singletons(self, container: Container) -> None:
+        def create_service_singleton() -> Service:
+            return Service()
+
+        container.register_factory(Service, create_service_singleton)
+
+        assert container.resolve(Service) is container.resolve(Service)
+
+    def test_concurrent_first_resolves_build_singleton_once(self, container: Container) -> None:
+        calls = []
+
+        def create() -> Service:
+            calls.append(1)
+            time.sleep(0.01)
+            return Service()
+
+        container.register_factory(Service, create, Lifetime.SINGLETON)
+        container.compile()
+        barrier = threading.Barrier(8)
+        results = []
+
+        def worker() -> None:
+            barrier.wait()
+            results.append(container.resolve(Service))
+
+        threads = [threading.Thread(target=worker) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert len(calls) == 1
+        assert all(result is results[0] for result in results)
+
+    def test_unregistered_interface_raises(self, container: Container) -> None:
+        with pytest.raises(ValueError):
+            container.resolve(Service)
+
+    def test_init_di_shares_one_console(self, container: Container) -> None:
+        init_di(CospecConfig())
+
+        logger = container.resolve(LoggerInterface)
+        formatter = container.resolve(FormatterInterface)
+
+        assert logger.console is formatter.console
+        assert container.resolve(AnalyzerInterface) is not None
+
+
+class Repository:
+    pass
+
+
+class Handler:
+    def __init__(
+        self,
+        service: Service,
+        repository: Optional[Repository] = None,
+        deps: Optional["BaseDeps"] = None,
+        name: str = "x",
+    ):
+        self.service = service
+        self.repository = repository
+        self.deps = deps
+        self.name = name
+
+
+class TestAutoWiring:
+    def test_constructor_dependencies_are_injected(self, container: Container) -> None:
+        container.register_factory(Service, Service, Lifetime.SINGLETON)
+        container.register_factory(Handler, Handler)
+
+        handler = container.resolve(Handler)
+
+        assert handler.service is container.resolve(Service)
+        # Unregistered optional and unresolvable (TYPE_CHECKING-only) parameters keep their defaults
+        assert handler.repository is None and handler.deps is None and handler.name == "x"
+
+    def test_signatures_are_introspected_once(self, container: Container) -> None:
+        container.register_factory(Service, Service, Lifetime.SINGLETON)
+        container.build(Handler, name="y")
+        misses = injection_plan.cache_info().misses
+
+        for _ in range(5):
+            container.build(Handler, name="y")
+
+        assert injection_plan.cache_info().misses == misses
+        # Builtin-typed parameters (name: str) are values, not dependencies
+        assert [d.name for d in injection_plan(Handler)] == ["service", "repository"]
+
+    def test_missing_required_dependency_raises_on_resolve(self, container: Container) -> None:
+        container.register_factory(Handler, Handler)
+
+        with pytest.raises(ValueError):
+            container.resolve(Handler)
+
+    def test_init_di_wires_factories_and_agents(self, container: Container) -> None:
+        config = CospecConfig()
+        config.tools = {"mock": ToolConfig(command="mock")}
+        config.default_tool = "mock"
+        init_di(config)
+
+        assert container.resolve(ExceptionHandlerInterface).logger is container.resolve(LoggerInterface)
+        assert container.resolve(ReviewerAgent).config is config
+        assert container.build(ReviewerAgent, tool_name="mock").tool_name == "mock"
+
+
+class TestCommandScope:
+    def test_command_runs_in_one_container_scope(self, container: Container, monkeypatch: pytest.MonkeyPatch) -> None:
+        config = CospecConfig()
+        config.tools = {"mock": ToolConfig(command="mock")}
+        config.default_tool = "mock"
+        analyzers = []
+        loggers = []
+
+        def create_mission_prompt(agent: HearerAgent, focused: bool = False) -> str:
+            analyzers.extend(Container().resolve(AnalyzerInterface) for _ in range(2))
+            loggers.append(agent.logger)
+            return "prompt"
+
+        monkeypatch.setattr(CospecConfig, "load_config", staticmethod(lambda: config))
+        monkeypatch.setattr(HearerAgent, "create_mission_prompt", create_mission_prompt)
+        for _ in range(2):
+            assert CliRunner().invoke(app, ["hear"]).exit_code == 0
+
+        assert analyzers[0] is analyzers[1]
+        assert analyzers[2] is not analyzers[0]
+        assert _current_scope.get() is None
+        # Command agents log through the logger selected by the config
+        assert loggers[0] is not None and loggers[0] is Container().resolve(LoggerInterface)
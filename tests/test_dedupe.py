@@ -0,0 +1,54 @@
+import pytest
+
+from cospec.agents.test_generator import TestGeneratorAgent
+from cospec.core import dedupe
+from cospec.core.config import CospecConfig
+from cospec.core.dedupe import MinHasher, NearDuplicateIndex, shingles
+
+
+class TestNearDuplicateIndex:
+    def test_near_duplicates_map_to_first_representative(self) -> None:
+        index = NearDuplicateIndex()
+
+        assert index.add("a", "設定ファイルが存在しない場合はエラーを表示する") is None
+        assert index.add("b", "設定ファイルが存在しない場合はエラーを表示する。") == "a"
+        assert index.add("c", "設定ファイルが存在しない場合は  エラーを表示する!") == "a"
+        assert index.add("d", "JSON形式で結果を出力する") is None
+        assert len(index) == 2
+
+    def test_batch_matches_incremental(self) -> None:
+        texts = ["--input (任意)", "--output (必須)", "--input（任意）", "正常に処理", "正常に処理する"]
+        incremental = NearDuplicateIndex()
+        batch = NearDuplicateIndex()
+
+        assert [incremental.add(i, t) for i, t in enumerate(texts)] == batch.add_many(enumerate(texts))
+
+    def test_numpy_and_python_signatures_agree(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        numpy = pytest.importorskip("numpy")
+        sets = [shingles(text) for text in ["あいうえお", "ab", "終了コード1を返す", "x" * 50]]
+
+        monkeypatch.setattr(dedupe, "_numpy", numpy)
+        vectorized = MinHasher().signatures(sets)
+        monkeypatch.setattr(dedupe, "_numpy", False)
+
+        assert MinHasher().signatures(sets) == vectorized
+
+
+def test_generator_merges_near_duplicate_scenarios() -> None:
+    """SPEC と PLAN をまたいでほぼ同一のシナリオを統合し、最初のシナリオを残す"""
+    agent = TestGeneratorAgent(CospecConfig())
+    scenarios = [
+        {"type": "functional", "feature": "f", "description": "ドキュメントを更新する", "priority": "high"},
+        {"type": "functional", "feature": "f", "description": "テストを実行する", "priority": "high"},
+        {
+            "type": "integration",
+            "feature": "implementation",
+            "description": "ドキュメントを更新する。",
+            "priority": "low",
+        },
+    ]
+
+    kept, merged = agent.deduplicate_scenarios(scenarios)
+
+    assert kept == scenarios[:2]
+    assert merged == [{**scenarios[2], "duplicate_of": "ドキュメントを更新する"}]
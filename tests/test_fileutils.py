@@ -0,0 +1,46 @@
+import os
+import stat
+from pathlib import Path
+
+import pytest
+
+from cospec.core.fileutils import atomic_write_text, atomic_writer
+
+
+def _mode(path: Path) -> int:
+    return stat.S_IMODE(path.stat().st_mode)
+
+
+def test_new_file_gets_umask_default_mode(tmp_path: Path) -> None:
+    umask = os.umask(0)
+    os.umask(umask)
+    target = tmp_path / "report.md"
+
+    atomic_write_text(target, "content")
+
+    assert target.read_text(encoding="utf-8") == "content"
+    assert _mode(target) == 0o666 & ~umask
+
+
+def test_replacement_keeps_existing_mode(tmp_path: Path) -> None:
+    target = tmp_path / "report.md"
+    target.write_text("old", encoding="utf-8")
+    target.chmod(0o640)
+
+    atomic_write_text(target, "new")
+
+    assert target.read_text(encoding="utf-8") == "new"
+    assert _mode(target) == 0o640
+
+
+def test_failure_leaves_previous_content(tmp_path: Path) -> None:
+    target = tmp_path / "report.md"
+    target.write_text("old", encoding="utf-8")
+
+    with pytest.raises(RuntimeError):
+        with atomic_writer(target) as f:
+            f.write("partial")
+            raise RuntimeError("interrupted")
+
+    assert target.read_text(encoding="utf-8") == "old"
+    assert list(tmp_path.iterdir()) == [target]
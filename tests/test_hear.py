@@ -4,6 +4,7 @@ import pytest
 
 from cospec.agents.hearer import HearerAgent
 from cospec.core.config import CospecConfig
+from cospec.core.templates import clear_template_cache
 
 
 class TestHearerAgent:
@@ -12,6 +13,7 @@ class TestHearerAgent:
         self.config = CospecConfig()
         self.config.default_tool = "qwen"
         self.config.language = "ja"
+        clear_template_cache()
 
     def test_extract_unclear_points_when_conditions(self):
         """条件分岐の不明点を正しく抽出できる"""
@@ -143,3 +145,53 @@ class TestHearerAgent:
 
         with pytest.raises(PromptTemplateError):
             agent.create_mission_prompt()
+
+    def test_create_mission_prompt_focused(self, tmp_path, monkeypatch):
+        """focused モードでは不明点に関連する SPEC セクションとソースだけを埋め込む"""
+        monkeypatch.chdir(tmp_path)
+        (tmp_path / "docs").mkdir()
+        (tmp_path / "docs" / "SPEC.md").write_text(
+            "# SPEC\n\n"
+            "## FR-001: Export\n### ユーザー入力\n- 引数: --dry-run (任意)\n\n"
+            "## FR-002: Import\n### 期待される挙動\n- 成功時: 取り込む\n",
+            encoding="utf-8",
+        )
+        (tmp_path / "docs" / "NOTES.md").write_text(
+            "# Notes\n\n## Export\nFR-001 は --dry-run を持つ\n\n## Other\n関係ない\n", encoding="utf-8"
+        )
+        src_dir = tmp_path / "src" / "cospec"
+        src_dir.mkdir(parents=True)
+        (src_dir / "export.py").write_text(
+            "def export(dry_run: bool) -> None:\n    pass\n\n\ndef unrelated() -> None:\n    pass\n", encoding="utf-8"
+        )
+        (src_dir / "other.py").write_text("def other() -> None:\n    pass\n", encoding="utf-8")
+
+        prompt = HearerAgent(self.config).create_mission_prompt(focused=True)
+
+        assert "引数 '--dry-run (任意)' の必須/任意の判断基準が不明です" in prompt
+        assert "FR-001: Export" in prompt
+        assert "FR-002" not in prompt
+        assert "FR-001 は --dry-run を持つ" in prompt
+        assert "関係ない" not in prompt
+        assert "def export(dry_run: bool)" in prompt
+        assert "def unrelated" not in prompt
+        assert "other.py" not in prompt
+
+    def test_create_delta_mission_prompt_only_scans_changed_sections(self, tmp_path, monkeypatch):
+        """--since では変更されたセクションだけから不明点を抽出し、スナップショットを更新する"""
+        monkeypatch.chdir(tmp_path)
+        (tmp_path / "docs").mkdir()
+        spec_path = tmp_path / "docs" / "SPEC.md"
+        spec_path.write_text("# SPEC\n## A\n- 時点: 未定のまま\n## B\n- 時点: 決定済み\n", encoding="utf-8")
+        agent = HearerAgent(self.config)
+
+        first = agent.create_delta_mission_prompt("last")
+        assert "[追加] SPEC / A" in first
+        assert agent.create_delta_mission_prompt("last") is None
+
+        spec_path.write_text("# SPEC\n## A\n- 時点: 未定のまま\n## B\n- 時点: 不明な条件\n", encoding="utf-8")
+        prompt = agent.create_delta_mission_prompt("last")
+
+        assert "[変更] SPEC / B" in prompt
+        assert "条件 '不明な条件' の詳細が不明です" in prompt
+        assert "未定のまま" not in prompt
@@ -0,0 +1,88 @@
+import json
+import threading
+from pathlib import Path
+
+import pytest
+from rich.console import Console
+
+from cospec.core.adapters import ConsoleLogger, GenericExceptionHandler
+from cospec.core.config import CospecConfig
+from cospec.core.exceptions import ConfigurationError
+from cospec.core.jsonlog import JsonLineWriter, JsonLogger
+from cospec.dependencies.factories import Factories
+
+
+class TestJsonLogger:
+    def test_writes_json_lines_with_context_and_level_filter(self, tmp_path: Path) -> None:
+        writer = JsonLineWriter(tmp_path / "logs" / "cospec.jsonl")
+        logger = JsonLogger(writer, level="info").bind(tool="qwen")
+
+        logger.debug("hidden")
+        logger.info("Tool execution completed", phase="execute", duration=1.5)
+        logger.error("失敗", extra={"error_code": "TOOL_EXECUTION_ERROR"})
+        writer.close()
+
+        records = [json.loads(line) for line in writer.path.read_text(encoding="utf-8").splitlines()]
+        assert [record["level"] for record in records] == ["info", "error"]
+        assert records[0]["tool"] == "qwen"
+        assert (records[0]["phase"], records[0]["duration"]) == ("execute", 1.5)
+        assert (records[1]["message"], records[1]["error_code"]) == ("失敗", "TOOL_EXECUTION_ERROR")
+
+    def test_flush_waits_for_queued_lines(self, tmp_path: Path) -> None:
+        writer = JsonLineWriter(tmp_path / "cospec.jsonl")
+        logger = JsonLogger(writer)
+
+        for i in range(100):
+            logger.info("record", index=i)
+        writer.flush()
+
+        assert len(writer.path.read_text(encoding="utf-8").splitlines()) == 100
+        writer.close()
+
+    def test_unknown_level_is_rejected_without_starting_a_writer(self, tmp_path: Path) -> None:
+        writers = threading.active_count()
+
+        with pytest.raises(ConfigurationError):
+            JsonLogger(level="verbose")
+        with pytest.raises(ConfigurationError):
+            Factories.create_logger_singleton(
+                CospecConfig(log_format="json", log_level="verbose", log_file=str(tmp_path / "cospec.jsonl"))
+            )
+
+        assert threading.active_count() == writers
+
+
+class TestLoggerSelection:
+    def test_console_logger_accepts_structured_fields(self) -> None:
+        console = Console(record=True, width=200)
+        handler = GenericExceptionHandler(ConsoleLogger(console, level="info"))
+
+        handler.handle(RuntimeError("boom"), context={"tool": "qwen"})
+        ConsoleLogger(console, level="info").debug("hidden")
+
+        output = console.export_text()
+        assert "ERROR: [RuntimeError] boom" in output
+        assert "hidden" not in output
+
+    def test_factory_selects_logger_from_config(self, tmp_path: Path) -> None:
+        config = CospecConfig(log_format="json", log_level="warning", log_file=str(tmp_path / "cospec.jsonl"))
+        logger = Factories.create_logger_singleton(config)
+
+        assert isinstance(logger, JsonLogger)
+        assert logger.level == "warning"
+        logger.writer.close()
+
+        assert isinstance(Factories.create_logger_singleton(CospecConfig()), ConsoleLogger)
+        with pytest.raises(ConfigurationError):
+            Factories.create_logger_singleton(CospecConfig(log_format="xml"))
+
+    def test_console_logger_is_quiet_by_default(self) -> None:
+        console = Console(record=True, width=200)
+        logger = Factories.create_logger_singleton(CospecConfig(), console)
+
+        logger.info("Executing tool: qwen")
+        logger.warning("Tool returned no valid Python")
+
+        output = console.export_text()
+        assert "Executing tool" not in output
+        assert "WARNING: Tool returned no valid Python" in output
@@ -0,0 +1,116 @@
+import sqlite3
+import subprocess
+import time
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+from typer.testing import CliRunner
+
+from cospec.agents.base import BaseAgent
+from cospec.core.config import CospecConfig, ToolConfig
+from cospec.core.exceptions import ToolExecutionError
+from cospec.core.metrics import (
+    BATCH_SIZE,
+    METRICS_PATH,
+    Invocation,
+    MetricsStore,
+    daily_trend,
+    get_metrics_store,
+    summarize,
+)
+from cospec.core.tokens import estimate_tokens
+from cospec.main import app
+
+runner = CliRunner()
+
+
+def _invocation(tool: str, wall_time: float, exit_code: int = 0, cache_hit: bool = False) -> Invocation:
+    return Invocation(time.time(), tool, tool, 400, 100, wall_time, exit_code, cache_hit, 2048)
+
+
+class TestMetricsStore:
+    def test_writes_are_batched(self, tmp_path: Path) -> None:
+        store = MetricsStore(tmp_path / "metrics.db")
+
+        for _ in range(BATCH_SIZE - 1):
+            store.record(_invocation("qwen", 1.0))
+        assert not store.path.exists()
+
+        store.record(_invocation("qwen", 1.0))
+        # The full batch is written by the background thread, not by record()
+        reader = MetricsStore(store.path)
+        deadline = time.monotonic() + 5
+        while len(reader.load()) < BATCH_SIZE and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert len(reader.load()) == BATCH_SIZE
+        store.close()
+        reader.close()
+
+    def test_failed_write_keeps_the_batch(self, tmp_path: Path) -> None:
+        store = MetricsStore(tmp_path / "metrics.db")
+        store.path.mkdir()
+        store.record(_invocation("qwen", 1.0))
+
+        with pytest.raises(sqlite3.Error):
+            store.flush()
+
+        store.path = tmp_path / "retry.db"
+        store.flush()
+        assert len(store.load()) == 1
+        store.close()
+
+    def test_summary_and_trend(self, tmp_path: Path) -> None:
+        store = MetricsStore(tmp_path / "metrics.db")
+        for wall_time in (1.0, 2.0, 3.0, 4.0):
+            store.record(_invocation("qwen", wall_time))
+        store.record(_invocation("qwen", 0.5, exit_code=1))
+        store.record(_invocation("qwen", 0.01, cache_hit=True))
+
+        invocations = store.load(tool="qwen")
+        (summary,) = summarize(invocations)
+
+        assert (summary.runs, summary.failures, summary.cache_hits) == (6, 1, 1)
+        assert (summary.p50, summary.p95) == (3.0, 4.0)
+        assert summary.prompt_tokens_per_sec == pytest.approx(400 / 10.0)
+        assert sum(point["runs"] for point in daily_trend(invocations)["qwen"].values()) == 5
+
+    def test_estimate_tokens_counts_non_ascii_per_character(self) -> None:
+        assert estimate_tokens("abcdefgh") == 2
+        assert estimate_tokens("仕様書") == 3
+
+
+class TestToolMetrics:
+    def test_run_tool_records_invocations(self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+        monkeypatch.chdir(tmp_path)
+        config = CospecConfig()
+        config.tools = {"mock": ToolConfig(command="mock", args=["{prompt}"])}
+        config.default_tool = "mock"
+        agent = BaseAgent(config)
+
+        with patch("cospec.core.adapters.subprocess.run") as mock_run:
+            mock_run.return_value = subprocess.CompletedProcess(["mock"], 0, stdout="answer", stderr="")
+            agent.run_tool("仕様")
+            mock_run.side_effect = subprocess.CalledProcessError(3, ["mock"], stderr="failed")
+            with pytest.raises(ToolExecutionError):
+                agent.run_tool("prompt")
+
+        invocations = get_metrics_store().load()
+        assert [(i.tool, i.command, i.exit_code) for i in invocations] == [("mock", "mock", 0), ("mock", "mock", 3)]
+        assert (invocations[0].prompt_bytes, invocations[0].output_bytes) == (6, 6)
+
+    def test_stats_command(self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+        monkeypatch.chdir(tmp_path)
+        result = runner.invoke(app, ["stats"])
+        assert result.exit_code == 0
+        assert "No tool invocations" in result.output
+
+        store = MetricsStore(tmp_path / METRICS_PATH)
+        store.record(_invocation("qwen", 2.0))
+        store.flush()
+
+        result = runner.invoke(app, ["stats", "--days", "7"])
+
+        assert result.exit_code == 0
+        assert "qwen" in result.output
+        assert "2.00" in result.output
@@ -0,0 +1,89 @@
+import sys
+from pathlib import Path
+from typing import Iterator
+from unittest.mock import patch
+
+import pytest
+
+from cospec.core import plugins
+from cospec.core.config import CospecConfig
+from cospec.core.connectors import create_connector
+
+PLUGIN_MODULE = """
+from cospec.core.interfaces import LLMInterface
+
+TOOL = {"type": "echo", "command": "echo"}
+
+
+class EchoConnector(LLMInterface):
+    def __init__(self, tool_name, tool_config):
+        self.tool_name = tool_name
+
+    def query(self, prompt, context=None):
+        return f"{self.tool_name}: {prompt}"
+
+    def validate_response(self, response):
+        return True
+"""
+
+
+@pytest.fixture
+def plugin_site(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Iterator[Path]:
+    site = tmp_path / "site"
+    dist_info = site / "cospec_echo-1.0.dist-info"
+    dist_info.mkdir(parents=True)
+    (dist_info / "METADATA").write_text("Metadata-Version: 2.1\nName: cospec-echo\nVersion: 1.0\n")
+    (dist_info / "entry_points.txt").write_text(
+        "[cospec.connectors]\necho = cospec_echo_plugin:EchoConnector\n\n"
+        "[cospec.agents]\necho = cospec_echo_plugin:TOOL\n"
+    )
+    (site / "cospec_echo_plugin.py").write_text(PLUGIN_MODULE)
+
+    monkeypatch.syspath_prepend(str(site))
+    monkeypatch.setenv("COSPEC_PLUGIN_INDEX", str(tmp_path / "plugins.json"))
+    plugins.clear_plugin_cache()
+    yield site
+    plugins.clear_plugin_cache()
+    sys.modules.pop("cospec_echo_plugin", None)
+
+
+class TestPlugins:
+    def test_discovery_does_not_import_plugin_modules(self, plugin_site: Path) -> None:
+        connectors = plugins.discover_plugins(plugins.CONNECTOR_GROUP)
+
+        assert connectors["echo"].value == "cospec_echo_plugin:EchoConnector"
+        assert connectors["echo"].distribution == "cospec-echo"
+        assert "cospec_echo_plugin" not in sys.modules
+
+    def test_index_is_reused_until_sys_path_changes(self, plugin_site: Path) -> None:
+        plugins.plugin_index()
+        plugins.clear_plugin_cache()
+
+        with patch.object(plugins, "_scan", side_effect=AssertionError("rescanned")):
+            assert "echo" in plugins.discover_plugins(plugins.AGENT_GROUP)
+
+        plugins.clear_plugin_cache()
+        (plugin_site / "new_file.txt").write_text("changes the directory mtime")
+        with patch.object(plugins, "_scan", return_value={group: {} for group in plugins.GROUPS}) as scan:
+            assert plugins.discover_plugins(plugins.AGENT_GROUP) == {}
+        scan.assert_called_once()
+
+    def test_agent_plugin_supplies_tool_and_connector(self, plugin_site: Path) -> None:
+        config = CospecConfig()
+
+        tool_config = config.resolve_tool("echo")
+
+        assert tool_config is not None and tool_config.type == "echo"
+        assert "echo" not in config.tools
+        assert create_connector("echo", config).query("hi") == "echo: hi"
+
+    def test_unknown_plugin_returns_none(self, plugin_site: Path) -> None:
+        assert plugins.load_plugin(plugins.CONNECTOR_GROUP, "missing") is None
+        assert CospecConfig().resolve_tool("missing") is None
+
+    def test_unknown_names_are_looked_up_once(self, plugin_site: Path) -> None:
+        assert CospecConfig().resolve_tool("missing") is None
+
+        with patch.object(plugins, "plugin_index", side_effect=AssertionError("index consulted again")):
+            assert CospecConfig().resolve_tool("missing") is None
+            assert plugins.load_plugin(plugins.AGENT_GROUP, "missing") is None
@@ -0,0 +1,103 @@
+import math
+import subprocess
+import time
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+from cospec.agents.reviewer import ReviewerAgent
+from cospec.core.config import CospecConfig, ToolConfig
+from cospec.core.exceptions import PromptTooLargeError
+from cospec.core.metrics import Invocation, MetricsStore, get_metrics_store
+from cospec.core.preflight import MAX_SHARDS, predict_latency, run_preflight, shard_context
+from cospec.core.tokens import estimate_tokens, model_family
+
+
+def _invocation(tokens: int, wall_time: float, actual_tokens: int | None = None) -> Invocation:
+    return Invocation(time.time(), "qwen", "qwen", tokens * 4, tokens, wall_time, 0, False, 100, None, actual_tokens)
+
+
+class TestEstimates:
+    def test_ratio_depends_on_model_family(self) -> None:
+        text = "仕様" * 100
+
+        assert model_family("Qwen3-Coder-Plus") == "qwen"
+        assert model_family(None, "opencode", "opencode") is None
+        assert estimate_tokens(text, "qwen") < estimate_tokens(text) < estimate_tokens(text, "claude")
+
+    def test_latency_is_fitted_from_history(self) -> None:
+        history = [_invocation(1000, 2.0), _invocation(2000, 3.0), _invocation(3000, 4.0)]
+
+        assert predict_latency(history, 4000) == pytest.approx(5.0)
+        assert predict_latency(history[:1], 4000) == 2.0
+        assert predict_latency([], 4000) is None
+
+    def test_preflight_uses_limit_and_calibration(self, tmp_path: Path) -> None:
+        store = MetricsStore(tmp_path / "metrics.db")
+        store.record(_invocation(1000, 2.0, actual_tokens=1500))
+
+        check = run_preflight("a" * 8000, "qwen", ToolConfig(command="qwen-code", max_prompt_tokens=2000), store=store)
+
+        assert check.family == "qwen"
+        assert check.calibration == pytest.approx(1.5)
+        assert check.estimated_tokens == math.ceil(estimate_tokens("a" * 8000, "qwen") * 1.5)
+        assert check.over_limit
+        assert check.predicted_time == 2.0
+
+    def test_latency_is_predicted_from_the_uncalibrated_estimate(self, tmp_path: Path) -> None:
+        store = MetricsStore(tmp_path / "metrics.db")
+        history = [_invocation(size, size / 1000 + 1, actual_tokens=size * 2) for size in (1000, 2000, 3000)]
+        for invocation in history:
+            store.record(invocation)
+        prompt = "a" * 8000
+
+        check = run_preflight(prompt, "qwen", ToolConfig(command="qwen-code"), store=store)
+
+        assert check.calibration == pytest.approx(2.0)
+        assert check.predicted_time == pytest.approx(predict_latency(history, estimate_tokens(prompt, "qwen")))
+
+    def test_shards_break_between_files(self) -> None:
+        context = "".join(f"--- File: src/m{i}.py ---\n" + "x = 1\n" * 50 for i in range(4))
+
+        shards = shard_context(context, 100, estimate_tokens)
+
+        assert len(shards) == 4
+        assert "".join(shards) == context
+        assert all(shard.startswith("--- File: ") for shard in shards)
+
+
+class TestReviewPreflight:
+    def test_oversized_review_is_sharded_and_recorded(self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+        monkeypatch.chdir(tmp_path)
+        (tmp_path / "docs").mkdir()
+        (tmp_path / "docs" / "SPEC.md").write_text("# SPEC\n" + "spec line\n" * 400)
+        (tmp_path / "src" / "cospec").mkdir(parents=True)
+        (tmp_path / "src" / "cospec" / "main.py").write_text("print('hello')\n" * 400)
+        config = CospecConfig()
+        config.tools = {"mock": ToolConfig(command="mock", args=["{prompt}"], max_prompt_tokens=2000)}
+        agent = ReviewerAgent(config, tool_name="mock")
+
+        with patch("cospec.core.adapters.subprocess.run") as mock_run:
+            mock_run.return_value = subprocess.CompletedProcess(["mock"], 0, stdout="No issues.", stderr="")
+            report = agent.review_project()
+
+        assert mock_run.call_count >= 2
+        assert report.startswith("## Part 1/")
+        invocations = get_metrics_store().load(tool="mock")
+        assert len(invocations) == mock_run.call_count
+        assert all(invocation.estimated_tokens <= 2000 for invocation in invocations)
+
+    def test_review_needing_too_many_shards_is_refused(self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+        monkeypatch.chdir(tmp_path)
+        (tmp_path / "docs").mkdir()
+        for i in range(MAX_SHARDS + 2):
+            (tmp_path / "docs" / f"part{i}.md").write_text(f"# Part {i}\n" + "spec line\n" * 200)
+        config = CospecConfig()
+        config.tools = {"mock": ToolConfig(command="mock", args=["{prompt}"], max_prompt_tokens=1000)}
+        agent = ReviewerAgent(config, tool_name="mock")
+
+        with pytest.raises(PromptTooLargeError):
+            agent.plan_review()
+        prompts, check = agent.plan_review(auto_shard=False)
+        assert len(prompts) == 1 and check.over_limit
@@ -0,0 +1,75 @@
+import pstats
+import sys
+import threading
+from pathlib import Path
+
+import pytest
+from typer.testing import CliRunner
+
+from cospec.agents.base import BaseAgent
+from cospec.core.analyzer import ProjectAnalyzer
+from cospec.core.config import CospecConfig, ToolConfig
+from cospec.core.profiling import PROFILE_DIR, CpuProfile, MemoryProfile, start_profiling, stop_profiling
+from cospec.main import app
+
+runner = CliRunner()
+
+
+class TestProfiling:
+    def test_cpu_profile_writes_pstats_and_summary(self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+        monkeypatch.chdir(tmp_path)
+
+        result = runner.invoke(app, ["--profile", "cpu", "status"])
+
+        assert result.exit_code == 0
+        (pstats_path,) = (tmp_path / PROFILE_DIR).glob("status_*.pstats")
+        assert pstats.Stats(str(pstats_path)).total_calls > 0
+        assert pstats_path.with_suffix(".cpu.txt").exists()
+
+    def test_cpu_profile_includes_worker_threads(self, tmp_path: Path) -> None:
+        def count_in_worker() -> None:
+            sum(range(100_000))
+
+        profile = start_profiling("cpu")
+        try:
+            worker = threading.Thread(target=count_in_worker)
+            worker.start()
+            worker.join()
+        finally:
+            result = stop_profiling("batch", root=tmp_path)
+
+        assert result is not None
+        assert "count_in_worker" in result[1]
+        assert isinstance(profile, CpuProfile)
+        # From Python 3.12 the command's profiler sees every thread; before, each thread gets its own
+        assert len(profile._threads) == (1 if sys.version_info < (3, 12) else 0)
+
+    def test_memory_profile_reports_phase_checkpoints(self, tmp_path: Path) -> None:
+        (tmp_path / "docs").mkdir()
+        (tmp_path / "docs" / "SPEC.md").write_text("# SPEC\n" + "仕様 " * 10000)
+        config = CospecConfig()
+        config.tools = {"mock": ToolConfig(command="mock")}
+        config.default_tool = "mock"
+
+        profile = start_profiling("mem")
+        try:
+            context = ProjectAnalyzer(tmp_path).collect_context()
+            prompt = BaseAgent(config)._build_prompt(context)
+        finally:
+            result = stop_profiling("review", root=tmp_path)
+
+        assert prompt
+        assert result is not None
+        path, summary = result
+        assert path.name.startswith("review_") and path.name.endswith(".mem.txt")
+        assert "Peak traced memory" in summary
+        assert summary.index("context_collected") < summary.index("prompt_built") < summary.index("end")
+        assert "Top 20 allocation sites" in summary
+        assert isinstance(profile, MemoryProfile)
+        assert not any(hasattr(phase, "snapshot") for phase in profile.checkpoints)
+
+    def test_unknown_profile_mode_fails(self) -> None:
+        result = runner.invoke(app, ["--profile", "gpu", "status"])
+
+        assert result.exit_code == 1
+        assert stop_profiling("status") is None
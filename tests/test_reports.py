@@ -0,0 +1,97 @@
+import sqlite3
+from pathlib import Path
+
+import pytest
+from typer.testing import CliRunner
+
+from cospec.core.reports import _FTS_SCHEMA, ReportStore, ingest_report, prompt_hash, split_findings
+from cospec.main import app
+
+runner = CliRunner()
+
+REPORT = """# Review Report
+
+## 不整合
+
+SPEC.md の FR-003 と実装の引数名が一致しない。
+
+```python
+# not a heading
+```
+
+## Missing Feature
+
+The export command is missing.
+"""
+
+
+class TestReportStore:
+    def test_findings_are_split_per_heading(self) -> None:
+        findings = split_findings(REPORT)
+
+        assert [finding.heading for finding in findings] == ["Review Report", "不整合", "Missing Feature"]
+        assert "# not a heading" in findings[1].body
+
+    def test_ingest_and_search(self, tmp_path: Path) -> None:
+        store = ReportStore(tmp_path / "reports.db")
+        report_path = tmp_path / "review_20260101_120000_qwen.md"
+        report_path.write_text(REPORT, encoding="utf-8")
+
+        report_id = store.ingest(report_path, git_commit="abc123", prompt_digest=prompt_hash("prompt"))
+        # Re-ingesting replaces the report instead of duplicating its findings
+        assert store.ingest(report_path) == report_id
+
+        (report,) = store.list()
+        assert (report.tool, report.findings, report.created_text) == ("qwen", 3, "2026-01-01 12:00:00")
+        assert [hit.heading for hit in store.search("引数名")] == ["不整合"]
+        assert [hit.heading for hit in store.search("実装")] == ["不整合"]
+        assert [hit.heading for hit in store.search("export command")] == ["Missing Feature"]
+        assert store.search("export 引数名") == []
+        assert store.search("anything", tool="opencode") == []
+
+    def test_search_scans_without_trigram_index(self, tmp_path: Path) -> None:
+        # An index created by SQLite < 3.34 uses unicode61, which cannot match inside Japanese text
+        store = ReportStore(tmp_path / "reports.db")
+        connection = sqlite3.connect(store.path)
+        connection.execute(_FTS_SCHEMA.format(tokenizer="unicode61"))
+        connection.close()
+        report_path = tmp_path / "review_20260101_120000_qwen.md"
+        report_path.write_text(REPORT, encoding="utf-8")
+        store.ingest(report_path)
+
+        assert [hit.heading for hit in store.search("引数名")] == ["不整合"]
+        assert [hit.heading for hit in store.search("export command")] == ["Missing Feature"]
+
+    def test_review_report_is_ingested_with_metadata(self, tmp_path: Path) -> None:
+        report_path = tmp_path / "review.md"
+        report_path.write_text(REPORT, encoding="utf-8")
+
+        report_id = ingest_report(report_path, "opencode", prompt="prompt", root=tmp_path)
+
+        stored = ReportStore(tmp_path / ".cospec" / "reports.db").get(report_id)
+        assert stored is not None
+        report, content = stored
+        assert (report.tool, report.prompt_hash, content) == ("opencode", prompt_hash("prompt"), REPORT)
+
+
+class TestReportsCommands:
+    def test_ingest_list_search_show(self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+        monkeypatch.chdir(tmp_path)
+        (tmp_path / "docs").mkdir()
+        (tmp_path / "docs" / "review_20260101_120000_qwen.md").write_text(REPORT, encoding="utf-8")
+
+        assert runner.invoke(app, ["reports", "ingest"]).exit_code == 0
+
+        result = runner.invoke(app, ["reports", "list"])
+        assert result.exit_code == 0
+        assert "qwen" in result.output
+
+        result = runner.invoke(app, ["reports", "search", "export"])
+        assert result.exit_code == 0
+        assert "Missing Feature" in result.output
+
+        result = runner.invoke(app, ["reports", "show", "1"])
+        assert result.exit_code == 0
+        assert "The export command is missing." in result.output
+
+        assert runner.invoke(app, ["reports", "show", "42"]).exit_code == 1
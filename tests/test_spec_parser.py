@@ -0,0 +1,58 @@
+from cospec.core.spec_parser import parse_spec
+
+SPEC = """# SPEC: sample
+
+## FR-001: 検索機能
+
+### ユーザー入力
+- 引数: --query (必須)
+- 引数: --limit (任意)
+
+### 期待される挙動
+- 成功時: 結果を一覧表示する
+- 失敗時: エラーメッセージを表示
+
+### 出力
+- 出力: JSON形式
+
+```markdown
+## FR-999: fenced example is not a requirement
+```
+
+## FR-002: 削除機能
+
+### 期待される挙動
+- 成功時: 対象を削除する
+"""
+
+
+class TestSpecParser:
+    def test_features_collect_subsection_lists(self) -> None:
+        model = parse_spec(SPEC)
+
+        assert [f.fr_id for f in model.features] == ["FR-001", "FR-002"]
+        search = model.features[0]
+        assert search.title == "検索機能"
+        assert search.inputs == ("引数: --query (必須)", "引数: --limit (任意)")
+        assert search.behaviors == ("成功時: 結果を一覧表示する", "失敗時: エラーメッセージを表示")
+        assert search.outputs == ("出力: JSON形式",)
+        assert model.features[1].behaviors == ("成功時: 対象を削除する",)
+
+    def test_clauses_record_enclosing_section(self) -> None:
+        model = parse_spec(SPEC)
+
+        failures = model.clauses_for("失敗時", section="期待される挙動")
+        assert [c.value for c in failures] == ["エラーメッセージを表示"]
+        assert [c.value for c in model.clauses_for("引数")] == ["--query (必須)", "--limit (任意)"]
+        assert model.feature_at(failures[0].line).fr_id == "FR-001"
+
+    def test_sections_cover_every_line(self) -> None:
+        model = parse_spec(SPEC)
+
+        assert model.sections[0].title == "SPEC: sample"
+        assert model.sections[-1].end == len(SPEC.split("\n"))
+        assert "\n".join(section.text for section in model.sections) == SPEC
+
+    def test_parsed_model_is_cached_by_content(self) -> None:
+        assert parse_spec(SPEC) is parse_spec(str(SPEC))
+        assert parse_spec(SPEC) is not parse_spec(SPEC + "\n")
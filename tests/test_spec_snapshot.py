@@ -0,0 +1,62 @@
+import json
+from pathlib import Path
+
+import pytest
+
+from cospec.core.exceptions import CospecError
+from cospec.core.spec_snapshot import diff_spec, resolve_snapshot, save_snapshot, snapshot_spec
+
+SPEC_V1 = """# SPEC
+
+## FR-001: Export
+### ユーザー入力
+- 引数: --format json
+
+## FR-002: Import
+### ユーザー入力
+- 引数: --source FILE
+"""
+
+
+class TestSpecSnapshot:
+    def test_diff_reports_changed_added_and_removed_sections_by_heading_path(self) -> None:
+        snapshot = snapshot_spec(SPEC_V1)
+        updated = (
+            SPEC_V1.replace("## FR-001: Export", "## FR-000: New\n### ユーザー入力\n- 引数: --all\n\n## FR-001: Export")
+            .replace("--source FILE", "--source DIR")
+            .replace("## FR-002: Import", "## FR-003: Renamed")
+        )
+
+        delta = diff_spec(snapshot, updated)
+
+        # Inserting FR-000 must not make FR-001's identical subsection look changed
+        assert [key for key, _ in delta.added] == [
+            "SPEC / FR-000: New",
+            "SPEC / FR-000: New / ユーザー入力",
+            "SPEC / FR-003: Renamed",
+            "SPEC / FR-003: Renamed / ユーザー入力",
+        ]
+        assert delta.changed == []
+        assert delta.removed == ["SPEC / FR-002: Import", "SPEC / FR-002: Import / ユーザー入力"]
+
+        in_place = diff_spec(snapshot, SPEC_V1.replace("--source FILE", "--source DIR"))
+        assert [key for key, _ in in_place.changed] == ["SPEC / FR-002: Import / ユーザー入力"]
+        assert in_place.added == [] and in_place.removed == []
+
+    def test_resolve_last_and_snapshot_ids(self, tmp_path: Path) -> None:
+        assert resolve_snapshot("last", tmp_path).sections == {}
+
+        snapshot = snapshot_spec(SPEC_V1)
+        path = save_snapshot(snapshot, tmp_path)
+
+        assert json.loads(path.read_text(encoding="utf-8"))["digest"] == snapshot.digest
+        assert resolve_snapshot("last", tmp_path).sections == snapshot.sections
+        assert resolve_snapshot(snapshot.snapshot_id[:6], tmp_path).digest == snapshot.digest
+
+    def test_resolve_markdown_file_and_unknown_ref(self, tmp_path: Path) -> None:
+        old_spec = tmp_path / "OLD_SPEC.md"
+        old_spec.write_text(SPEC_V1, encoding="utf-8")
+
+        assert resolve_snapshot(str(old_spec), tmp_path).digest == snapshot_spec(SPEC_V1).digest
+        with pytest.raises(CospecError):
+            resolve_snapshot("no-such-ref", tmp_path)
@@ -0,0 +1,51 @@
+import subprocess
+import sys
+from typing import Dict, List
+
+import pytest
+
+# Generous upper bound on the summed import time (self time, microseconds) of a single CLI startup.
+# The absent-module checks below are the precise regression guard; the budget catches gross slowdowns.
+STARTUP_BUDGET_US = 1_000_000
+
+# Modules that must only be imported by the commands that actually use them
+HEAVY_MODULES = ["pydantic_settings", "openai", "cospec.agents", "cospec.dependencies", "cospec.core.config"]
+
+SUBCOMMANDS = [
+    ["--help"],
+    ["status"],
+    ["init", "--help"],
+    ["review", "--help"],
+    ["hear", "--help"],
+    ["test-gen", "--help"],
+    ["agent", "--help"],
+    ["agent", "list", "--help"],
+    ["agent", "add", "--help"],
+]
+
+
+def _import_times(args: List[str]) -> Dict[str, int]:
+    """Run the CLI with -X importtime and return the self import time per module."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-m", "cospec.main", *args],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, _cumulative, name = line[len("import time:") :].split("|")
+        times[name.strip()] = int(self_us)
+    return times
+
+
+@pytest.mark.parametrize("args", SUBCOMMANDS, ids=lambda args: " ".join(args))
+def test_startup_import_budget(args: List[str]) -> None:
+    """CLI startup stays within the import budget and does not load command-only dependencies."""
+    times = _import_times(args)
+
+    loaded_heavy = [name for name in times if any(name.startswith(heavy) for heavy in HEAVY_MODULES)]
+    assert loaded_heavy == []
+    assert sum(times.values()) < STARTUP_BUDGET_US
@@ -0,0 +1,44 @@
+import io
+import os
+from pathlib import Path
+
+from cospec.core.adapters import YamlTemplateRenderer
+from cospec.core.templates import CompiledTemplate, clear_template_cache, load_template
+
+
+class TestCompiledTemplate:
+    def test_render_substitutes_in_a_single_pass(self) -> None:
+        template = CompiledTemplate.compile("A {first} B {second} C {unknown}")
+
+        # Substituted values are not rescanned, and unknown placeholders are kept verbatim
+        rendered = template.render({"first": "{second}", "second": 2})
+
+        assert rendered == "A {second} B 2 C {unknown}"
+        assert template.names == ("first", "second", "unknown")
+
+    def test_render_to_writes_to_stream(self) -> None:
+        stream = io.StringIO()
+        CompiledTemplate.compile("{a}-{a}").render_to(stream, {"a": "x"})
+        assert stream.getvalue() == "x-x"
+
+    def test_yaml_renderer_is_compatible(self) -> None:
+        renderer = YamlTemplateRenderer()
+        assert renderer.render("Hello {name}! {missing}", {"name": "cospec"}) == "Hello cospec! {missing}"
+
+
+class TestLoadTemplate:
+    def setup_method(self) -> None:
+        clear_template_cache()
+
+    def test_cached_until_file_changes(self, tmp_path: Path) -> None:
+        path = tmp_path / "prompt.md"
+        path.write_text("v1 {x}", encoding="utf-8")
+
+        first = load_template(path)
+        assert load_template(path) is first
+
+        path.write_text("version2 {x}", encoding="utf-8")
+        stat = path.stat()
+        os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+
+        assert load_template(path).render({"x": 1}) == "version2 1"
@@ -3,6 +3,7 @@ from unittest.mock import Mock, patch
 
 from cospec.agents.test_generator import TestGeneratorAgent
 from cospec.core.config import CospecConfig
+from cospec.core.exceptions import ToolExecutionError
 
 
 class TestTestGeneratorAgent:
@@ -218,3 +219,154 @@ class TestTestGeneratorAgent:
         assert "Priority: high" in content
         assert "Priority: medium" in content
         assert "TODO: 実装を記述" in content
+
+    def test_write_test_files_is_incremental(self, tmp_path: Path):
+        """変更のないファイルは書き換えず、消えたフィーチャーのファイルは削除する"""
+        agent = TestGeneratorAgent(self.config)
+        scenarios = [
+            {"type": "functional", "feature": "search", "description": "検索する", "priority": "high"},
+            {"type": "functional", "feature": "delete", "description": "削除する", "priority": "high"},
+        ]
+
+        _files, first = agent.write_test_files(scenarios, tmp_path)
+        assert sorted(first.written) == ["test_delete.py", "test_search.py"]
+        search_mtime = (tmp_path / "test_search.py").stat().st_mtime_ns
+
+        changed = [
+            scenarios[0],
+            {"type": "functional", "feature": "update", "description": "更新する", "priority": "high"},
+        ]
+        files, second = agent.write_test_files(changed, tmp_path)
+
+        assert second.written == ["test_update.py"]
+        assert second.unchanged == ["test_search.py"]
+        assert second.removed == ["test_delete.py"]
+        assert not (tmp_path / "test_delete.py").exists()
+        assert (tmp_path / "test_search.py").stat().st_mtime_ns == search_mtime
+        assert "TestSearch" in files["test_search.py"]
+
+    def test_write_test_files_implement_uses_tool_and_cache(self, tmp_path: Path, monkeypatch):
+        """--implement は未キャッシュのフィーチャーをまとめてツールに渡し、結果をシナリオ指紋でキャッシュする"""
+        monkeypatch.chdir(tmp_path)
+        agent = TestGeneratorAgent(self.config)
+        scenarios = [
+            {"type": "functional", "feature": f"feature{i}", "description": f"scenario {i}", "priority": "high"}
+            for i in range(4)
+        ]
+        response = "```python\nimport pytest\n\n\ndef test_generated():\n    assert True\n```"
+
+        with patch.object(agent, "run_tool_batch", side_effect=lambda prompts: [response] * len(prompts)) as mock_batch:
+            files, report = agent.write_test_files(scenarios, tmp_path / "out1", implement=True)
+
+        assert mock_batch.call_count == 1
+        assert len(mock_batch.call_args.args[0]) == 4
+        assert len(report.written) == 4
+        assert all("def test_generated" in content for content in files.values())
+
+        with patch.object(agent, "run_tool_batch") as mock_batch:
+            files, _report = agent.write_test_files(scenarios, tmp_path / "out2", implement=True)
+
+        mock_batch.assert_not_called()
+        assert all("def test_generated" in content for content in files.values())
+
+    def test_write_test_files_implement_falls_back_to_skeleton(self, tmp_path: Path, monkeypatch):
+        """ツールが不正なコードを返した場合はスケルトンを残し、次回再試行する"""
+        monkeypatch.chdir(tmp_path)
+        agent = TestGeneratorAgent(self.config)
+        scenarios = [{"type": "functional", "feature": "broken", "description": "壊れる", "priority": "high"}]
+
+        with patch.object(agent, "run_tool_batch", return_value=["```python\ndef test_(:\n```"]):
+            files, _report = agent.write_test_files(scenarios, tmp_path / "out", implement=True)
+
+        assert "TODO: 実装を記述" in files["test_broken.py"]
+
+        with patch.object(
+            agent, "run_tool_batch", return_value=["```python\ndef test_ok():\n    pass\n```"]
+        ) as mock_run:
+            files, report = agent.write_test_files(scenarios, tmp_path / "out", implement=True)
+
+        assert mock_run.call_count == 1
+        assert report.written == ["test_broken.py"]
+        assert "def test_ok" in files["test_broken.py"]
+
+    def test_write_test_files_implement_keeps_skeletons_when_batch_fails(self, tmp_path: Path, monkeypatch):
+        """バッチ呼び出しが失敗した場合はすべてスケルトンのまま書き出す"""
+        monkeypatch.chdir(tmp_path)
+        agent = TestGeneratorAgent(self.config)
+        scenarios = [{"type": "functional", "feature": "export", "description": "出力する", "priority": "high"}]
+
+        with patch.object(agent, "run_tool_batch", side_effect=ToolExecutionError("tool crashed")):
+            files, _report = agent.write_test_files(scenarios, tmp_path / "out", implement=True)
+
+        assert "TODO: 実装を記述" in files["test_export.py"]
+
+    def test_write_test_files_implement_keeps_successful_answers(self, tmp_path: Path, monkeypatch):
+        """一部のプロンプトだけ失敗した場合は成功した回答をキャッシュし、失敗分だけ再試行する"""
+        monkeypatch.chdir(tmp_path)
+        agent = TestGeneratorAgent(self.config)
+        scenarios = [
+            {"type": "functional", "feature": feature, "description": "処理する", "priority": "high"}
+            for feature in ("export", "search")
+        ]
+        response = "```python\ndef test_generated():\n    pass\n```"
+
+        with patch.object(agent, "run_tool_batch", return_value=[response, None]):
+            files, _report = agent.write_test_files(scenarios, tmp_path / "out", implement=True)
+
+        assert "def test_generated" in files["test_export.py"]
+        assert "TODO: 実装を記述" in files["test_search.py"]
+
+        with patch.object(agent, "run_tool_batch", return_value=[response]) as mock_batch:
+            files, _report = agent.write_test_files(scenarios, tmp_path / "out", implement=True)
+
+        assert len(mock_batch.call_args.args[0]) == 1
+        assert "def test_generated" in files["test_search.py"]
+
+    def test_parametrize_groups_scenarios_by_type_with_priority_marks(self, tmp_path: Path):
+        """--parametrize は種類ごとに parametrize テーブルを作り、優先度をマーカーにする"""
+        agent = TestGeneratorAgent(self.config)
+        scenarios = [
+            {"type": "functional", "feature": "export", "description": "Writes the file", "priority": "high"},
+            {"type": "functional", "feature": "export", "description": "正常に処理", "priority": "high"},
+            {"type": "input_validation", "feature": "export", "description": "--format json", "priority": "medium"},
+        ]
+
+        files, _report = agent.write_test_files(scenarios, tmp_path, parametrize=True)
+        content = files["test_export.py"]
+
+        compile(content, "test_export.py", "exec")
+        assert content.count("@pytest.mark.parametrize") == 2
+        assert "def test_functional(self, description):" in content
+        assert "def test_input_validation(self, description):" in content
+        assert "id='high-writes-the-file', marks=pytest.mark.high" in content
+        assert "id='high-1', marks=pytest.mark.high" in content
+        assert "id='medium-format-json', marks=pytest.mark.medium" in content
+        assert "addinivalue_line" in (tmp_path / "conftest.py").read_text(encoding="utf-8")
+
+        # 生成モードを切り替えるとファイルは再生成される
+        _files, report = agent.write_test_files(scenarios, tmp_path)
+        assert report.written == ["test_export.py"]
+
+    def test_parametrize_keeps_user_conftest(self, tmp_path: Path):
+        """ユーザーが用意した conftest.py は上書きしない"""
+        agent = TestGeneratorAgent(self.config)
+        (tmp_path / "conftest.py").write_text("# user fixtures\n", encoding="utf-8")
+        scenarios = [{"type": "functional", "feature": "f", "description": "x", "priority": "low"}]
+
+        agent.write_test_files(scenarios, tmp_path, parametrize=True)
+
+        assert (tmp_path / "conftest.py").read_text(encoding="utf-8") == "# user fixtures\n"
+
+
+def test_generated_method_names_are_unique(tmp_path: Path) -> None:
+    """説明が英数字を含まずメソッド名が衝突しても、連番で一意になる"""
+    agent = TestGeneratorAgent(CospecConfig())
+    scenarios = [
+        {"feature": "f", "type": "functional", "description": "正常に処理", "priority": "high"},
+        {"feature": "f", "type": "functional", "description": "エラーを表示", "priority": "high"},
+    ]
+
+    content = agent._generate_test_file_content("f", scenarios)
+
+    assert "def test_test__scenario(self):" in content
+    assert "def test_test__scenario_2(self):" in content
@@ -0,0 +1,43 @@
+from pathlib import Path
+
+from cospec.core import test_validation
+from cospec.core.test_validation import check_file, validate_test_files
+
+
+def _write(path: Path, content: str) -> Path:
+    path.write_text(content, encoding="utf-8")
+    return path
+
+
+class TestTestValidation:
+    def test_reports_syntax_errors_and_duplicates_per_file(self, tmp_path: Path) -> None:
+        good = _write(tmp_path / "test_good.py", "class TestA:\n    def test_one(self):\n        pass\n")
+        broken = _write(tmp_path / "test_broken.py", "def test_x(:\n    pass\n")
+        duplicated = _write(
+            tmp_path / "test_dup.py",
+            "class TestB:\n    def test_same(self):\n        pass\n\n    def test_same(self):\n        pass\n",
+        )
+
+        report = validate_test_files([good, broken, duplicated], collect_dir=tmp_path)
+        results = {Path(f.path).name: f for f in report.files}
+
+        assert results["test_good.py"].ok
+        assert results["test_broken.py"].syntax_error is not None
+        assert results["test_broken.py"].collection_error
+        assert results["test_dup.py"].duplicate_tests == ["TestB::test_same"]
+        # pytest collects the surviving test of each valid file once
+        assert report.collected == 2
+        assert not report.ok
+
+    def test_compile_errors_beyond_parsing_are_reported(self, tmp_path: Path) -> None:
+        path = _write(tmp_path / "test_return.py", "return 1\n")
+        assert check_file(str(path)).syntax_error is not None
+
+    def test_large_sets_use_process_pool(self, tmp_path: Path, monkeypatch) -> None:
+        monkeypatch.setattr(test_validation, "PARALLEL_THRESHOLD", 2)
+        paths = [_write(tmp_path / f"test_{i}.py", f"def test_{i}():\n    pass\n") for i in range(4)]
+
+        report = validate_test_files(paths)
+
+        assert [Path(f.path).name for f in report.files] == [p.name for p in paths]
+        assert report.ok
@@ -0,0 +1,113 @@
+import random
+import time
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+from typer.testing import CliRunner
+
+from cospec.agents.base import BaseAgent
+from cospec.agents.reviewer import ReviewerAgent
+from cospec.core.config import CospecConfig, ToolConfig
+from cospec.core.metrics import METRICS_PATH, Invocation, MetricsStore
+from cospec.core.tool_history import choose_tools, load_tool_stats
+from cospec.main import app
+
+
+def _history(tmp_path: Path, runs: dict) -> MetricsStore:
+    store = MetricsStore(tmp_path / "metrics.db")
+    for tool, entries in runs.items():
+        for duration, ok, prompt_bytes in entries:
+            store.record(Invocation(time.time(), tool, tool, prompt_bytes, 0, duration, 0 if ok else 1, False, 0))
+    return store
+
+
+class TestToolHistory:
+    def test_stats_report_percentiles_success_rate_and_ignore_cache_hits(self, tmp_path: Path) -> None:
+        history = _history(
+            tmp_path, {"qwen": [(d, True, 100) for d in (1.0, 2.0, 3.0, 4.0, 10.0)] + [(0.5, False, 900)]}
+        )
+
+        history.record(Invocation(time.time(), "qwen", "qwen", 100, 0, 0.0, 0, True, 0))
+        stats = load_tool_stats(["qwen", "unknown"], history)
+        qwen = stats["qwen"]
+        assert qwen is not None
+        assert (qwen.runs, qwen.successes) == (6, 5)
+        assert qwen.p50 == 3.0
+        assert qwen.p95 == 10.0
+        assert qwen.handles(100) and not qwen.handles(900)
+        assert stats["unknown"] is None
+
+        # A fresh store reads the same runs back from disk
+        assert load_tool_stats(["qwen"], MetricsStore(history.path)) == {"qwen": qwen}
+
+    def test_fastest_orders_by_p50_and_puts_unknown_tools_last(self, tmp_path: Path) -> None:
+        history = _history(tmp_path, {"slow": [(9.0, True, 10)], "fast": [(1.0, True, 10)]})
+
+        assert choose_tools(["new", "slow", "fast"], 3, policy="fastest", store=history) == ["fast", "slow", "new"]
+
+    def test_unreliable_or_too_small_tools_are_only_a_fallback(self, tmp_path: Path) -> None:
+        history = _history(
+            tmp_path,
+            {
+                "flaky": [(0.1, False, 10)] * 3,
+                "small": [(0.2, True, 100), (0.2, False, 5000)],
+                "steady": [(5.0, True, 10)],
+            },
+        )
+
+        assert choose_tools(["flaky", "small", "steady"], 1, policy="fastest", store=history) == ["small"]
+        assert choose_tools(["flaky", "small", "steady"], 1, policy="fastest", store=history, prompt_bytes=8000) == [
+            "steady"
+        ]
+        assert choose_tools(["flaky"], 2, policy="balanced", store=history) == ["flaky"]
+
+    def test_balanced_prefers_faster_tools(self, tmp_path: Path) -> None:
+        history = _history(tmp_path, {"fast": [(1.0, True, 10)] * 3, "slow": [(20.0, True, 10)] * 3})
+        rng = random.Random(0)
+
+        firsts = [choose_tools(["fast", "slow"], 1, store=history, rng=rng)[0] for _ in range(200)]
+
+        assert firsts.count("fast") > 150
+        assert "slow" in firsts
+
+    def test_unknown_policy_raises(self, tmp_path: Path) -> None:
+        with pytest.raises(ValueError):
+            choose_tools(["qwen"], 1, policy="cheapest", store=MetricsStore(tmp_path / "metrics.db"))
+
+    def test_select_review_tools_excludes_dev_tool(self, tmp_path: Path) -> None:
+        config = CospecConfig()
+        config.tools = {name: ToolConfig(command=name) for name in ("dev", "a", "b")}
+        config.dev_tool = "dev"
+        history = _history(tmp_path, {"a": [(3.0, True, 10)], "b": [(1.0, True, 10)]})
+
+        assert config.select_review_tools(policy="fastest", store=history) == ["b", "a"]
+        assert config.select_tool_for_review(policy="fastest", store=history) == "b"
+
+    def test_review_selects_tools_by_prompt_size(self) -> None:
+        with (
+            patch.object(ReviewerAgent, "build_review_prompt", return_value="仕様" * 100),
+            patch.object(CospecConfig, "select_review_tools", return_value=[]) as select,
+        ):
+            result = CliRunner().invoke(app, ["review", "--policy", "fastest"])
+
+        assert result.exit_code == 0
+        select.assert_called_once_with(policy="fastest", prompt_bytes=600)
+
+    def test_run_tool_records_duration_and_outcome(self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+        monkeypatch.chdir(tmp_path)
+        config = CospecConfig()
+        config.tools = {"mock": ToolConfig(command="mock")}
+        config.default_tool = "mock"
+        agent = BaseAgent(config)
+
+        with patch.object(BaseAgent, "_execute_tool", return_value="ok"):
+            agent.run_tool("hello")
+        with patch.object(BaseAgent, "_execute_tool", side_effect=RuntimeError("boom")):
+            with pytest.raises(RuntimeError):
+                agent.run_tool("hello world")
+
+        stats = load_tool_stats(["mock"])["mock"]
+        assert stats is not None
+        assert (stats.runs, stats.successes, stats.max_ok_prompt_bytes, stats.min_failed_prompt_bytes) == (2, 1, 5, 11)
+        assert (tmp_path / METRICS_PATH).exists()
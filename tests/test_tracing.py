@@ -0,0 +1,93 @@
+import json
+import threading
+from pathlib import Path
+from typing import Iterator
+from unittest.mock import MagicMock, patch
+
+import pytest
+from typer.testing import CliRunner
+
+from cospec.agents.base import BaseAgent
+from cospec.core.analyzer import ProjectAnalyzer
+from cospec.core.config import CospecConfig, ToolConfig
+from cospec.core.tracing import span, start_tracing, stop_tracing
+from cospec.main import app
+
+runner = CliRunner()
+
+
+@pytest.fixture
+def tracing() -> Iterator[None]:
+    start_tracing()
+    yield
+    stop_tracing()
+
+
+def _spans(events: list) -> dict:
+    return {event["name"]: event for event in events if event["ph"] == "X"}
+
+
+class TestTracing:
+    def test_spans_are_noops_without_tracer(self) -> None:
+        with span("ignored") as s:
+            s.set(value=1)
+
+        assert stop_tracing() is None
+
+    def test_nested_and_concurrent_spans(self, tracing: None) -> None:
+        def worker() -> None:
+            with span("worker"):
+                pass
+
+        with span("outer", phase="test"):
+            with span("inner"):
+                thread = threading.Thread(target=worker, name="worker-thread")
+                thread.start()
+                thread.join()
+
+        tracer = stop_tracing()
+        assert tracer is not None
+        spans = _spans(tracer.events)
+        outer, inner, worker_span = spans["outer"], spans["inner"], spans["worker"]
+
+        assert outer["args"] == {"phase": "test"}
+        assert outer["ts"] <= inner["ts"] and inner["ts"] + inner["dur"] <= outer["ts"] + outer["dur"]
+        assert worker_span["tid"] != outer["tid"]
+        thread_names = [e["args"]["name"] for e in tracer.events if e["name"] == "thread_name"]
+        assert "worker-thread" in thread_names
+
+    def test_failed_span_records_error(self, tracing: None) -> None:
+        with pytest.raises(ValueError):
+            with span("failing"):
+                raise ValueError("boom")
+
+        tracer = stop_tracing()
+        assert tracer is not None
+        assert _spans(tracer.events)["failing"]["args"]["error"] == "ValueError"
+
+    def test_review_phases_are_traced(self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch, tracing: None) -> None:
+        monkeypatch.chdir(tmp_path)
+        (tmp_path / "docs").mkdir()
+        (tmp_path / "docs" / "SPEC.md").write_text("# SPEC\n")
+        config = CospecConfig()
+        config.tools = {"mock": ToolConfig(command="mock", args=["{prompt}"])}
+        config.default_tool = "mock"
+
+        with patch("cospec.core.adapters.subprocess.run") as mock_run:
+            mock_run.return_value = MagicMock(stdout="report", stderr="", returncode=0)
+            BaseAgent(config).run_tool(ProjectAnalyzer(tmp_path).collect_context())
+
+        tracer = stop_tracing()
+        assert tracer is not None
+        names = set(_spans(tracer.events))
+        assert {"collect_context", "read_docs", "glob_sources", "run_tool", "build_prompt", "subprocess"} <= names
+
+    def test_trace_option_writes_chrome_trace(self, tmp_path: Path) -> None:
+        trace_path = tmp_path / "trace.json"
+
+        result = runner.invoke(app, ["--trace", str(trace_path), "status"])
+
+        assert result.exit_code == 0
+        data = json.loads(trace_path.read_text())
+        assert data["traceEvents"][0]["name"] == "process_name"
+        assert stop_tracing() is None